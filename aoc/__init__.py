@@ -5,17 +5,39 @@ Expose fetching and submission functions for direct import.
 
 from .api import (
     fetch_input,
+    stream_input,
     fetch_code,
     fetch_example,
+    fetch_blocks,
+    fetch_description,
+    fetch_stars,
+    fetch_answers,
     submit,
+    submit_batch,
+    Puzzle,
 )
 
 from .config import config
+from .grid import Grid
+from .memoize import memo
+from .puzzle_input import PuzzleInput
+from .timing import timer
 
 __all__ = [
     "fetch_input",
+    "stream_input",
     "fetch_code",
     "fetch_example",
+    "fetch_blocks",
+    "fetch_description",
+    "fetch_stars",
+    "fetch_answers",
     "submit",
-    "config"
+    "submit_batch",
+    "Puzzle",
+    "config",
+    "Grid",
+    "memo",
+    "PuzzleInput",
+    "timer",
 ]
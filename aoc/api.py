@@ -1,22 +1,37 @@
-"""Public Python API: fetch_input(), fetch_code(), fetch_example(), and submit().
+"""Public Python API: fetch_input(), stream_input(), fetch_code(), fetch_example(),
+fetch_description(), fetch_stars(), fetch_answers(), submit() and submit_batch(),
+plus the memoizing Puzzle facade.
 
 Raise the exceptions defined in errors.py on failure.
 """
+import csv
+import hashlib
+import json
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
 from time import sleep
-from typing import Optional, Union
+from typing import BinaryIO, Callable, Iterable, Optional, Union
 
-from . import client, parser
+from . import cache, client, parser, render, trace
 from .errors import (
     AOCError,
+    CooldownError,
     FormNotFoundError,
     InputNotFoundError,
     MissingCookieError,
+    TransientError,
     WrongLevelError,
     WrongAnswerError,
     AlreadyCompletedError,
     UnknownDateError,
 )
-from .fallbacks import param_fallback, env_int, env, config, today, cookie_error
+from .fallbacks import param_fallback, env_int, env, config, today, cookie_error, setting
+from .puzzle_input import PuzzleInput
+
+# PuzzleInput objects handed out by fetch_input(typed=True), per (year, day, cookie)
+_typed_inputs: dict[tuple[int, int, str], PuzzleInput] = {}
 
 
 # ------------------------------
@@ -24,48 +39,316 @@ from .fallbacks import param_fallback, env_int, env, config, today, cookie_error
 # ------------------------------
 @param_fallback("year", env_int, config, today)
 @param_fallback("day", env_int, config, today)
-@param_fallback("cookie", env, config, cookie_error)
-def fetch_input(year: Optional[int] = None, day: Optional[int] = None, cookie: Optional[str] = None) -> str:
-    """Fetch puzzle input via /input endpoint; always plain text."""
+@param_fallback("cookie", env, config)
+def fetch_input(year: Optional[int] = None, day: Optional[int] = None, cookie: Optional[str] = None,
+                as_bytes: bool = False, typed: bool = False) -> Union[str, bytes, PuzzleInput]:
+    """Fetch puzzle input via /input endpoint; always plain text.
+
+    With as_bytes=True the raw body is returned without str decoding.
+    With typed=True a PuzzleInput is returned, shared by every call for the
+    same puzzle in this process, so its cached views are computed only once.
+    A cached input needs no cookie.
+    """
     if year is None or day is None:
         raise UnknownDateError("Puzzle year or day not set")
 
-    if cookie is None:
+    if cookie is None and client.stored_input(year, day) is None:
         raise MissingCookieError("Personal cookie not provided, and no AOC_COOKIE envvar or config value present")
 
+    if as_bytes and typed:
+        raise ValueError("as_bytes and typed cannot be combined")
+
     try:
+        if as_bytes:
+            return client.fetch_input_bytes(year, day, cookie)
+        if typed:
+            key = (year, day, cookie)
+            if (data := _typed_inputs.get(key)) is None:
+                data = _typed_inputs.setdefault(key, PuzzleInput(client.fetch_input(year, day, cookie)))
+            return data
         return client.fetch_input(year, day, cookie)
+    except (InputNotFoundError, TransientError):
+        # Not unlocked yet, or worth retrying: let callers tell these apart
+        raise
     except Exception as exc:
         raise InputNotFoundError(f"Could not fetch puzzle input: {exc}") from exc
 
 
 @param_fallback("year", env_int, config, today)
 @param_fallback("day", env_int, config, today)
+@param_fallback("cookie", env, config)
+def stream_input(sink: BinaryIO, year: Optional[int] = None, day: Optional[int] = None,
+                 cookie: Optional[str] = None) -> int:
+    """Write the puzzle input to the binary file `sink` as it downloads.
+
+    Returns the number of bytes written. A cached input needs no cookie.
+    """
+    if year is None or day is None:
+        raise UnknownDateError("Puzzle year or day not set")
+
+    if cookie is None and client.stored_input(year, day) is None:
+        raise MissingCookieError("Personal cookie not provided, and no AOC_COOKIE envvar or config value present")
+
+    try:
+        return client.stream_input(year, day, cookie, sink)
+    except (InputNotFoundError, TransientError):
+        # Not unlocked yet, or worth retrying: let callers tell these apart
+        raise
+    except Exception as exc:
+        raise InputNotFoundError(f"Could not fetch puzzle input: {exc}") from exc
+
+
+def _solved(year: int, day: int) -> Optional[int]:
+    """Parts of a puzzle the star index shows as solved, or None without an index."""
+    stars = cache.load_stars(year)
+    return stars[day - 1] if stars is not None and 1 <= day <= len(stars) else None
+
+
+def _page(year: int, day: int, cookie: Optional[str] = None, refresh: bool = False) -> str:
+    """The puzzle page; a cached page showing fewer solved parts than the star index is fetched again.
+
+    Parts solved in the browser or on another machine leave the cached page
+    without their answers and without part two.
+    """
+    html = client.fetch_page(year, day, cookie, refresh)
+    if not refresh and cookie and (_solved(year, day) or 0) > len(parser.extract_answers(html)):
+        html = client.fetch_page(year, day, cookie, refresh=True)
+    return html
+
+
+@param_fallback("year", env_int, config, today)
+@param_fallback("day", env_int, config, today)
+@param_fallback("cookie", env, config)
 def fetch_code(year: Optional[int] = None, day: Optional[int] = None,
-               idx: Optional[int] = None, sep: str = "\n") -> Union[str, list[str]]:
-    """Fetch <pre><code> blocks from the problem page."""
+               idx: Optional[parser.Index] = None, sep: str = "\n", cookie: Optional[str] = None) -> Union[str, list[str]]:
+    """Fetch <pre><code> blocks from the problem page.
+
+    `idx` is a block index (returns that block), or a slice or sequence of
+    indices such as [0, slice(2, 4)] (returns a list); see parser.extract_code.
+    Part 2 blocks need the cookie.
+    """
     if year is None or day is None:
         raise UnknownDateError("Puzzle year or day not set")
     
-    html = client.fetch_page(year, day)
+    html = _page(year, day, cookie)
     return parser.extract_code(html, idx=idx, sep=sep)
 
 
 @param_fallback("year", env_int, config, today)
 @param_fallback("day", env_int, config, today)
+@param_fallback("cookie", env, config)
 def fetch_example(year: Optional[int] = None, day: Optional[int] = None,
-                  idx: Optional[int] = None, sep: str = "\n") -> Union[str, list[str]]:
-    """Fetch example <pre><code> blocks preceded by 'for example:' <p>."""
+                  idx: Optional[parser.Index] = None, sep: str = "\n",
+                  cookie: Optional[str] = None) -> Union[str, list[str]]:
+    """Fetch example <pre><code> blocks preceded by 'for example:' <p>; `idx` as in fetch_code()."""
     if year is None or day is None:
         raise UnknownDateError("Puzzle year or day not set")
 
-    html = client.fetch_page(year, day)
+    html = _page(year, day, cookie)
     return parser.extract_example(html, idx=idx, sep=sep)
 
 
+@param_fallback("year", env_int, config, today)
+@param_fallback("day", env_int, config, today)
+@param_fallback("cookie", env, config)
+def fetch_blocks(year: Optional[int] = None, day: Optional[int] = None, examples: bool = False,
+                 idx: Optional[parser.Index] = None, cookie: Optional[str] = None) -> list[dict]:
+    """Fetch code blocks (or only example blocks) with their indices, part and line count.
+
+    One page fetch and parse serves any number of blocks; see parser.extract_blocks.
+    """
+    if year is None or day is None:
+        raise UnknownDateError("Puzzle year or day not set")
+
+    html = _page(year, day, cookie)
+    return parser.extract_blocks(html, examples=examples, idx=idx)
+
+
+@param_fallback("year", env_int, config, today)
+@param_fallback("day", env_int, config, today)
+@param_fallback("cookie", env, config)
+def fetch_description(year: Optional[int] = None, day: Optional[int] = None, part: Optional[int] = None,
+                      width: Optional[int] = None, cookie: Optional[str] = None, refresh: bool = False) -> str:
+    """Fetch the puzzle description rendered as terminal text.
+
+    Renders part 1 or 2, or every unlocked part if `part` is None, reflowed
+    to `width` columns if given. Part 2 needs the cookie. Renders are cached
+    per page revision, so repeated views of a cached page skip parsing.
+    refresh=True fetches the page again instead of using the cached one.
+    """
+    if year is None or day is None:
+        raise UnknownDateError("Puzzle year or day not set")
+
+    html = _page(year, day, cookie, refresh=refresh)
+    revision = hashlib.sha1(html.encode("utf8")).hexdigest()[:16]
+    variant = f"p{part or 0}-w{width or 0}"
+
+    text = cache.read_render(year, day, revision, variant)
+    if text is None:
+        text = render.render_description(html, part=part, width=width)
+        cache.write_render(year, day, revision, variant, text)
+    return text
+
+
+@param_fallback("year", env_int, config, today)
+@param_fallback("cookie", env, config, cookie_error)
+def fetch_stars(year: Optional[int] = None, cookie: Optional[str] = None, refresh: bool = False) -> list[int]:
+    """Fetch the star count (0, 1 or 2) of every day in a year, indexed by day - 1.
+
+    The whole year comes from a single /{year} calendar request and is kept
+    in a local star index, which submit() updates as parts get solved. Pass
+    refresh=True to ignore the index and fetch the calendar again.
+    """
+    if year is None:
+        raise UnknownDateError("Puzzle year not set")
+
+    if cookie is None:
+        raise MissingCookieError("Personal cookie not provided, and no AOC_COOKIE envvar or config value present")
+
+    known = cache.load_stars(year)
+    if not refresh and known is not None:
+        return known
+
+    html = client.fetch_calendar(year, cookie)
+    stars = parser.extract_stars(html, days=cache.DAYS)
+    for day, count in enumerate(stars, 1):
+        if known is None or known[day - 1] != count:
+            cache.drop(year, day, "page")  # it may predate parts solved elsewhere
+    cache.save_stars(year, stars)
+    return stars
+
+
+@param_fallback("year", env_int, config, today)
+@param_fallback("day", env_int, config, today)
+@param_fallback("cookie", env, config, cookie_error)
+def fetch_answers(year: Optional[int] = None, day: Optional[int] = None,
+                  cookie: Optional[str] = None) -> list[str]:
+    """Fetch the answers the server accepted for a puzzle, in part order.
+
+    Answers recorded by submit() or read from an earlier page fetch are
+    kept in the cache; the page is only fetched again when the star index
+    shows more solved parts than there are known answers.
+    """
+    if year is None or day is None:
+        raise UnknownDateError("Puzzle year or day not set")
+
+    if cookie is None:
+        raise MissingCookieError("Personal cookie not provided, and no AOC_COOKIE envvar or config value present")
+
+    return _answers(year, day, lambda: _page(year, day, cookie))
+
+
+def _answers(year: int, day: int, page: Callable[[], str]) -> list[str]:
+    """Known answers from the cache, or from the page returned by `page()` when they may be outdated."""
+    answers = cache.read_meta(year, day).get("answers")
+    solved = _solved(year, day)
+    if answers is not None and (solved is None or len(answers) >= solved):
+        return answers
+    if solved == 0:
+        return []
+
+    answers = parser.extract_answers(page())
+    cache.update_meta(year, day, answers=answers)
+    return answers
+
+
 # ------------------------------
 # Submit answers
 # ------------------------------
+def _record_answer(year: int, day: int, level: int, answer: str) -> None:
+    """Remember an accepted answer so runners can check solutions offline."""
+    answers = list(cache.read_meta(year, day).get("answers") or [])
+    if len(answers) == level - 1:
+        answers.append(answer)
+        cache.update_meta(year, day, answers=answers)
+
+
+def _accepted(year: int, day: int, level: int, answer: str) -> None:
+    """Update local state after a correct answer."""
+    cache.update_star(year, day, level)
+    _record_answer(year, day, level, answer)
+    # The cached page still shows the old form (and no part two)
+    cache.drop(year, day, "page")
+
+
+def _current_level(year: int, day: int, cookie: str, page: Optional[Callable[[], str]] = None) -> Optional[int]:
+    """Return the first unsolved level of a puzzle, or None if both parts are solved.
+
+    Uses the star index when it is cached, saving a page request; falls back
+    to the level in the answer form of the puzzle page (from `page()` if given).
+    """
+    if (solved := _solved(year, day)) is not None:
+        return solved + 1 if solved < 2 else None
+
+    html = page() if page is not None else _page(year, day, cookie)
+    return parser.extract_level(html)
+
+
+def _submit_level(answer: str | int, year: int, day: int, level: int, cookie: str) -> str:
+    """Submit one answer for one level and update local state; raises on anything but success."""
+    resp_html = client.submit_answer(str(answer), year, day, level, cookie)
+    result = parser.parse_submission_response(resp_html)
+
+    if result.kind == "correct":
+        _accepted(year, day, level, str(answer))
+        return result.message
+    if result.kind == "wrong":
+        raise WrongAnswerError(result.message)
+    if result.kind == "too_soon":
+        raise CooldownError(result.message, result.wait)
+    if result.kind == "incorrect_level":
+        # Solved elsewhere since the star index was built
+        cache.drop_stars(year)
+        raise WrongLevelError(result.message)
+    if result.kind == "no_form":
+        raise AlreadyCompletedError(result.message)
+    raise AOCError(result.message)
+
+
+def _require(year: Optional[int], day: Optional[int], cookie: Optional[str]) -> None:
+    if year is None or day is None:
+        raise UnknownDateError("Puzzle year or day not set")
+
+    if cookie is None:
+        raise MissingCookieError("Personal cookie not provided, and no AOC_COOKIE envvar or config value present")
+
+
+def _target_level(year: Optional[int], day: Optional[int], cookie: Optional[str]) -> int:
+    """The level a submission goes to; raises if the puzzle, cookie or form is missing."""
+    _require(year, day, cookie)
+    level = _current_level(year, day, cookie)
+
+    if level is None:
+        raise FormNotFoundError("No submission form present for this puzzle/part")
+    return level
+
+
+@dataclass
+class SubmitTarget:
+    year: int
+    day: int
+    cookie: str
+    level: int
+
+
+@param_fallback("year", env_int, config, today)
+@param_fallback("day", env_int, config, today)
+@param_fallback("cookie", env, config, cookie_error)
+def prepare_submit(year: Optional[int] = None, day: Optional[int] = None,
+                   cookie: Optional[str] = None) -> SubmitTarget:
+    """Resolve everything submit() needs before the answer is known.
+
+    Resolves the date and cookie, looks up the level (star index or puzzle
+    page) and connects to the server, so that a later
+    submit(answer, year=t.year, day=t.day, cookie=t.cookie, level=t.level)
+    sends its POST at once. Run it while the answer is being computed.
+    Raises the errors submit() would.
+    """
+    level = _target_level(year, day, cookie)
+    client.warm()
+    return SubmitTarget(year, day, cookie, level)
+
+
 @param_fallback("year", env_int, config, today)
 @param_fallback("day", env_int, config, today)
 @param_fallback("cookie", env, config, cookie_error)
@@ -74,7 +357,8 @@ def submit(first_answer: str | int,
            /,
            year: Optional[int] = None,
            day: Optional[int] = None,
-           cookie: Optional[str] = None) -> str:
+           cookie: Optional[str] = None,
+           level: Optional[int] = None) -> str:
     """Submit one or two answers to AoC.
 
     If one answer is supplied, submits to the given puzzle as whichever
@@ -83,32 +367,19 @@ def submit(first_answer: str | int,
     If two answers are supplied, they are submitted one after the other
     with 1s in between. If the first part has been solved, only submit
     the second answer.
-    """
-    if year is None or day is None:
-        raise UnknownDateError("Puzzle year or day not set")
-
-    if cookie is None:
-        raise MissingCookieError("Personal cookie not provided, and no AOC_COOKIE envvar or config value present")
-
-    html = client.fetch_page(year, day)
-    level = parser.extract_level(html)
 
+    `level` skips looking up the unsolved part, e.g. when it comes from
+    prepare_submit().
+    """
     if level is None:
-        raise FormNotFoundError("No submission form present for this puzzle/part")
+        level = _target_level(year, day, cookie)
+    elif level not in (1, 2):
+        raise ValueError(f"Invalid level {level}; expected 1 or 2")
+    else:
+        _require(year, day, cookie)
 
     def submit_single(answer: str | int, level: int) -> str:
-        resp_html = client.submit_answer(str(answer), year, day, level, cookie)
-        result = parser.parse_submission_response(resp_html)
-
-        if result.kind == "correct":
-            return result.message
-        if result.kind == "wrong":
-            raise WrongAnswerError(result.message)
-        if result.kind == "incorrect_level":
-            raise WrongLevelError(result.message)
-        if result.kind == "no_form":
-            raise AlreadyCompletedError(result.message)
-        raise AOCError(result.message)
+        return _submit_level(answer, year, day, level, cookie)
 
     if second_answer is None:
         return submit_single(first_answer, level)
@@ -119,6 +390,262 @@ def submit(first_answer: str | int,
 
     # Two answers
     msg1 = submit_single(first_answer, level)
-    sleep(1)
+    with trace.span("api.submit.wait", seconds=1):
+        sleep(1)
     msg2 = submit_single(second_answer, level + 1)
     return "\n".join([msg1, msg2])
+
+
+# ------------------------------
+# Batch submission
+# ------------------------------
+@dataclass
+class BatchResult:
+    year: int
+    day: int
+    part: int
+    answer: str
+    status: str
+    """"correct", "wrong", "solved" (already solved, not sent), "blocked" (part 1
+    is not solved), "pending" (dry run) or "error"."""
+    message: str = ""
+
+
+# Statuses that are not retried when a batch is resumed from its log
+FINAL = ("correct", "wrong", "solved")
+MAX_COOLDOWNS = 5
+
+
+def read_batch(path: Union[str, Path]) -> list[tuple[int, int, int, str]]:
+    """Read (year, day, part, answer) rows from a CSV file, with or without a header row."""
+    rows = []
+    with open(path, newline="") as f:
+        reader = csv.reader(line for line in f if line.strip() and not line.startswith("#"))
+        columns = {"year": 0, "day": 1, "part": 2, "answer": 3}
+        for n, row in enumerate(reader):
+            cells = [cell.strip() for cell in row]
+            if n == 0 and not cells[0].isdigit():
+                columns = {name.lower(): i for i, name in enumerate(cells)}
+                continue
+            try:
+                year, day, part = (int(cells[columns[k]]) for k in ("year", "day", "part"))
+                answer = cells[columns["answer"]]
+            except (KeyError, IndexError, ValueError):
+                raise ValueError(f"{path}: row {n + 1} is not year,day,part,answer: {row}") from None
+            if part not in (1, 2):
+                raise ValueError(f"{path}: row {n + 1} has part {part}, expected 1 or 2")
+            rows.append((year, day, part, answer))
+    return rows
+
+
+def _read_log(path: Path) -> dict[tuple[int, int, int, str], str]:
+    done = {}
+    if path.exists():
+        for line in path.read_text().splitlines():
+            try:
+                entry = json.loads(line)
+                done[(entry["year"], entry["day"], entry["part"], entry["answer"])] = entry["status"]
+            except (ValueError, KeyError):
+                continue  # A line cut short by an interruption
+    return done
+
+
+def _submit_with_cooldown(year: int, day: int, part: int, answer: str, cookie: str) -> parser.SubmissionResult:
+    """Submit one answer, sleeping through "answer too recently" cooldowns."""
+    for _ in range(MAX_COOLDOWNS):
+        result = parser.parse_submission_response(client.submit_answer(answer, year, day, part, cookie))
+        if result.kind != "too_soon":
+            return result
+        with trace.span("api.submit.cooldown", seconds=result.wait):
+            sleep((result.wait or 60.0) + 1)
+    return result
+
+
+@param_fallback("cookie", env, config, cookie_error)
+def submit_batch(entries: Union[str, Path, Iterable[tuple[int, int, int, str]]], log: Optional[Union[str, Path]] = None,
+                 cookie: Optional[str] = None, interval: Optional[float] = None, dry_run: bool = False,
+                 progress: Optional[Callable[[BatchResult], None]] = None) -> list[BatchResult]:
+    """Submit many (year, day, part, answer) entries, e.g. from a CSV file.
+
+    Entries are sent in (year, day, part) order, at most one every
+    `interval` seconds (the `submit_interval` setting, default 1) on top of
+    the request throttle. Parts the star index shows as solved are skipped,
+    and part 2 is held back while part 1 of the day is unsolved. Server
+    cooldowns are waited out. Every result is appended to the JSON-lines
+    `log`; entries with a final result there are skipped, so an interrupted
+    batch resumes where it stopped.
+    """
+    if cookie is None:
+        raise MissingCookieError("Personal cookie not provided, and no AOC_COOKIE envvar or config value present")
+
+    rows = read_batch(entries) if isinstance(entries, (str, Path)) else list(entries)
+    interval = float(setting("submit_interval", 1.0)) if interval is None else interval
+    log_path = Path(log) if log is not None else None
+    done = _read_log(log_path) if log_path is not None else {}
+
+    # One answer per part: the first one listed
+    todo: dict[tuple[int, int, int], str] = {}
+    for year, day, part, answer in rows:
+        todo.setdefault((year, day, part), str(answer))
+
+    results = []
+    stars_by_year: dict[int, list[int]] = {}
+    last_submit = None
+    for (year, day, part), answer in sorted(todo.items()):
+        previous = done.get((year, day, part, answer))
+        if previous in FINAL:
+            continue
+
+        if year not in stars_by_year:
+            stars_by_year[year] = fetch_stars(year, cookie=cookie)
+        stars = stars_by_year[year]
+        solved = stars[day - 1] if 1 <= day <= len(stars) else 0
+
+        if solved >= part:
+            result = BatchResult(year, day, part, answer, "solved", "Part already solved")
+        elif solved < part - 1:
+            result = BatchResult(year, day, part, answer, "blocked", f"Part {part - 1} is not solved")
+        elif dry_run:
+            result = BatchResult(year, day, part, answer, "pending")
+        else:
+            if last_submit is not None and (wait := last_submit + interval - time.monotonic()) > 0:
+                sleep(wait)
+            last_submit = time.monotonic()
+            try:
+                reply = _submit_with_cooldown(year, day, part, answer, cookie)
+            except AOCError as exc:
+                reply = parser.SubmissionResult("error", str(exc))
+
+            if reply.kind == "correct":
+                _accepted(year, day, part, answer)
+                stars[day - 1] = part
+                result = BatchResult(year, day, part, answer, "correct", reply.message)
+            elif reply.kind == "wrong":
+                result = BatchResult(year, day, part, answer, "wrong", reply.message)
+            elif reply.kind in ("incorrect_level", "no_form"):
+                # Local state is stale: solved elsewhere, or not unlocked yet
+                cache.drop_stars(year)
+                stars_by_year.pop(year)
+                result = BatchResult(year, day, part, answer, "error", reply.message)
+            else:
+                result = BatchResult(year, day, part, answer, "error", reply.message)
+
+        results.append(result)
+        if log_path is not None and not dry_run:
+            with log_path.open("a") as f:
+                f.write(json.dumps({**asdict(result), "time": time.time()}) + "\n")
+        if progress is not None:
+            progress(result)
+    return results
+
+
+# ------------------------------
+# Puzzle facade
+# ------------------------------
+class Puzzle:
+    """One puzzle, with its data fetched and parsed lazily and at most once.
+
+        puzzle = Puzzle(2023, 1)
+        puzzle.examples      # parsed from the page on first use
+        puzzle.code_blocks   # same page, same parse
+        puzzle.submit(part1(puzzle.input))
+
+    Year, day and cookie are resolved once, when the object is created.
+    Every property is computed on first access and kept; concurrent first
+    accesses from several threads compute it once. A correct submit() only
+    forgets what it changes (page, examples, code blocks, level, answers);
+    the input is kept.
+    """
+
+    # Properties derived from the page, stale once a part is solved
+    _PAGE_DERIVED = ("page", "examples", "code_blocks", "level", "answers")
+
+    @param_fallback("year", env_int, config, today)
+    @param_fallback("day", env_int, config, today)
+    @param_fallback("cookie", env, config)
+    def __init__(self, year: Optional[int] = None, day: Optional[int] = None, cookie: Optional[str] = None):
+        if year is None or day is None:
+            raise UnknownDateError("Puzzle year or day not set")
+        self.year = year
+        self.day = day
+        self.cookie = cookie
+        self._values: dict[str, object] = {}
+        self._locks: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"Puzzle({self.year}, {self.day})"
+
+    def _memo(self, key: str, compute: Callable[[], object]):
+        with self._lock:
+            if key in self._values:
+                return self._values[key]
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            with self._lock:
+                if key in self._values:
+                    return self._values[key]
+            value = compute()
+            with self._lock:
+                self._values[key] = value
+            return value
+
+    def _forget(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._values.pop(key, None)
+
+    def _require_cookie(self) -> str:
+        if self.cookie is None:
+            raise MissingCookieError("Personal cookie not provided, and no AOC_COOKIE envvar or config value present")
+        return self.cookie
+
+    @property
+    def page(self) -> str:
+        """The puzzle page HTML (authenticated if there is a cookie)."""
+        return self._memo("page", lambda: _page(self.year, self.day, self.cookie))
+
+    @property
+    def input(self) -> PuzzleInput:
+        """The personal puzzle input, with cached views (see PuzzleInput)."""
+        return self._memo("input", lambda: fetch_input(self.year, self.day, self._require_cookie(), typed=True))
+
+    @property
+    def examples(self) -> list[str]:
+        """Code blocks introduced as examples ("For example:")."""
+        return self._memo("examples", lambda: parser.extract_examples(self.page))
+
+    @property
+    def code_blocks(self) -> list[str]:
+        """Every <pre><code> block on the page."""
+        return self._memo("code_blocks", lambda: parser.extract_code_blocks(self.page))
+
+    @property
+    def level(self) -> Optional[int]:
+        """The first unsolved part, or None when both are solved."""
+        return self._memo("level", lambda: _current_level(self.year, self.day, self._require_cookie(),
+                                                          page=lambda: self.page))
+
+    @property
+    def answers(self) -> list[str]:
+        """Accepted answers, in part order."""
+        self._require_cookie()
+        return self._memo("answers", lambda: _answers(self.year, self.day, lambda: self.page))
+
+    def submit(self, answer: str | int, part: Optional[int] = None) -> str:
+        """Submit an answer for `part` (default: the first unsolved part).
+
+        Raises like submit(). On success the page-derived properties are
+        refreshed on next access.
+        """
+        cookie = self._require_cookie()
+        level = part if part is not None else self.level
+        if level is None:
+            raise FormNotFoundError("No submission form present for this puzzle/part")
+        try:
+            message = _submit_level(answer, self.year, self.day, level, cookie)
+        except WrongLevelError:
+            self._forget("level")
+            raise
+        self._forget(*self._PAGE_DERIVED)
+        return message
@@ -0,0 +1,296 @@
+"""Solver runtime history and regression checks.
+
+Timings from runner.run_year() are stored in a local SQLite database
+(<cache dir>/bench.sqlite3), one row per part and repetition, together with
+the input hash, the git commit of the solver directory and the machine.
+
+compare() matches the samples of two commits on the same machine and input,
+and reports median, IQR and relative change per part. A change counts as
+significant when a two-sided Mann-Whitney U test gives p < 0.05, so use
+several repetitions per run (aoc bench run --repeat 5).
+
+Rows from memory runs (aoc run --memory) carry the peak traced memory of
+the part; tracing slows solvers down, so their timings are left out of
+comparisons.
+"""
+import hashlib
+import json
+import math
+import os
+import platform
+import sqlite3
+import subprocess
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from statistics import median, quantiles
+from typing import Iterable, Optional, Union
+
+from . import cache
+from .runner import DayResult
+
+DB_FILENAME = "bench.sqlite3"
+ALPHA = 0.05
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    created REAL NOT NULL,
+    commit_sha TEXT,
+    machine_id TEXT NOT NULL,
+    machine TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS timings (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    year INTEGER NOT NULL,
+    day INTEGER NOT NULL,
+    part INTEGER NOT NULL,
+    input_hash TEXT,
+    seconds REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS timings_run ON timings(run_id);
+"""
+
+# Applied in order to databases whose user_version is lower than their position + 1
+_MIGRATIONS = [
+    "ALTER TABLE timings ADD COLUMN peak_memory INTEGER",
+]
+
+
+def connect(path: Optional[Union[str, Path]] = None) -> sqlite3.Connection:
+    """Open (and create if needed) the benchmark database."""
+    if path is None:
+        path = cache.cache_dir() / DB_FILENAME
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.executescript(_SCHEMA)
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    with conn:
+        for statement in _MIGRATIONS[version:]:
+            conn.execute(statement)
+        conn.execute(f"PRAGMA user_version = {len(_MIGRATIONS)}")
+    return conn
+
+
+# ------------------------------
+# Recording
+# ------------------------------
+def machine_info() -> dict[str, object]:
+    return {
+        "node": platform.node(),
+        "system": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpus": os.cpu_count(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+    }
+
+
+def machine_id(info: Optional[dict[str, object]] = None) -> str:
+    """Short stable hash of the machine info; only timings of one machine are compared."""
+    info = machine_info() if info is None else info
+    return hashlib.sha256(json.dumps(info, sort_keys=True).encode("utf8")).hexdigest()[:12]
+
+
+def _git(path: Union[str, Path], *args: str) -> Optional[str]:
+    try:
+        out = subprocess.run(["git", *args], cwd=path, capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def git_commit(path: Union[str, Path] = ".") -> Optional[str]:
+    """The HEAD commit of the repository containing `path`, suffixed "-dirty" with local changes."""
+    sha = _git(path, "rev-parse", "HEAD")
+    if sha and _git(path, "status", "--porcelain", "--untracked-files=no"):
+        sha += "-dirty"
+    return sha
+
+
+def record(runs: Iterable[list[DayResult]], commit: Optional[str],
+           conn: Optional[sqlite3.Connection] = None) -> int:
+    """Store the part timings of one or more repetitions as a single run. Returns the run id."""
+    conn = conn or connect()
+    info = machine_info()
+    with conn:
+        cur = conn.execute(
+            "INSERT INTO runs (created, commit_sha, machine_id, machine) VALUES (?, ?, ?, ?)",
+            (time.time(), commit, machine_id(info), json.dumps(info, sort_keys=True)),
+        )
+        run_id = cur.lastrowid
+        conn.executemany(
+            "INSERT INTO timings (run_id, year, day, part, input_hash, seconds, peak_memory) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (run_id, r.year, r.day, p.part, r.input_hash, p.seconds, p.peak_memory)
+                for results in runs
+                for r in results
+                # Profiled timings are several times slower; cached ones were recorded already
+                if r.cprofile is None and not r.cached
+                for p in r.parts
+                if p.seconds is not None and p.status in ("ok", "unchecked")
+            ],
+        )
+    return run_id
+
+
+# ------------------------------
+# Comparing
+# ------------------------------
+@dataclass
+class Comparison:
+    year: int
+    day: int
+    part: int
+    base: list[float]
+    new: list[float]
+    p_value: float
+
+    @property
+    def base_median(self) -> float:
+        return median(self.base)
+
+    @property
+    def new_median(self) -> float:
+        return median(self.new)
+
+    @property
+    def change(self) -> float:
+        """Relative change of the median: +0.25 is 25% slower, -0.5 is twice as fast."""
+        return self.new_median / self.base_median - 1 if self.base_median else 0.0
+
+    @property
+    def significant(self) -> bool:
+        return self.p_value < ALPHA
+
+    @property
+    def verdict(self) -> str:
+        if not self.significant:
+            return "same"
+        return "slower" if self.change > 0 else "faster"
+
+
+def iqr(samples: list[float]) -> float:
+    if len(samples) < 2:
+        return 0.0
+    q1, _, q3 = quantiles(samples, n=4, method="inclusive")
+    return q3 - q1
+
+
+def mann_whitney_p(a: list[float], b: list[float]) -> float:
+    """Two-sided p-value of the Mann-Whitney U test (normal approximation, tie corrected)."""
+    n1, n2 = len(a), len(b)
+    if n1 == 0 or n2 == 0:
+        return 1.0
+
+    ranked = sorted([(v, 0) for v in a] + [(v, 1) for v in b])
+    ranks = [0.0] * len(ranked)
+    ties = 0.0
+    i = 0
+    while i < len(ranked):
+        j = i
+        while j + 1 < len(ranked) and ranked[j + 1][0] == ranked[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        t = j - i + 1
+        ties += t ** 3 - t
+        i = j + 1
+
+    r1 = sum(r for r, (_, group) in zip(ranks, ranked) if group == 0)
+    u = r1 - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    var = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1))) if n > 1 else 0.0
+    if var <= 0:
+        return 1.0
+    z = (abs(u - n1 * n2 / 2) - 0.5) / math.sqrt(var)
+    return min(1.0, math.erfc(max(z, 0.0) / math.sqrt(2)))
+
+
+def _resolve(ref: str, path: Union[str, Path]) -> str:
+    return _git(path, "rev-parse", ref) or ref
+
+
+def _same_commit(sha: str, commit: str) -> bool:
+    """Whether recorded `sha` is `commit` or starts with it; -dirty runs only match a -dirty commit."""
+    dirty = commit.endswith("-dirty")
+    return sha.endswith("-dirty") == dirty and sha.startswith(commit.removesuffix("-dirty"))
+
+
+def _samples(conn: sqlite3.Connection, commit: str, machine: str) -> dict[tuple, list[float]]:
+    dirty = commit.endswith("-dirty")
+    rows = conn.execute(
+        "SELECT t.year, t.day, t.part, t.input_hash, t.seconds FROM timings t JOIN runs r ON r.id = t.run_id "
+        "WHERE r.machine_id = ? AND substr(r.commit_sha, 1, ?) = ? AND (r.commit_sha LIKE '%-dirty') = ? "
+        "AND t.peak_memory IS NULL",
+        (machine, len(commit.removesuffix("-dirty")), commit.removesuffix("-dirty"), dirty),
+    )
+    samples: dict[tuple, list[float]] = {}
+    for year, day, part, input_hash, seconds in rows:
+        samples.setdefault((year, day, part, input_hash), []).append(seconds)
+    return samples
+
+
+def recent_commits(conn: sqlite3.Connection, machine: Optional[str] = None) -> list[str]:
+    """Commits with recorded runs on this machine, most recent first."""
+    rows = conn.execute(
+        "SELECT commit_sha, MAX(created) AS last FROM runs WHERE machine_id = ? AND commit_sha IS NOT NULL "
+        "GROUP BY commit_sha ORDER BY last DESC",
+        (machine or machine_id(),),
+    )
+    return [sha for sha, _ in rows]
+
+
+def compare(ref: Optional[str] = None, against: Optional[str] = None, path: Union[str, Path] = ".",
+            conn: Optional[sqlite3.Connection] = None) -> list[Comparison]:
+    """Compare the timings of commit `against` (default: latest recorded) with `ref`.
+
+    `ref` defaults to the most recent other commit with recorded runs. Both
+    accept anything `git rev-parse` understands in `path`, or a sha prefix.
+    Runs with uncommitted changes ("<sha>-dirty") only count for a -dirty
+    commit, never for the clean one.
+    """
+    conn = conn or connect()
+    machine = machine_id()
+    commits = recent_commits(conn, machine)
+    new = _resolve(against, path) if against else (commits[0] if commits else None)
+    if new is None:
+        raise ValueError("No recorded benchmark runs on this machine")
+    if ref is not None:
+        base = _resolve(ref, path)
+    else:
+        others = [c for c in commits if not _same_commit(c, new) and not _same_commit(new, c)]
+        if not others:
+            raise ValueError("No earlier commit with recorded runs to compare against")
+        base = others[0]
+
+    base_samples = _samples(conn, base, machine)
+    new_samples = _samples(conn, new, machine)
+    return [
+        Comparison(key[0], key[1], key[2], base_samples[key], new_samples[key],
+                   mann_whitney_p(base_samples[key], new_samples[key]))
+        for key in sorted(base_samples.keys() & new_samples.keys())
+    ]
+
+
+def regressions(comparisons: list[Comparison], threshold: float) -> list[Comparison]:
+    """Significant slowdowns larger than `threshold` (0.1 = 10%)."""
+    return [c for c in comparisons if c.verdict == "slower" and c.change > threshold]
+
+
+def format_comparison(comparisons: list[Comparison]) -> str:
+    rows = [("Day", "Part", "Base (median ± IQR)", "New (median ± IQR)", "Change", "p", "Verdict")]
+    for c in comparisons:
+        rows.append((
+            f"{c.year}/{c.day}",
+            str(c.part),
+            f"{c.base_median * 1000:.2f} ± {iqr(c.base) * 1000:.2f} ms",
+            f"{c.new_median * 1000:.2f} ± {iqr(c.new) * 1000:.2f} ms",
+            f"{c.change:+.1%}",
+            f"{c.p_value:.3f}",
+            c.verdict,
+        ))
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return "\n".join("  ".join(cell.ljust(w) for cell, w in zip(row, widths)).rstrip() for row in rows)
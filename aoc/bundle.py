@@ -0,0 +1,182 @@
+"""Portable archive bundles of cached puzzle data.
+
+A bundle packs inputs, pages and parsed metadata from the local cache into
+a single file that can be copied between machines. Every entry is
+compressed on its own and located through a header index, so a single
+(year, day) entry is read with one seek (or an mmap slice) without
+unpacking the rest.
+
+File layout:
+    MAGIC (8 bytes) | index length (uint64, little endian) | index (JSON) | blobs
+
+The index maps entry names ("2023/1/input", "stars") to [offset, length, size]
+with offsets relative to the first blob.
+
+A bundle named by the AOC_BUNDLE env var or the `bundle` config value is
+"mounted": client.fetch_input() and client.fetch_page() serve from it
+when the local cache misses.
+"""
+import json
+import mmap
+import struct
+import zlib
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Union
+
+from . import cache
+from .errors import BundleError
+from .fallbacks import setting
+
+MAGIC = b"AOCBNDL1"
+_HEADER = struct.Struct("<8sQ")
+
+
+def entry_name(year: int, day: int, kind: str) -> str:
+    return f"{year}/{day}/{kind}"
+
+
+class Bundle:
+    """Read-only view of a bundle file.
+
+    Usage:
+
+        with Bundle("aoc.bundle") as b:
+            data = b.read(2023, 1, "input")
+    """
+
+    def __init__(self, path: Union[str, Path], use_mmap: bool = False):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        self._mmap: Optional[mmap.mmap] = None
+        try:
+            head = self._file.read(_HEADER.size)
+            if len(head) != _HEADER.size:
+                raise BundleError(f"{self.path} is not an aoc bundle")
+            magic, index_len = _HEADER.unpack(head)
+            if magic != MAGIC:
+                raise BundleError(f"{self.path} is not an aoc bundle")
+            self.index: dict[str, list[int]] = json.loads(self._file.read(index_len))["entries"]
+            self._data_start = _HEADER.size + index_len
+            if use_mmap:
+                self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+
+    def __enter__(self) -> "Bundle":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.index
+
+    def names(self) -> list[str]:
+        return list(self.index)
+
+    def get(self, name: str) -> Optional[bytes]:
+        """Return the decompressed bytes of an entry, or None if absent."""
+        loc = self.index.get(name)
+        if loc is None:
+            return None
+        offset, length, _size = loc
+        start = self._data_start + offset
+        if self._mmap is not None:
+            blob = self._mmap[start:start + length]
+        else:
+            self._file.seek(start)
+            blob = self._file.read(length)
+        return zlib.decompress(blob)
+
+    def read(self, year: int, day: int, kind: str) -> Optional[bytes]:
+        """Return a per-day entry ("input", "page" or "meta"), or None if absent."""
+        return self.get(entry_name(year, day, kind))
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+
+def write_bundle(path: Union[str, Path], entries: Iterable[tuple[str, bytes]]) -> int:
+    """Write (name, data) pairs to a new bundle file. Returns the entry count."""
+    index: dict[str, list[int]] = {}
+    blobs: list[bytes] = []
+    offset = 0
+    for name, data in entries:
+        blob = zlib.compress(data, 9)
+        index[name] = [offset, len(blob), len(data)]
+        blobs.append(blob)
+        offset += len(blob)
+
+    header = json.dumps({"version": 1, "entries": index}, sort_keys=True).encode("utf8")
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, len(header)))
+        f.write(header)
+        for blob in blobs:
+            f.write(blob)
+    return len(index)
+
+
+def _cache_entries(years: Optional[Iterable[int]]) -> Iterator[tuple[str, bytes]]:
+    stars = cache.cache_dir() / cache.STARS_FILENAME
+    if stars.is_file():
+        yield "stars", stars.read_bytes()
+    for year, day, kind in cache.entries(years):
+        data = cache.read(year, day, kind)
+        if data is not None:
+            yield entry_name(year, day, kind), data
+
+
+def export_cache(path: Union[str, Path], years: Optional[Iterable[int]] = None) -> int:
+    """Pack the local cache (optionally only some years) into a bundle."""
+    return write_bundle(path, _cache_entries(years))
+
+
+def import_bundle(path: Union[str, Path], overwrite: bool = False) -> int:
+    """Unpack a bundle into the local cache. Returns the number of entries written.
+
+    Existing cache entries are kept unless overwrite=True. The star index
+    is merged per year.
+    """
+    written = 0
+    with Bundle(path) as b:
+        for name in b.names():
+            data = b.get(name)
+            if data is None:
+                continue
+            if name == "stars":
+                for year, encoded in json.loads(data).items():
+                    if overwrite or cache.load_stars(int(year)) is None:
+                        cache.save_stars(int(year), [int(c) for c in encoded])
+                        written += 1
+                continue
+            year, day, kind = name.split("/")
+            if kind not in cache.FILENAMES:
+                continue
+            if not overwrite and cache.read(int(year), int(day), kind) is not None:
+                continue
+            cache.write(int(year), int(day), kind, data)
+            written += 1
+    return written
+
+
+# ------------------------------
+# Mounted bundle
+# ------------------------------
+_mounted: Optional[Bundle] = None
+
+
+def mounted() -> Optional[Bundle]:
+    """Return the bundle named by AOC_BUNDLE / config `bundle`, opened once per process."""
+    global _mounted
+    path = setting("bundle")
+    if not path:
+        return None
+    if _mounted is None or _mounted.path != Path(path):
+        if _mounted is not None:
+            _mounted.close()
+        _mounted = Bundle(path, use_mmap=True)
+    return _mounted
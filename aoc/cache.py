@@ -0,0 +1,215 @@
+"""On-disk cache for data fetched from AoC.
+
+The cache lives in the directory named by the AOC_CACHE_DIR env var, or
+in $XDG_CACHE_HOME/aoc (defaulting to ~/.cache/aoc) when it is not set.
+
+Layout:
+    stars.json              per-year star index, e.g. {"2023": "2222211000..."}
+    2023/01/input.txt       puzzle input (never changes once unlocked)
+    2023/01/page.html       authenticated puzzle page
+    2023/01/meta.json       parsed metadata about the puzzle
+    2023/01/render/         rendered descriptions, per page revision
+    runs/2023.json          solver results of `aoc run`, keyed by day and fingerprint
+"""
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, BinaryIO, Iterable, Iterator, Optional
+
+CACHE_ENV = "AOC_CACHE_DIR"
+STARS_FILENAME = "stars.json"
+RUNS_DIRNAME = "runs"
+DAYS = 25
+
+# Kind of per-day entry -> file name inside the day directory
+FILENAMES = {
+    "input": "input.txt",
+    "page": "page.html",
+    "meta": "meta.json",
+}
+
+
+def cache_dir() -> Path:
+    """Return the cache directory. It is created lazily on first write."""
+    if path := os.environ.get(CACHE_ENV):
+        return Path(path)
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "aoc"
+
+
+# Internal helpers
+def _read_json(path: Path) -> dict[str, Any]:
+    try:
+        with open(path, encoding="utf8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+@contextmanager
+def _atomic_open(path: Path) -> Iterator[BinaryIO]:
+    """Open a temporary file that replaces `path` only once fully written.
+
+    Concurrent readers never see a partial file; on error the file is discarded.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            yield f
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def _write_bytes(path: Path, data: bytes) -> None:
+    with _atomic_open(path) as f:
+        f.write(data)
+
+
+def _write_json(path: Path, data: dict[str, Any]) -> None:
+    _write_bytes(path, json.dumps(data, sort_keys=True).encode("utf8"))
+
+
+# ------------------------------
+# Per-day entries
+# ------------------------------
+def day_path(year: int, day: int, kind: str) -> Path:
+    """Return the path of a per-day cache entry ("input", "page" or "meta")."""
+    return cache_dir() / str(year) / f"{day:02d}" / FILENAMES[kind]
+
+
+def read(year: int, day: int, kind: str) -> Optional[bytes]:
+    """Return the raw bytes of a cached entry, or None if it is not cached."""
+    try:
+        return day_path(year, day, kind).read_bytes()
+    except OSError:
+        return None
+
+
+def write(year: int, day: int, kind: str, data: bytes) -> None:
+    """Store the raw bytes of a cache entry."""
+    _write_bytes(day_path(year, day, kind), data)
+
+
+@contextmanager
+def writer(year: int, day: int, kind: str) -> Iterator[BinaryIO]:
+    """Open a cache entry for streaming writes; it appears only once complete."""
+    with _atomic_open(day_path(year, day, kind)) as f:
+        yield f
+
+
+def drop(year: int, day: int, kind: str) -> None:
+    """Remove a cached entry if present."""
+    day_path(year, day, kind).unlink(missing_ok=True)
+
+
+def entries(years: Optional[Iterable[int]] = None) -> Iterator[tuple[int, int, str]]:
+    """Yield (year, day, kind) for every cached per-day entry, in order."""
+    root = cache_dir()
+    wanted = None if years is None else {str(y) for y in years}
+    if not root.is_dir():
+        return
+
+    for year_dir in sorted(p for p in root.iterdir() if p.name.isdigit()):
+        if wanted is not None and year_dir.name not in wanted:
+            continue
+        for day_dir in sorted(p for p in year_dir.iterdir() if p.name.isdigit()):
+            for kind, filename in FILENAMES.items():
+                if (day_dir / filename).is_file():
+                    yield int(year_dir.name), int(day_dir.name), kind
+
+
+def read_meta(year: int, day: int) -> dict[str, Any]:
+    """Return the parsed metadata stored for a puzzle (empty if none)."""
+    return _read_json(day_path(year, day, "meta"))
+
+
+def update_meta(year: int, day: int, **values: Any) -> None:
+    """Merge `values` into the metadata stored for a puzzle."""
+    path = day_path(year, day, "meta")
+    data = _read_json(path)
+    data.update(values)
+    _write_json(path, data)
+
+
+# ------------------------------
+# Rendered descriptions
+# ------------------------------
+def _render_dir(year: int, day: int) -> Path:
+    return cache_dir() / str(year) / f"{day:02d}" / "render"
+
+
+def read_render(year: int, day: int, revision: str, variant: str) -> Optional[str]:
+    """Return a rendered description of page `revision`, or None if not rendered yet."""
+    try:
+        return (_render_dir(year, day) / f"{revision}-{variant}.txt").read_text(encoding="utf8")
+    except OSError:
+        return None
+
+
+def write_render(year: int, day: int, revision: str, variant: str, text: str) -> None:
+    """Store a rendered description, dropping renders of older page revisions."""
+    directory = _render_dir(year, day)
+    if directory.is_dir():
+        for old in directory.glob("*.txt"):
+            if not old.name.startswith(f"{revision}-"):
+                old.unlink(missing_ok=True)
+    _write_bytes(directory / f"{revision}-{variant}.txt", text.encode("utf8"))
+
+
+# ------------------------------
+# Star index
+# ------------------------------
+def load_stars(year: int) -> Optional[list[int]]:
+    """Return the cached star counts for `year` (index day - 1), or None."""
+    encoded = _read_json(cache_dir() / STARS_FILENAME).get(str(year))
+    if not isinstance(encoded, str) or len(encoded) != DAYS or not encoded.isdigit():
+        return None
+    return [int(c) for c in encoded]
+
+
+def save_stars(year: int, stars: list[int]) -> None:
+    """Store the star counts for `year`, replacing any previous index."""
+    path = cache_dir() / STARS_FILENAME
+    data = _read_json(path)
+    data[str(year)] = "".join(str(min(max(s, 0), 2)) for s in stars)
+    _write_json(path, data)
+
+
+def update_star(year: int, day: int, count: int) -> None:
+    """Raise the star count of a single day in an existing index.
+
+    Does nothing when `year` has no index yet: a partial index would claim
+    the other days are unsolved.
+    """
+    stars = load_stars(year)
+    if stars is None or not 1 <= day <= DAYS:
+        return
+    if count > stars[day - 1]:
+        stars[day - 1] = count
+        save_stars(year, stars)
+
+
+def drop_stars(year: int) -> None:
+    """Forget the star index of `year` so it is fetched again next time."""
+    path = cache_dir() / STARS_FILENAME
+    data = _read_json(path)
+    if data.pop(str(year), None) is not None:
+        _write_json(path, data)
+
+
+# ------------------------------
+# Solver runs
+# ------------------------------
+def load_runs(year: int) -> dict[str, Any]:
+    """Return the stored solver results of `year`: {"<day>": {"fingerprint", "raw"}}."""
+    return _read_json(cache_dir() / RUNS_DIRNAME / f"{year}.json")
+
+
+def save_runs(year: int, runs: dict[str, Any]) -> None:
+    _write_json(cache_dir() / RUNS_DIRNAME / f"{year}.json", runs)
@@ -1,10 +1,16 @@
+import json
 import sys
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict
 from datetime import date as _date
 from typing import Optional, Tuple
 
 import click
 
-from . import api, config
+from . import api, bundle, config, parser, runner, scaffold, trace
+from . import stress as stress_mod
+from . import bench as bench_db
 from .errors import (
     AOCError,
     MissingCookieError,
@@ -62,10 +68,38 @@ class DateOption(click.ParamType):
 
 DATE_TYPE = DateOption()
 
+
+class IndexOption(click.ParamType):
+    """
+    Parses --idx values of the form:
+        "1"
+        "0,2:4"   (blocks 0, 2 and 3)
+        "-1"
+    Returns an int for a single index, else a list of ints and slices
+    """
+
+    name = "index"
+
+    def convert(self, value, param, ctx):
+        if not isinstance(value, str):
+            return value
+        try:
+            items = parser.parse_index(value)
+        except ValueError as e:
+            self.fail(str(e), param, ctx)
+        return items[0] if len(items) == 1 and isinstance(items[0], int) else items
+
+INDEX_TYPE = IndexOption()
+
 # Options for CLI arguments
 _year_option = click.option("--year", "-y", type=int, help="Year of the puzzle")
 _day_option = click.option("--day", "-d", type=int, help="Day of the puzzle")
-_idx_option = click.option("--idx", "-i", type=int, default=None, help="0-based index of code block")
+_idx_option = click.option("--idx", "-i", type=INDEX_TYPE, default=None,
+                           help="0-based block index, or a list and ranges like 0,2:4")
+_blocks_json_option = click.option("--json", "as_json", is_flag=True,
+                                   help="Print the selected blocks with their indices and metadata as JSON")
+_null_option = click.option("--null-separated", "-0", "null_separated", is_flag=True,
+                            help="End every selected block with a NUL byte instead of joining them with --sep")
 _sep_option = click.option("--sep", "-s", type=str, default="\n", help="Separator for multiple blocks")
 _date_option = click.option("--date", "-D", type=DATE_TYPE, default=None,
                             help="Combined date as 'YYYY/D' or 'YYYY/DD' or 'today'")
@@ -76,9 +110,21 @@ _cookie_option = click.option("--cookie", "-c", type=str, default=None,
 # Main entry point
 # ------------------------------
 @click.group()
-def cli():
+@click.option("--profile", type=click.Path(dir_okay=False, writable=True), default=None,
+              help="Write timing spans and request counters of this command to a trace file")
+@click.option("--profile-format", type=click.Choice(["chrome", "json"]), default="chrome", show_default=True,
+              help="Trace file format: Chrome trace events or plain JSON")
+@click.pass_context
+def cli(ctx: click.Context, profile: Optional[str] = None, profile_format: str = "chrome"):
     """AoC CLI entry point."""
-    pass
+    if profile is not None:
+        recorder = trace.Recorder().start()
+
+        def write_profile():
+            recorder.stop()
+            recorder.dump(profile, format=profile_format)
+
+        ctx.call_on_close(write_profile)
 
 # ------------------------------
 # Fetching commands
@@ -98,9 +144,8 @@ def fetch_input(year: Optional[int] = None, day: Optional[int] = None, date: Opt
     """Fetch puzzle input for a given day (plain text)."""
     year, day = _validate_date_opts(year, day, date)
     try:
-        data = api.fetch_input(year=year, day=day, cookie=cookie)
-        # print raw input without extra newline
-        click.echo(data, nl=False)
+        # stream raw input bytes as they arrive, without extra newline
+        api.stream_input(sys.stdout.buffer, year=year, day=day, cookie=cookie)
     except InputNotFoundError as e:
         click.echo(str(e), err=True)
         sys.exit(1)
@@ -112,19 +157,36 @@ def fetch_input(year: Optional[int] = None, day: Optional[int] = None, date: Opt
         sys.exit(1)
 
 
+def _echo_blocks(fetch, year: Optional[int], day: Optional[int], examples: bool, idx, sep: str,
+                 as_json: bool, null_separated: bool) -> None:
+    if as_json and null_separated:
+        click.echo("Use either --json or --null-separated", err=True)
+        sys.exit(2)
+    if as_json or null_separated:
+        blocks = api.fetch_blocks(year=year, day=day, examples=examples, idx=idx)
+        if as_json:
+            click.echo(json.dumps(blocks, indent=2))
+        else:
+            click.echo("".join(f"{block['text']}\0" for block in blocks), nl=False)
+        return
+    data = fetch(year=year, day=day, idx=idx, sep=sep)
+    click.echo(data if isinstance(data, str) else sep.join(data))
+
+
 @fetch.command("code")
 @_year_option
 @_day_option
 @_date_option
 @_idx_option
 @_sep_option
+@_blocks_json_option
+@_null_option
 def fetch_code(year: Optional[int] = None, day: Optional[int] = None, date: Optional[Tuple[int, int]] = None,
-               idx: Optional[int] = None, sep: str = "\n"):
+               idx=None, sep: str = "\n", as_json: bool = False, null_separated: bool = False):
     """Fetch <pre><code> blocks from the problem page."""
     year, day = _validate_date_opts(year, day, date)
     try:
-        data = api.fetch_code(year=year, day=day, idx=idx, sep=sep)
-        click.echo(data)
+        _echo_blocks(api.fetch_code, year, day, False, idx, sep, as_json, null_separated)
     except Exception as e:
         click.echo(f"Error fetching code blocks: {e}", err=True)
         sys.exit(1)
@@ -136,18 +198,268 @@ def fetch_code(year: Optional[int] = None, day: Optional[int] = None, date: Opti
 @_date_option
 @_idx_option
 @_sep_option
+@_blocks_json_option
+@_null_option
 def fetch_example(year: Optional[int] = None, day: Optional[int] = None, date: Optional[Tuple[int, int]] = None,
-                  idx: Optional[int] = None, sep: str = "\n"):
+                  idx=None, sep: str = "\n", as_json: bool = False, null_separated: bool = False):
     """Fetch example <pre><code> blocks preceded by 'for example:' paragraph."""
     year, day = _validate_date_opts(year, day, date)
     try:
-        data = api.fetch_example(year=year, day=day, idx=idx, sep=sep)
-        click.echo(data)
+        _echo_blocks(api.fetch_example, year, day, True, idx, sep, as_json, null_separated)
     except Exception as e:
         click.echo(f"Error fetching example blocks: {e}", err=True)
         sys.exit(1)
 
 
+# ------------------------------
+# Puzzle description
+# ------------------------------
+@cli.command()
+@_year_option
+@_day_option
+@_date_option
+@_cookie_option
+@click.option("--part", "-p", type=click.IntRange(1, 2), default=None, help="Only show this part")
+@click.option("--width", "-w", type=click.IntRange(min=20), default=None, help="Reflow text to this many columns")
+@click.option("--pager/--no-pager", default=True, help="Page output on a terminal")
+@click.option("--refresh", "-r", is_flag=True, help="Ignore the cached page and fetch it again")
+def show(year: Optional[int] = None, day: Optional[int] = None, date: Optional[Tuple[int, int]] = None,
+         cookie: Optional[str] = None, part: Optional[int] = None, width: Optional[int] = None, pager: bool = True,
+         refresh: bool = False):
+    """Show the puzzle description as terminal text."""
+    year, day = _validate_date_opts(year, day, date)
+    try:
+        text = api.fetch_description(year=year, day=day, part=part, width=width, cookie=cookie, refresh=refresh)
+    except Exception as e:
+        click.echo(f"Error fetching description: {e}", err=True)
+        sys.exit(1)
+
+    if pager and sys.stdout.isatty():
+        click.echo_via_pager(text)
+    else:
+        click.echo(text, nl=False)
+
+
+# ------------------------------
+# New puzzle
+# ------------------------------
+@cli.command()
+@click.argument("year", type=int, required=False)
+@click.argument("day", type=click.IntRange(1, 25), required=False)
+@click.option("--path", "-P", type=click.Path(file_okay=False), default=".", show_default=True,
+              help="Solver directory; the solver is written to PATH/YEAR/dayDD.py")
+@click.option("--template", "-T", type=click.Path(exists=True, dir_okay=False), default=None,
+              help="Solver template with $year, $day and $title placeholders")
+@click.option("--overwrite", is_flag=True, help="Replace an existing solver file")
+@_cookie_option
+def new(year: Optional[int] = None, day: Optional[int] = None, path: str = ".", template: Optional[str] = None,
+        overwrite: bool = False, cookie: Optional[str] = None):
+    """Create a solver skeleton for a puzzle and prefetch its input, page and examples."""
+    try:
+        puzzle = scaffold.new(year, day, path=path, template=template, cookie=cookie, overwrite=overwrite)
+    except Exception as e:
+        click.echo(f"Error creating puzzle: {e}", err=True)
+        sys.exit(1)
+
+    click.echo(f"{'created' if puzzle.created else 'kept existing'} {puzzle.solver}")
+    click.echo(f"wrote {puzzle.sidecar} ({len(puzzle.examples)} examples, "
+               f"expected {', '.join(e or '?' for e in puzzle.expected) or '?'})")
+    click.echo(f"cached input ({puzzle.input_bytes} bytes) and puzzle page")
+
+
+# ------------------------------
+# Puzzle status
+# ------------------------------
+@cli.command()
+@_year_option
+@_cookie_option
+@click.option("--refresh", "-r", is_flag=True, help="Ignore the cached star index and fetch the calendar")
+def status(year: Optional[int] = None, cookie: Optional[str] = None, refresh: bool = False):
+    """Show the stars earned on every day of a year."""
+    try:
+        stars = api.fetch_stars(year=year, cookie=cookie, refresh=refresh)
+    except Exception as e:
+        click.echo(f"Error fetching star status: {e}", err=True)
+        sys.exit(1)
+
+    for day, count in enumerate(stars, start=1):
+        click.echo(f"{day:>2} {'*' * count}".rstrip())
+    click.echo(f"{sum(stars)}/{2 * len(stars)} stars")
+
+
+# ------------------------------
+# Run solvers
+# ------------------------------
+@cli.command()
+@_year_option
+@click.option("--day", "-d", "days", type=click.IntRange(1, 25), multiple=True, help="Day to run (repeatable)")
+@click.option("--all", "-a", "run_all", is_flag=True, help="Run every solver found for the year")
+@click.option("--path", "-P", type=click.Path(exists=True, file_okay=False), default=".", show_default=True,
+              help="Directory with dayNN.py solvers (or a YEAR subdirectory)")
+@click.option("--jobs", "-j", type=click.IntRange(min=1), default=None, help="Worker processes [default: cores]")
+@click.option("--timeout", "-t", type=float, default=60.0, show_default=True, help="Seconds per day")
+@click.option("--memory-limit", "-m", type=click.IntRange(min=1), default=None, help="Address space cap per day, in MB")
+@click.option("--memory", "trace_memory", is_flag=True,
+              help="Trace allocations: peak memory, RSS change and top allocation sites (slower)")
+@click.option("--cprofile", "use_cprofile", is_flag=True,
+              help="Profile with cProfile: hotspot table plus .prof and collapsed-stack files per day")
+@click.option("--cprofile-dir", type=click.Path(file_okay=False), default="profiles", show_default=True,
+              help="Where --cprofile saves its files")
+@click.option("--force", "-f", is_flag=True,
+              help="Run every solver, even if it, its local imports and its input are unchanged")
+@click.option("--json", "as_json", is_flag=True, help="Print results as JSON")
+@_cookie_option
+def run(year: Optional[int] = None, days: Tuple[int, ...] = (), run_all: bool = False, path: str = ".",
+        jobs: Optional[int] = None, timeout: float = 60.0, memory_limit: Optional[int] = None,
+        trace_memory: bool = False, use_cprofile: bool = False, cprofile_dir: str = "profiles",
+        force: bool = False, as_json: bool = False, cookie: Optional[str] = None):
+    """Run solvers on their cached inputs and check them against accepted answers.
+
+    Days whose solver, local imports and input are unchanged since their last
+    successful run are not run again; their stored results are shown.
+    """
+    if run_all == bool(days):
+        click.echo("Use either --all or --day", err=True)
+        sys.exit(2)
+    results = runner.run_year(year, path, days=None if run_all else days, jobs=jobs, timeout=timeout,
+                              memory_limit=memory_limit * 2**20 if memory_limit else None, cookie=cookie,
+                              memory=trace_memory, cprofile_dir=cprofile_dir if use_cprofile else None,
+                              incremental=not force)
+    if not results:
+        click.echo(f"No solvers found in {path}", err=True)
+        sys.exit(1)
+
+    if as_json:
+        click.echo(json.dumps(runner.to_json(results), indent=2))
+    else:
+        click.echo(runner.format_table(results))
+        cached = runner.format_cached(results)
+        if cached:
+            click.echo(f"{cached} (--force to rerun)")
+        sections = runner.format_sections(results)
+        if sections:
+            click.echo()
+            click.echo(sections)
+        if trace_memory:
+            click.echo()
+            click.echo(runner.format_memory(results))
+        if use_cprofile:
+            click.echo()
+            click.echo(runner.format_hotspots(results))
+    sys.exit(0 if all(r.ok for r in results) else 1)
+
+
+@cli.command()
+@_year_option
+@_day_option
+@click.option("--path", "-P", type=click.Path(exists=True, file_okay=False), default=".", show_default=True,
+              help="Directory with dayNN.py solvers (or a YEAR subdirectory)")
+@click.option("--factor", "-f", "factors", type=click.FloatRange(min=1), multiple=True,
+              help="Scale factor of a synthetic input (repeatable) [default: 2, 10, 100]")
+@click.option("--timeout", "-t", type=float, default=60.0, show_default=True, help="Seconds per input size")
+@click.option("--seed", type=int, default=0, show_default=True, help="Seed for the synthetic inputs")
+@click.option("--json", "as_json", is_flag=True, help="Print timings and fits as JSON")
+@_cookie_option
+def stress(year: Optional[int] = None, day: Optional[int] = None, path: str = ".", factors: Tuple[float, ...] = (),
+           timeout: float = 60.0, seed: int = 0, as_json: bool = False, cookie: Optional[str] = None):
+    """Time a solver on inputs scaled up from its real one and fit how it grows."""
+    def report(point: stress_mod.StressPoint):
+        click.echo(f"{point.label}: {runner.format_size(point.size)} done", err=True)
+
+    try:
+        result = stress_mod.stress(year, day, path, factors=factors or stress_mod.FACTORS, timeout=timeout,
+                                   seed=seed, cookie=cookie, progress=None if as_json else report)
+    except (FileNotFoundError, AOCError) as e:
+        click.echo(str(e), err=True)
+        sys.exit(1)
+
+    if as_json:
+        click.echo(json.dumps(asdict(result), indent=2))
+    else:
+        click.echo(stress_mod.format_report(result))
+
+
+# ------------------------------
+# Benchmark history
+# ------------------------------
+@cli.group()
+def bench():
+    """Record solver timings and compare them across commits."""
+    pass
+
+
+@bench.command("run")
+@_year_option
+@click.option("--day", "-d", "days", type=click.IntRange(1, 25), multiple=True,
+              help="Day to run (repeatable) [default: all]")
+@click.option("--path", "-P", type=click.Path(exists=True, file_okay=False), default=".", show_default=True,
+              help="Directory with dayNN.py solvers (or a YEAR subdirectory)")
+@click.option("--repeat", "-r", type=click.IntRange(min=1), default=5, show_default=True,
+              help="Runs per solver; more runs give more reliable comparisons")
+@click.option("--jobs", "-j", type=click.IntRange(min=1), default=1, show_default=True,
+              help="Worker processes; more than one makes timings noisier")
+@click.option("--timeout", "-t", type=float, default=60.0, show_default=True, help="Seconds per day")
+@click.option("--memory", "trace_memory", is_flag=True, help="Also record peak memory from one traced run")
+@_cookie_option
+def bench_run(year: Optional[int] = None, days: Tuple[int, ...] = (), path: str = ".", repeat: int = 5,
+              jobs: int = 1, timeout: float = 60.0, trace_memory: bool = False, cookie: Optional[str] = None):
+    """Run solvers repeatedly and store their timings for the current commit."""
+    runs = [runner.run_year(year, path, days=days or None, jobs=jobs, timeout=timeout, cookie=cookie)
+            for _ in range(repeat)]
+    if not runs[0]:
+        click.echo(f"No solvers found in {path}", err=True)
+        sys.exit(1)
+    if trace_memory:
+        runs.append(runner.run_year(year, path, days=days or None, jobs=jobs, timeout=timeout, cookie=cookie,
+                                    memory=True))
+
+    commit = bench_db.git_commit(path)
+    run_id = bench_db.record(runs, commit)
+    click.echo(runner.format_table(runs[-1]))
+    click.echo(f"recorded run {run_id} ({repeat}x) for commit {commit or 'unknown'}")
+
+
+@bench.command("record")
+@click.argument("file", type=click.File("r"))
+@click.option("--path", "-P", type=click.Path(exists=True, file_okay=False), default=".", show_default=True,
+              help="Git repository whose HEAD the results belong to")
+def bench_record(file, path: str = "."):
+    """Store results saved with 'aoc run --json' (use - for stdin)."""
+    try:
+        results = runner.from_json(json.load(file))
+    except (ValueError, TypeError) as e:
+        click.echo(f"Invalid results file: {e}", err=True)
+        sys.exit(2)
+    commit = bench_db.git_commit(path)
+    run_id = bench_db.record([results], commit)
+    click.echo(f"recorded run {run_id} for commit {commit or 'unknown'}")
+
+
+@bench.command("compare")
+@click.argument("ref", required=False)
+@click.option("--against", "-a", default=None, help="Commit to check [default: latest recorded]")
+@click.option("--path", "-P", type=click.Path(exists=True, file_okay=False), default=".", show_default=True,
+              help="Git repository used to resolve REF")
+@click.option("--threshold", "-t", type=float, default=10.0, show_default=True,
+              help="Fail on significant slowdowns above this many percent")
+def bench_compare(ref: Optional[str] = None, against: Optional[str] = None, path: str = ".", threshold: float = 10.0):
+    """Compare recorded timings with those of REF [default: previous recorded commit]."""
+    try:
+        comparisons = bench_db.compare(ref, against, path=path)
+    except ValueError as e:
+        click.echo(str(e), err=True)
+        sys.exit(2)
+    if not comparisons:
+        click.echo("No timings in common to compare", err=True)
+        sys.exit(2)
+
+    click.echo(bench_db.format_comparison(comparisons))
+    slower = bench_db.regressions(comparisons, threshold / 100)
+    if slower:
+        click.echo(f"{len(slower)} part(s) slower by more than {threshold:g}%", err=True)
+        sys.exit(1)
+
+
 # ------------------------------
 # Submit puzzle answers
 # ------------------------------
@@ -158,12 +470,35 @@ def fetch_example(year: Optional[int] = None, day: Optional[int] = None, date: O
 @_day_option
 @_date_option
 @_cookie_option
+@click.option("--batch", "-b", type=click.Path(exists=True, dir_okay=False), default=None,
+              help="CSV file of year,day,part,answer rows to submit in order")
+@click.option("--log", "-l", type=click.Path(dir_okay=False), default=None,
+              help="Result log for --batch, used to resume [default: BATCH.log.jsonl]")
+@click.option("--dry-run", is_flag=True, help="With --batch, show what would be submitted")
 def submit(first_answer, second_answer, year: Optional[int] = None, day: Optional[int] = None,
-           date: Optional[Tuple[int, int]] = None, cookie: Optional[str] = None):
-    """Submit one or two answers to AoC."""
+           date: Optional[Tuple[int, int]] = None, cookie: Optional[str] = None, batch: Optional[str] = None,
+           log: Optional[str] = None, dry_run: bool = False):
+    """Submit one or two answers to AoC, or a whole file of answers with --batch."""
+    if batch is not None:
+        if first_answer is not None or year is not None or day is not None or date is not None:
+            click.echo("Cannot combine --batch with answers or a date", err=True)
+            sys.exit(2)
+        _submit_batch(batch, log or f"{batch}.log.jsonl", cookie, dry_run)
+        return
 
     year, day = _validate_date_opts(year, day, date)
 
+    # Resolve the target level (and warm the connection) while stdin is read. The
+    # POST runs on the same worker thread so it reuses that thread's connection.
+    pool = ThreadPoolExecutor(1)
+    target = pool.submit(api.prepare_submit, year=year, day=day, cookie=cookie)
+    try:
+        _submit_answers(target, pool, first_answer, second_answer)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _submit_answers(target: Future, pool: ThreadPoolExecutor, first_answer, second_answer):
     # Read stdin (strip blank lines)
     stdin_lines = [line.strip() for line in sys.stdin if line.strip()]
 
@@ -188,7 +523,9 @@ def submit(first_answer, second_answer, year: Optional[int] = None, day: Optiona
         second_answer = stdin_lines[1] if len(stdin_lines) == 2 else None
 
     try:
-        msg = api.submit(first_answer, second_answer, year=year, day=day, cookie=cookie)
+        t = target.result()
+        msg = pool.submit(api.submit, first_answer, second_answer, year=t.year, day=t.day, cookie=t.cookie,
+                          level=t.level).result()
         click.echo(msg)
         sys.exit(0)
     except WrongAnswerError as e:
@@ -205,6 +542,53 @@ def submit(first_answer, second_answer, year: Optional[int] = None, day: Optiona
         sys.exit(4)
 
 
+def _submit_batch(path: str, log: str, cookie: Optional[str], dry_run: bool):
+    def report(result: api.BatchResult):
+        click.echo(f"{result.year}/{result.day:02d} part {result.part}: {result.status}"
+                   + (f" ({result.message})" if result.message and result.status != "correct" else ""))
+
+    try:
+        results = api.submit_batch(path, log=log, cookie=cookie, dry_run=dry_run, progress=report)
+    except (ValueError, AOCError) as e:
+        click.echo(str(e), err=True)
+        sys.exit(4)
+
+    counts = Counter(r.status for r in results)
+    click.echo(", ".join(f"{n} {status}" for status, n in counts.items()) or "nothing to submit")
+    if counts.get("error"):
+        sys.exit(4)
+    sys.exit(1 if counts.get("wrong") else 0)
+
+
+# ------------------------------
+# Bundle commands
+# ------------------------------
+@cli.command("export")
+@click.argument("path", type=click.Path(dir_okay=False, writable=True))
+@click.option("--year", "-y", type=int, multiple=True, help="Only export this year (repeatable)")
+def export_cmd(path: str, year: Tuple[int, ...] = ()):
+    """Pack cached inputs, pages and metadata into a single bundle file."""
+    try:
+        count = bundle.export_cache(path, years=year or None)
+    except Exception as e:
+        click.echo(f"Error exporting bundle: {e}", err=True)
+        sys.exit(1)
+    click.echo(f"exported {count} entries to {path}")
+
+
+@cli.command("import")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--overwrite", is_flag=True, help="Replace entries that are already cached")
+def import_cmd(path: str, overwrite: bool = False):
+    """Unpack a bundle file into the local cache."""
+    try:
+        count = bundle.import_bundle(path, overwrite=overwrite)
+    except Exception as e:
+        click.echo(f"Error importing bundle: {e}", err=True)
+        sys.exit(1)
+    click.echo(f"imported {count} entries from {path}")
+
+
 # ------------------------------
 # Configuration commands
 # ------------------------------
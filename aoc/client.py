@@ -3,37 +3,300 @@
 Responsibilities:
 - Read cookie from AOC_COOKIE env var (required)
 - Fetch page HTML
-- Fetch puzzle input text
+- Fetch the yearly calendar HTML
+- Fetch puzzle input text or bytes, or stream it to a file
 - Submit an answer
 
 This module purposely avoids interpreting HTML; it returns raw text for parser.py to handle.
+
+Inputs and authenticated pages are served from the local cache (see cache.py)
+or a mounted bundle (see bundle.py) before going to the network. Concurrent
+identical fetches within a process share one request (see singleflight.py).
+All requests go through one shared transport (see transport.py), so
+connections to the server are reused across calls and threads.
 """
+import random
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from time import sleep
+from typing import BinaryIO, Callable, Optional, TypeVar
+from urllib.parse import urlencode
 
-import requests
+from . import bundle, cache, singleflight, throttle, trace, transport
+from .errors import HTTPError, NotUnlockedError, ServerError, ThrottledError, TransientError
+from .fallbacks import setting
 
 BASE = "https://adventofcode.com"
+CHUNK_SIZE = 64 * 1024
+# Puzzles unlock at midnight US Eastern (UTC-5 in December)
+UNLOCK_TZ = timezone(timedelta(hours=-5))
+
+T = TypeVar("T")
+
+_flights = singleflight.Group()
+# Created here so concurrent first requests share one pool; its threads start on first use
+_hedge_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="aoc-hedge")
+
+
+# ------------------------------
+# Error classification
+# ------------------------------
+def unlock_time(year: int, day: int) -> datetime:
+    """When the puzzle of year/day unlocks."""
+    return datetime(year, 12, day, tzinfo=UNLOCK_TZ)
+
+
+def _retry_after(value: Optional[str]) -> Optional[float]:
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None  # An HTTP date; rare enough to fall back to backoff
+
 
+def _error(resp: transport.Response, method: str, url: str) -> HTTPError:
+    """Turn an error response into the most specific HTTPError subclass."""
+    message = f"{resp.status} error for {method} {url}"
+    headers = {k.lower(): v for k, v in resp.headers.items()}
+    retry_after = _retry_after(headers.get("retry-after"))
+    if resp.status == 429:
+        return ThrottledError(message, resp.status, retry_after)
+    if resp.status >= 500:
+        return ServerError(message, resp.status, retry_after)
+    m = re.search(r"/(\d{4})/day/(\d{1,2})\b", url) if resp.status == 404 else None
+    if m and 1 <= int(m.group(2)) <= cache.DAYS:  # other days are not puzzles, just missing pages
+        unlocks_at = unlock_time(int(m.group(1)), int(m.group(2)))
+        if datetime.now(timezone.utc) < unlocks_at:
+            return NotUnlockedError(f"Puzzle unlocks at {unlocks_at.isoformat()} ({message})", resp.status, unlocks_at)
+    return HTTPError(message, resp.status, retry_after)
 
-def fetch_page(year: int, day: int) -> str:
-    """GET the AoC problem page HTML for year/day (authenticated).
 
-    Returns raw HTML string. Cookie not necessary.
+# ------------------------------
+# Retries and hedging
+# ------------------------------
+@dataclass
+class RetryPolicy:
+    """Exponential backoff with full jitter for transient failures.
+
+    Attempt n (from 0) waits a random time between 0 and
+    min(cap, base * 2 ** n) seconds, but at least the server's Retry-After.
+    Requests that are not idempotent (POST) are only retried when the
+    server throttled them, since it did not process them.
+
+    With `hedge` > 0, an idempotent GET that has not finished after `hedge`
+    seconds gets a duplicate request; the first response wins. This trims
+    the latency tail around unlock time at the cost of extra requests.
     """
+
+    attempts: int = 4
+    base: float = 0.5
+    cap: float = 30.0
+    hedge: float = 0.0
+
+    def delay(self, attempt: int, error: Exception) -> float:
+        delay = random.uniform(0, min(self.cap, self.base * 2 ** attempt))
+        retry_after = getattr(error, "retry_after", None)
+        return max(delay, retry_after) if retry_after is not None else delay
+
+    def retryable(self, error: Exception, idempotent: bool) -> bool:
+        if isinstance(error, ThrottledError):
+            return True
+        return idempotent and isinstance(error, TransientError)
+
+    def call(self, fn: Callable[[], T], idempotent: bool = True) -> T:
+        """Run fn(), repeating it after transient failures."""
+        attempt = 0
+        while True:
+            try:
+                return fn()
+            except Exception as exc:
+                if attempt + 1 >= self.attempts or not self.retryable(exc, idempotent):
+                    raise
+                delay, reason = self.delay(attempt, exc), type(exc).__name__
+            attempt += 1
+            trace.count("retries")
+            with trace.span("client.retry", attempt=attempt, delay=delay, error=reason):
+                sleep(delay)
+
+
+def retry_policy() -> RetryPolicy:
+    """The policy from the `retries`, `retry_base`, `retry_cap` and `hedge` settings."""
+    return RetryPolicy(
+        attempts=max(1, int(setting("retries", RetryPolicy.attempts))),
+        base=float(setting("retry_base", RetryPolicy.base)),
+        cap=float(setting("retry_cap", RetryPolicy.cap)),
+        hedge=float(setting("hedge", RetryPolicy.hedge)),
+    )
+
+
+def _hedged(fn: Callable[[], T], after: float) -> T:
+    """Run fn(); if it takes longer than `after` seconds, race a second fn() against it."""
+    futures = [_hedge_pool.submit(fn)]
+    done, _ = wait(futures, timeout=after)
+    if not done:
+        trace.count("hedged_requests")
+        futures.append(_hedge_pool.submit(fn))
+
+    error: Optional[BaseException] = None
+    for fut in as_completed(futures):
+        if (error := fut.exception()) is None:
+            return fut.result()
+    raise error
+
+
+# ------------------------------
+# Requests
+# ------------------------------
+def _send(method: str, url: str, headers: dict[str, str], body: Optional[bytes],
+          stream: bool) -> transport.Response:
+    """One attempt: throttle, send, count, and raise for error statuses."""
+    delay = throttle.acquire()
+    with trace.span("client.request", method=method, url=url, throttle_delay=delay) as attrs:
+        resp = transport.default().request(method, url, headers=headers, body=body, stream=stream)
+        attrs["status"] = resp.status
+        if not stream:
+            attrs["bytes"] = len(resp.content)
+        # Time between sending the request and parsing the response headers
+        attrs["ttfb"] = resp.elapsed
+
+    trace.count("requests")
+    if not stream:
+        trace.count("bytes_received", len(resp.content))
+    trace.count("bytes_sent", len(body or b""))
+    if not resp.ok:
+        resp.close()
+        raise _error(resp, method, url)
+    return resp
+
+
+def _request(method: str, url: str, stream: bool = False, cookie: Optional[str] = None,
+             data: Optional[dict[str, str]] = None) -> transport.Response:
+    """Send a request inside a "client.request" trace span and count its bytes.
+
+    Every attempt first waits for the machine-wide throttle (see throttle.py)
+    and transient failures are retried (see RetryPolicy).
+    With stream=True the body is left unread; callers count it as they consume it.
+    Raises errors.HTTPError subclasses for error statuses and
+    errors.NetworkError when there is no response at all.
+    """
+    headers = {}
+    if cookie:
+        headers["Cookie"] = f"session={cookie}"
+    body = None
+    if data is not None:
+        body = urlencode(data).encode("ascii")
+        headers["Content-Type"] = "application/x-www-form-urlencoded"
+
+    policy = retry_policy()
+    idempotent = method == "GET"
+
+    def attempt() -> transport.Response:
+        return _send(method, url, headers, body, stream)
+
+    if idempotent and not stream and policy.hedge > 0:
+        return policy.call(lambda: _hedged(attempt, policy.hedge))
+    return policy.call(attempt, idempotent=idempotent)
+
+
+def _stored(year: int, day: int, kind: str) -> Optional[bytes]:
+    """Look up an entry in the local cache, then in the mounted bundle."""
+    data = cache.read(year, day, kind)
+    if data is None and (mounted := bundle.mounted()) is not None:
+        data = mounted.read(year, day, kind)
+    if data is not None:
+        trace.count("cache_hits")
+    return data
+
+
+def stored_input(year: int, day: int) -> Optional[bytes]:
+    """The puzzle input from the local cache or the mounted bundle, or None; needs no cookie."""
+    return _stored(year, day, "input")
+
+
+@_flights.wrap
+def fetch_page(year: int, day: int, cookie: Optional[str] = None, refresh: bool = False) -> str:
+    """GET the AoC problem page HTML for year/day.
+
+    Returns raw HTML string. Cookie not necessary, but without it the page
+    only shows part one and carries no answer form. Only authenticated pages
+    are cached; refresh=True skips the cached page and replaces it.
+    Concurrent calls share a request only when their cookie matches, since
+    the pages differ.
+    """
+    if not refresh and (html := _stored(year, day, "page")) is not None:
+        return html.decode("utf8")
+
     url = f"{BASE}/{year}/day/{day}"
-    resp = requests.get(url)
-    resp.raise_for_status()
+    resp = _request("GET", url, cookie=cookie)
+    if cookie:
+        cache.write(year, day, "page", resp.content)
+    return resp.text
+
+
+@_flights.wrap
+def fetch_calendar(year: int, cookie: str) -> str:
+    """GET the /{year} calendar page HTML (authenticated).
+
+    Returns raw HTML string. Cookie-specific: it carries the star state of every day.
+    """
+    url = f"{BASE}/{year}"
+    resp = _request("GET", url, cookie=cookie)
     return resp.text
 
 
-def fetch_input(year: int, day: int, cookie: str) -> str:
+@_flights.wrap
+def fetch_input_bytes(year: int, day: int, cookie: Optional[str]) -> bytes:
+    """GET the raw puzzle input for year/day (authenticated) as undecoded bytes.
+
+    Cookie-specific. Skips charset detection and str decoding entirely;
+    wrap the result in memoryview() for zero-copy slicing.
+    """
+    if (data := stored_input(year, day)) is not None:
+        return data
+
+    url = f"{BASE}/{year}/day/{day}/input"
+    resp = _request("GET", url, cookie=cookie)
+    cache.write(year, day, "input", resp.content)
+    return resp.content
+
+
+def fetch_input(year: int, day: int, cookie: Optional[str]) -> str:
     """GET the raw puzzle input for year/day (authenticated).
 
-    Returns the plain text input body. Cookie-specific.
+    Returns the plain text input body. Cookie-specific. Inputs are ASCII,
+    so the body is decoded as UTF-8 directly instead of guessing a charset.
+    """
+    return fetch_input_bytes(year, day, cookie).decode("utf8")
+
+
+def stream_input(year: int, day: int, cookie: Optional[str], sink: BinaryIO) -> int:
+    """GET the raw puzzle input and write it to `sink` as chunks arrive.
+
+    The chunks go to the cache file at the same time, so the input is never
+    held in memory as a whole. Returns the number of bytes written.
     """
+    if (data := stored_input(year, day)) is not None:
+        sink.write(data)
+        return len(data)
+
     url = f"{BASE}/{year}/day/{day}/input"
-    resp = requests.get(url, cookies={"session": cookie})
-    resp.raise_for_status()
-    return resp.text
+    total = 0
+    with _request("GET", url, stream=True, cookie=cookie) as resp, \
+            cache.writer(year, day, "input") as f:
+        for chunk in resp.iter_content(CHUNK_SIZE):
+            f.write(chunk)
+            sink.write(chunk)
+            total += len(chunk)
+    sink.flush()
+    trace.count("bytes_received", total)
+    return total
+
+
+def warm() -> None:
+    """Connect to the server ahead of a request, so that request skips connection setup."""
+    with trace.span("client.warm"):
+        transport.default().warm(BASE)
 
 
 def submit_answer(answer: str, year: int, day: int, level: int, cookie: str) -> str:
@@ -43,6 +306,5 @@ def submit_answer(answer: str, year: int, day: int, level: int, cookie: str) ->
     """
     url = f"{BASE}/{year}/day/{day}/answer"
     data = {"level": str(level), "answer": str(answer)}
-    resp = requests.post(url, cookies={"session": cookie}, data=data)
-    resp.raise_for_status()
+    resp = _request("POST", url, cookie=cookie, data=data)
     return resp.text
@@ -150,6 +150,10 @@ class _Config:
         self._data.clear()
         self._save()
 
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a raw value by key, for settings without a dedicated property."""
+        return self._data.get(key, default)
+
     def list(self) -> dict[str, Any]:
         """Return a shallow copy of the raw config data (flat keys)."""
         return dict(self._data)
@@ -1,3 +1,7 @@
+from datetime import datetime
+from typing import Optional
+
+
 class AOCError(Exception):
     """Base class for AoC errors."""
 
@@ -28,3 +32,49 @@ class WrongAnswerError(AOCError):
 
 class AlreadyCompletedError(AOCError):
     """Raised when the puzzle part is already solved / cannot submit."""
+
+
+class BundleError(AOCError):
+    """Raised when a file is not a valid aoc bundle."""
+
+
+class TransientError(AOCError):
+    """Base class for failures that may go away when the request is repeated."""
+
+
+class NetworkError(TransientError):
+    """Raised when a request gets no response (connection, TLS or timeout failure)."""
+
+
+class HTTPError(AOCError):
+    """Raised when the server answers with an error status."""
+
+    def __init__(self, message: str, status: int, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+        """Seconds from the Retry-After header, if the server sent one."""
+
+
+class ServerError(HTTPError, TransientError):
+    """Raised on 5xx responses: the server is overloaded or hiccuping."""
+
+
+class ThrottledError(HTTPError, TransientError):
+    """Raised on 429 responses: too many requests, back off (see retry_after)."""
+
+
+class NotUnlockedError(HTTPError, InputNotFoundError):
+    """Raised when a puzzle is requested before it unlocks (midnight EST on its day)."""
+
+    def __init__(self, message: str, status: int, unlocks_at: Optional[datetime] = None):
+        super().__init__(message, status)
+        self.unlocks_at = unlocks_at
+
+
+class CooldownError(AOCError):
+    """Raised when the server refuses a submission because the last one was too recent."""
+
+    def __init__(self, message: str, wait: Optional[float] = None):
+        super().__init__(message)
+        self.wait = wait
@@ -23,6 +23,7 @@ from datetime import date
 from typing import Any, Callable, Optional
 
 from . import config as _config
+from . import trace
 from .errors import MissingCookieError
 
 # ============================================================
@@ -51,6 +52,17 @@ def config(name: str) -> Optional[Any]:
     return getattr(_config, name, None)
 
 
+def setting(name: str, default: Any = None) -> Any:
+    """Resolve a tool setting from AOC_<NAME>, then the config file, then `default`.
+
+    Env values are strings; callers cast them as needed.
+    """
+    value = env(name)
+    if value is None:
+        value = _config.config.get(name)
+    return default if value is None else value
+
+
 def today(name: str) -> int:
     """Fallback to today's date.year or date.day."""
     if name not in ("year", "day"):
@@ -106,14 +118,16 @@ def param_fallback(param_name: str, *fallbacks: Callable[[str], Any]):
                 return func(*args, **kwargs)
 
             # Otherwise run fallback chain
-            for fb in fallbacks:
-                out = fb(param_name)
-                if out is not None:
-                    bound.arguments[param_name] = out
-                    break
-            else:
-                # All fallbacks failed: leave as None
-                pass
+            with trace.span("fallback", param=param_name) as attrs:
+                for fb in fallbacks:
+                    out = fb(param_name)
+                    if out is not None:
+                        bound.arguments[param_name] = out
+                        attrs["source"] = fb.__name__
+                        break
+                else:
+                    # All fallbacks failed: leave as None
+                    pass
 
             return func(*bound.args, **bound.kwargs)
 
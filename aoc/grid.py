@@ -0,0 +1,271 @@
+"""A flat, array-backed character grid for grid-shaped puzzle inputs.
+
+    grid = Grid(fetch_input())
+    start = grid.find("S")[0]          # flat index
+    dist = grid.bfs(start, walls="#")  # array('i'), -1 where unreachable
+    grid.coords(start)                 # (row, col)
+
+Cells live in one bytearray laid out like the input text: every row is
+followed by a "\\n" column, and a row of "\\n" sits above and below the
+grid. A cell's neighbours are therefore fixed offsets of its flat index
+(grid.offsets()), and stepping off the grid always lands on padding, so
+searches need no bounds checks. count(), find() and mask() run in C
+(bytes.count, bytes.translate, itertools.compress); flood_fill() and
+distance() expand whole frontiers at once as big-int bitsets.
+
+With wrap=True the grid is a torus: neighbours wrap around the edges and
+searches fall back to a per-cell queue.
+"""
+from array import array
+from collections import deque
+from itertools import compress
+from typing import Any, Iterator, Optional, Union
+
+PAD = ord("\n")
+
+Pos = Union[int, tuple[int, int]]
+
+
+def _table(chars: Union[str, bytes], inside: bytes, outside: bytes) -> bytes:
+    """A bytes.translate table mapping `chars` to `inside` and every other byte to `outside`."""
+    wanted = set(chars.encode("ascii") if isinstance(chars, str) else chars)
+    return b"".join(inside if b in wanted else outside for b in range(256))
+
+
+class Grid:
+    """A rectangular character grid stored in a padded, flat bytearray."""
+
+    def __init__(self, text: Union[str, bytes], wrap: bool = False):
+        data = text.encode("ascii") if isinstance(text, str) else bytes(text)
+        rows = data.replace(b"\r\n", b"\n").split(b"\n")
+        while rows and not rows[-1]:
+            rows.pop()
+        if not rows:
+            raise ValueError("Input is not a rectangular grid")
+        if any(len(row) != len(rows[0]) for row in rows):
+            raise ValueError("Input is not a rectangular grid")
+
+        self.width = len(rows[0])
+        self.height = len(rows)
+        self.stride = self.width + 1
+        self.wrap = wrap
+        pad = b"\n" * self.stride
+        self.cells = bytearray(pad + b"".join(row + b"\n" for row in rows) + pad)
+        """The padded cells; grid.cells[i] is the byte at flat index i."""
+        self._neighbors: dict[bool, list[tuple[int, ...]]] = {}
+
+    @classmethod
+    def _from_cells(cls, cells: bytearray, height: int, width: int, wrap: bool = False) -> "Grid":
+        """A grid around already padded cells (e.g. copied out of shared memory)."""
+        grid = cls.__new__(cls)
+        grid.width, grid.height, grid.stride, grid.wrap = width, height, width + 1, wrap
+        grid.cells = cells
+        grid._neighbors = {}
+        return grid
+
+    # ------------------------------
+    # Positions
+    # ------------------------------
+    def index(self, row: int, col: int) -> int:
+        """Flat index of (row, col)."""
+        if not (0 <= row < self.height and 0 <= col < self.width):
+            raise IndexError(f"({row}, {col}) is outside the {self.height}x{self.width} grid")
+        return (row + 1) * self.stride + col
+
+    def coords(self, index: int) -> tuple[int, int]:
+        """(row, col) of a flat index."""
+        row, col = divmod(index, self.stride)
+        return row - 1, col
+
+    def _flat(self, pos: Pos) -> int:
+        return self.index(*pos) if isinstance(pos, tuple) else pos
+
+    def __contains__(self, pos: Pos) -> bool:
+        if isinstance(pos, tuple):
+            return 0 <= pos[0] < self.height and 0 <= pos[1] < self.width
+        return 0 <= pos < len(self.cells) and self.cells[pos] != PAD
+
+    def __iter__(self) -> Iterator[int]:
+        """Flat indices of every cell, row by row."""
+        for start in range(self.stride, (self.height + 1) * self.stride, self.stride):
+            yield from range(start, start + self.width)
+
+    def __getitem__(self, pos: Pos) -> str:
+        return chr(self.cells[self._flat(pos)])
+
+    def __setitem__(self, pos: Pos, value: str) -> None:
+        self.cells[self._flat(pos)] = ord(value)
+
+    def __len__(self) -> int:
+        return self.width * self.height
+
+    def __str__(self) -> str:
+        return self.cells[self.stride:-self.stride].decode("ascii")
+
+    def __repr__(self) -> str:
+        return f"Grid({self.height}x{self.width}{', wrap=True' if self.wrap else ''})"
+
+    def offsets(self, diagonal: bool = False) -> tuple[int, ...]:
+        """Flat offsets of the neighbours: up, right, down, left (then the diagonals)."""
+        s = self.stride
+        straight = (-s, 1, s, -1)
+        return straight + (-s - 1, -s + 1, s + 1, s - 1) if diagonal else straight
+
+    def neighbors(self, index: int, diagonal: bool = False) -> list[int]:
+        """Flat indices of the cells next to `index`, wrapping around the edges on a torus."""
+        if self.wrap:
+            return list(self._neighbor_table(diagonal)[index])
+        cells = self.cells
+        return [j for j in (index + d for d in self.offsets(diagonal)) if cells[j] != PAD]
+
+    def _neighbor_table(self, diagonal: bool) -> list[tuple[int, ...]]:
+        """Neighbours of every flat index on a torus (padding maps to nothing), built once."""
+        table = self._neighbors.get(diagonal)
+        if table is None:
+            steps = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+            if diagonal:
+                steps += [(-1, -1), (-1, 1), (1, 1), (1, -1)]
+            table = [()] * len(self.cells)
+            h, w = self.height, self.width
+            for i in self:
+                r, c = self.coords(i)
+                table[i] = tuple(self.index((r + dr) % h, (c + dc) % w) for dr, dc in steps)
+            self._neighbors[diagonal] = table
+        return table
+
+    # ------------------------------
+    # Views and bulk operations
+    # ------------------------------
+    def row(self, row: int) -> memoryview:
+        """A writable view of one row, without copying."""
+        start = self.index(row, 0)
+        return memoryview(self.cells)[start:start + self.width]
+
+    def column(self, col: int) -> memoryview:
+        """A writable, strided view of one column, without copying."""
+        start = self.index(0, col)
+        return memoryview(self.cells)[start:start + self.height * self.stride:self.stride]
+
+    @property
+    def rows(self) -> list[memoryview]:
+        return [self.row(r) for r in range(self.height)]
+
+    @property
+    def array(self) -> Any:
+        """The cells as a writable (height, width) uint8 NumPy view of the same buffer."""
+        try:
+            import numpy as np
+        except ImportError:
+            raise ImportError("Grid.array requires NumPy (pip install numpy)") from None
+        padded = np.frombuffer(self.cells, dtype=np.uint8).reshape(self.height + 2, self.stride)
+        return padded[1:-1, :self.width]
+
+    def count(self, chars: str) -> int:
+        """Number of cells holding any of `chars`."""
+        return sum(self.cells.count(ord(ch)) for ch in set(chars) if ord(ch) != PAD)
+
+    def find(self, chars: str) -> list[int]:
+        """Flat indices of the cells holding any of `chars`, in reading order."""
+        return list(compress(range(len(self.cells)), self.mask(chars)))
+
+    def mask(self, chars: str) -> bytearray:
+        """1 at every flat index holding one of `chars`, 0 elsewhere (padding included)."""
+        return bytearray(self.cells.translate(_table(chars.replace("\n", ""), b"\x01", b"\x00")))
+
+    # ------------------------------
+    # Searches
+    # ------------------------------
+    def _blocked(self, walls: Optional[str], start: int) -> bytes:
+        """The bytes a search may not enter: `walls` and padding, or anything but the start cell."""
+        if walls is None:
+            return bytes(b for b in range(256) if b != self.cells[start])
+        return walls.encode("ascii") + b"\n"
+
+    def bfs(self, start: Pos, walls: Optional[str] = "#", diagonal: bool = False) -> array:
+        """Steps from `start` to every flat index (-1 if unreachable), avoiding `walls`.
+
+        With walls=None only cells equal to the start cell are passable.
+        """
+        start = self._flat(start)
+        seen = bytearray(self.cells.translate(_table(self._blocked(walls, start), b"\x01", b"\x00")))
+        dist = array("i", [-1]) * len(self.cells)
+        seen[start] = 1
+        dist[start] = 0
+        if self.wrap:
+            table = self._neighbor_table(diagonal)
+            queue = deque([start])
+            while queue:
+                i = queue.popleft()
+                for j in table[i]:
+                    if not seen[j]:
+                        seen[j] = 1
+                        dist[j] = dist[i] + 1
+                        queue.append(j)
+            return dist
+
+        offsets = self.offsets(diagonal)
+        frontier = [start]
+        steps = 0
+        while frontier:
+            steps += 1
+            nxt = []
+            for i in frontier:
+                for d in offsets:
+                    j = i + d
+                    if not seen[j]:
+                        seen[j] = 1
+                        dist[j] = steps
+                        nxt.append(j)
+            frontier = nxt
+        return dist
+
+    def _bits(self, blocked: bytes) -> int:
+        """The cells not blocked, as an int with bit i set for flat index i."""
+        return int(self.cells.translate(_table(blocked, b"0", b"1"))[::-1], 2)
+
+    def _expand(self, frontier: int, diagonal: bool) -> int:
+        s = self.stride
+        grown = frontier | (frontier << 1) | (frontier >> 1) | (frontier << s) | (frontier >> s)
+        if diagonal:
+            grown |= (frontier << (s + 1)) | (frontier >> (s + 1)) | (frontier << (s - 1)) | (frontier >> (s - 1))
+        return grown
+
+    def flood_fill(self, start: Pos, walls: Optional[str] = None, diagonal: bool = False) -> list[int]:
+        """Flat indices of the region connected to `start`, in reading order.
+
+        By default the region is the cells equal to the start cell; with
+        `walls`, it is every cell reachable without entering one of them.
+        """
+        start = self._flat(start)
+        if self.wrap:
+            return sorted(i for i, d in enumerate(self.bfs(start, walls, diagonal)) if d >= 0)
+
+        region = 1 << start
+        free = self._bits(self._blocked(walls, start)) | region
+        while True:
+            grown = self._expand(region, diagonal) & free
+            if grown == region:
+                break
+            region = grown
+        bits = bin(region)[:1:-1].encode("ascii").translate(_table(b"1", b"\x01", b"\x00"))
+        return list(compress(range(len(bits)), bits))
+
+    def distance(self, start: Pos, goal: Pos, walls: Optional[str] = "#", diagonal: bool = False) -> int:
+        """Fewest steps from `start` to `goal` avoiding `walls`, or -1 if it cannot be reached."""
+        start, goal = self._flat(start), self._flat(goal)
+        if self.wrap:
+            return self.bfs(start, walls, diagonal)[goal]
+
+        if start == goal:
+            return 0
+        free = self._bits(self._blocked(walls, start))
+        target = 1 << goal
+        seen = frontier = 1 << start
+        steps = 0
+        while frontier:
+            if frontier & target:
+                return steps
+            frontier = self._expand(frontier, diagonal) & free & ~seen
+            seen |= frontier
+            steps += 1
+        return -1
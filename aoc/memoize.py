@@ -0,0 +1,294 @@
+"""Disk-persistent memoization of expensive solver intermediates.
+
+    from aoc import memo
+
+    @memo
+    def graph(data):
+        ...  # minutes of parsing and precomputation
+
+    def part2(data):
+        g = graph(data)  # loaded from disk on every run after the first
+
+Results live in the cache directory (memo/<function>/<key>.pkl or .npy).
+The key combines:
+
+    - the puzzle input: the one `aoc run` is feeding the solver, else
+      fetch_input() of the decorator's year/day (or AOC_YEAR/AOC_DAY and
+      the config); with neither, only the arguments key the entry. When
+      the input of a known year/day cannot be read, the call is not
+      memoized
+    - the function's module, qualified name and source code, so editing it
+      invalidates its entries (functions it calls are not hashed)
+    - the pickled arguments
+
+NumPy arrays are saved as .npy and loaded with mmap_mode="r". Anything
+else is pickled with protocol 5; out-of-band buffers (array data inside
+other objects) are stored aligned after the pickle and handed back as
+views of a read-only mmap of the file, so arrays come back without a copy
+and read-only.
+
+The memo directory is capped at `memo_max_mb` megabytes (AOC_MEMO_MAX_MB or
+the config value, default 1024); the least recently used entries go first.
+A cap of 0 disables memoization. Arguments or results that cannot be
+pickled are not memoized.
+"""
+import hashlib
+import inspect
+import mmap
+import os
+import pickle
+import re
+import shutil
+import struct
+import sys
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+from . import cache, trace
+from .fallbacks import config, env_int, setting
+
+DEFAULT_MAX_MB = 1024
+MAGIC = b"AOCMEMO1"
+ALIGN = 64
+
+# Digest of the input `aoc run` is feeding the current solver, or None
+_run_input: Optional[str] = None
+# Digests of fetched inputs by (year, day); failed fetches are not kept
+_fetched: dict[tuple[int, int], str] = {}
+
+
+def memo_dir() -> Path:
+    return cache.cache_dir() / "memo"
+
+
+def input_digest(data: str) -> str:
+    """Short hash of a puzzle input, as stored in benchmark results."""
+    return hashlib.sha256(data.encode("utf8")).hexdigest()[:16]
+
+
+@contextmanager
+def using_input(data: str) -> Iterator[None]:
+    """Key every memoized call inside the block by `data` (used by `aoc run`)."""
+    global _run_input
+    previous, _run_input = _run_input, input_digest(data)
+    try:
+        yield
+    finally:
+        _run_input = previous
+
+
+def _fetched_digest(year: int, day: int) -> str:
+    """Digest of the puzzle's input (a cached input needs no cookie). Raises if it cannot be read."""
+    if (digest := _fetched.get((year, day))) is None:
+        from . import api
+
+        digest = _fetched.setdefault((year, day), input_digest(api.fetch_input(year, day)))
+    return digest
+
+
+def _input_key(year: Optional[int], day: Optional[int]) -> str:
+    """The input part of the key: "" when no input is known. Raises if a known input cannot be read."""
+    if _run_input is not None:
+        return _run_input
+    year = year if year is not None else env_int("year") or config("year")
+    day = day if day is not None else env_int("day") or config("day")
+    if year is None or day is None:
+        return ""
+    return _fetched_digest(int(year), int(day))
+
+
+def _source_hash(func: Callable) -> str:
+    try:
+        source = inspect.getsource(func).encode("utf8")
+    except (OSError, TypeError):
+        source = func.__code__.co_code
+    return hashlib.sha256(source).hexdigest()[:16]
+
+
+def _plain(value: Any) -> Any:
+    # PuzzleInput pickles its cached views too; key it by the text alone
+    return str.__str__(value) if isinstance(value, str) else value
+
+
+def _max_bytes() -> int:
+    return int(float(setting("memo_max_mb", DEFAULT_MAX_MB)) * 1024 * 1024)
+
+
+# ------------------------------
+# Storage
+# ------------------------------
+def _is_ndarray(value: Any) -> bool:
+    np = sys.modules.get("numpy")  # no array can exist unless numpy was imported
+    return np is not None and type(value) is np.ndarray and not value.dtype.hasobject
+
+
+def _pad(n: int) -> int:
+    return -n % ALIGN
+
+
+def _dump(path: Path, value: Any) -> None:
+    """Write `value` as header, pickle and 64-byte aligned out-of-band buffers."""
+    buffers: list[pickle.PickleBuffer] = []
+    data = pickle.dumps(value, protocol=5, buffer_callback=buffers.append)
+    raws = [b.raw() for b in buffers]
+    header = MAGIC + struct.pack(f"<QQ{len(raws)}Q", len(data), len(raws), *(r.nbytes for r in raws))
+    with cache._atomic_open(path) as f:
+        f.write(header + bytes(_pad(len(header))))
+        f.write(data)
+        f.write(bytes(_pad(len(data))))
+        for raw in raws:
+            f.write(raw)
+            f.write(bytes(_pad(raw.nbytes)))
+
+
+def _load(path: Path) -> Any:
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mm)
+    if view[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} is not a memo file")
+    pos = len(MAGIC)
+    size, count = struct.unpack_from("<QQ", view, pos)
+    lengths = struct.unpack_from(f"<{count}Q", view, pos + 16)
+    pos += 16 + 8 * count
+    pos += _pad(pos)
+    data = view[pos:pos + size]
+    pos += size + _pad(size)
+    buffers = []
+    for n in lengths:
+        buffers.append(view[pos:pos + n])
+        pos += n + _pad(n)
+    if pos > len(view):
+        raise ValueError(f"{path} is truncated")
+    # The arrays rebuilt from `buffers` keep the mapping alive
+    return pickle.loads(data, buffers=buffers)
+
+
+def _save(base: Path, value: Any) -> Optional[Path]:
+    if _is_ndarray(value):
+        import numpy as np
+
+        path = base.with_suffix(".npy")
+        with cache._atomic_open(path) as f:
+            np.save(f, value, allow_pickle=False)
+        return path
+    path = base.with_suffix(".pkl")
+    try:
+        _dump(path, value)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return None
+    return path
+
+
+def _lookup(base: Path) -> tuple[bool, Any]:
+    """(True, value) for a stored entry, else (False, None); unreadable entries are removed."""
+    for suffix in (".pkl", ".npy"):
+        path = base.with_suffix(suffix)
+        try:
+            if suffix == ".npy":
+                import numpy as np
+
+                value = np.load(path, mmap_mode="r", allow_pickle=False)
+            else:
+                value = _load(path)
+        except FileNotFoundError:
+            continue
+        except Exception:
+            path.unlink(missing_ok=True)
+            continue
+        try:
+            os.utime(path)  # mtime marks recent use for eviction
+        except OSError:
+            pass
+        return True, value
+    return False, None
+
+
+def evict(max_bytes: Optional[int] = None) -> int:
+    """Delete least recently used entries until the memo directory fits `max_bytes`.
+
+    Returns the number of entries removed.
+    """
+    max_bytes = _max_bytes() if max_bytes is None else max_bytes
+    entries = []
+    for path in memo_dir().glob("*/*"):
+        if path.suffix not in (".pkl", ".npy"):
+            continue  # a write in progress
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        entries.append((st.st_mtime, st.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in sorted(entries, key=lambda e: e[0]):
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+        removed += 1
+    return removed
+
+
+def clear(func: Optional[Callable] = None) -> None:
+    """Delete the entries of one memoized function, or all of them."""
+    path = memo_dir() if func is None else memo_dir() / func.memo_name
+    shutil.rmtree(path, ignore_errors=True)
+
+
+# ------------------------------
+# Decorator
+# ------------------------------
+def memo(func: Optional[Callable] = None, *, year: Optional[int] = None,
+         day: Optional[int] = None) -> Any:
+    """Persist a function's results on disk: @memo or @memo(year=2023, day=5).
+
+    `year`/`day` name the puzzle whose input keys the entries when the
+    function is called outside `aoc run`.
+    """
+    if func is None:
+        return lambda f: memo(f, year=year, day=day)
+
+    name = re.sub(r"[^\w.-]", "_", f"{func.__module__}.{func.__qualname__}")
+    source = _source_hash(func)
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        max_bytes = _max_bytes()
+        if max_bytes <= 0:
+            return func(*args, **kwargs)
+        try:
+            pickled = pickle.dumps(([_plain(a) for a in args], sorted((k, _plain(v)) for k, v in kwargs.items())),
+                                   protocol=5)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            trace.count("memo_skipped")
+            return func(*args, **kwargs)
+        try:
+            input_key = _input_key(year, day)
+        except Exception:
+            # Keying by the arguments alone could serve another input's result
+            trace.count("memo_skipped")
+            return func(*args, **kwargs)
+        h = hashlib.blake2b(digest_size=16)
+        for part in (input_key, name, source):
+            h.update(part.encode("utf8") + b"\0")
+        h.update(pickled)
+        base = memo_dir() / name / h.hexdigest()
+
+        found, value = _lookup(base)
+        if found:
+            trace.count("memo_hits")
+            return value
+        trace.count("memo_misses")
+        value = func(*args, **kwargs)
+        with trace.span("memo.save", function=name):
+            if _save(base, value) is not None:
+                evict(max_bytes)
+            else:
+                trace.count("memo_skipped")
+        return value
+
+    wrapper.memo_name = name
+    return wrapper
@@ -0,0 +1,207 @@
+"""Parallel map for brute-force solvers, with the input in shared memory.
+
+    from aoc.parallel import pmap
+
+    def check(seed, data):        # data: a read-only memoryview of the input
+        ...
+
+    def part2(data):
+        return min(pmap(check, range(10**7), shared=data.encode()))
+
+Passing the parsed input along with every task pickles it once per task,
+which usually costs more than the parallelism saves. pmap() copies
+`shared` into one multiprocessing.shared_memory block instead, and every
+worker attaches to it once:
+
+    bytes, bytearray, str   a read-only memoryview of the bytes (str is UTF-8 encoded)
+    numpy.ndarray           a read-only array over the shared block
+    Grid                    a Grid whose cells are copied out of the block once per
+                            worker (its searches need a bytearray)
+
+`func` is sent once per worker too, so it must be a module-level
+function. Functions of solver files run by `aoc run` are sent by file and
+name, and workers that were not forked from the solver's process (the
+"spawn" and "forkserver" start methods) load the solver file themselves.
+`context` picks the start method; it defaults to multiprocessing's.
+
+Items are sent in chunks sized from the measured time per item (aiming at
+`chunk_seconds` of work per chunk), and never more than a fraction of the
+remaining items, so the cores finish together. Results stream back in
+item order, or with ordered=False as soon as their chunk completes.
+"""
+import multiprocessing
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+from time import perf_counter
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from . import runner
+from .grid import Grid
+
+CHUNK_SECONDS = 0.05
+
+# Worker state, set once per worker by _attach()
+_func: Optional[Callable] = None
+_shared: Any = None
+_block: Optional[shared_memory.SharedMemory] = None
+
+
+# ------------------------------
+# Shared input
+# ------------------------------
+def _describe(shared: Any) -> tuple[str, bytes, Any]:
+    """(kind, raw bytes, metadata needed to rebuild the view) of a shared object."""
+    if isinstance(shared, str):
+        return "bytes", shared.encode("utf8"), None
+    if isinstance(shared, (bytes, bytearray, memoryview)):
+        return "bytes", shared, None
+    if isinstance(shared, Grid):
+        return "grid", shared.cells, (shared.height, shared.width, shared.wrap)
+    if hasattr(shared, "__array_interface__") and hasattr(shared, "dtype"):
+        import numpy as np
+
+        array = np.ascontiguousarray(shared)
+        return "array", array.data, (array.shape, array.dtype.str)
+    raise TypeError(f"Cannot share {type(shared).__name__}; use bytes, str, a Grid or a NumPy array")
+
+
+def _view(buf: memoryview, kind: str, size: int, meta: Any) -> Any:
+    if kind == "bytes":
+        return buf[:size].toreadonly()
+    if kind == "grid":
+        height, width, wrap = meta
+        return Grid._from_cells(bytearray(buf[:size]), height, width, wrap)
+    import numpy as np
+
+    shape, dtype = meta
+    array = np.ndarray(shape, dtype=dtype, buffer=buf[:size])
+    array.flags.writeable = False
+    return array
+
+
+def _open_block(name: str) -> shared_memory.SharedMemory:
+    try:
+        # The creating process unlinks the block; do not hand it to this one's tracker
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13
+        return shared_memory.SharedMemory(name=name)
+
+
+def _func_ref(func: Callable) -> Any:
+    """`func`, or (module, file, qualname) for a function of a solver loaded by aoc run."""
+    module = sys.modules.get(func.__module__)
+    path = getattr(module, "__file__", None)
+    if func.__module__.startswith(runner.SOLVER_MODULE_PREFIX) and path:
+        return func.__module__, path, func.__qualname__
+    return func
+
+
+def _resolve(ref: Any) -> Callable:
+    if callable(ref):
+        return ref
+    name, path, qualname = ref
+    target = sys.modules.get(name) or runner.load_solver(path, name)
+    for attr in qualname.split("."):
+        target = getattr(target, attr)
+    return target
+
+
+def _attach(func: Any, name: Optional[str], kind: str, size: int, meta: Any) -> None:
+    global _func, _shared, _block
+    _func = _resolve(func)
+    if name is not None:
+        _block = _open_block(name)
+        _shared = _view(_block.buf, kind, size, meta)
+
+
+def _run_chunk(items: list) -> tuple[list, float]:
+    start = perf_counter()
+    if _block is None:
+        results = [_func(item) for item in items]
+    else:
+        results = [_func(item, _shared) for item in items]
+    return results, perf_counter() - start
+
+
+# ------------------------------
+# Scheduling
+# ------------------------------
+def _chunk_size(per_item: Optional[float], remaining: Optional[int], jobs: int, target: float) -> int:
+    """Items per chunk: about `target` seconds of work, and at most 1/(2*jobs) of what is left."""
+    if per_item is None:
+        return 1  # the first chunks measure the cost of an item
+    size = max(1, int(target / per_item)) if per_item > 0 else 1 << 16
+    if remaining is not None:
+        size = min(size, max(1, remaining // (2 * jobs)))
+    return size
+
+
+def pmap(func: Callable, items: Iterable, shared: Any = None, jobs: Optional[int] = None,
+         ordered: bool = True, chunk_seconds: float = CHUNK_SECONDS,
+         context: Optional[str] = None) -> Iterator:
+    """Yield func(item, shared) for every item (func(item) without `shared`) from a process pool.
+
+    `jobs` defaults to the number of cores; with jobs=1 everything runs in
+    this process. The pool and shared block are released when the
+    iterator is exhausted or closed.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    if jobs <= 1:
+        for item in items:
+            yield func(item) if shared is None else func(item, shared)
+        return
+
+    remaining = len(items) if hasattr(items, "__len__") else None
+    source = iter(items)
+    block = None
+    initargs: tuple = (_func_ref(func), None, "", 0, None)
+    if shared is not None:
+        kind, data, meta = _describe(shared)
+        size = memoryview(data).nbytes
+        block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        block.buf[:size] = memoryview(data).cast("B")
+        initargs = (_func_ref(func), block.name, kind, size, meta)
+
+    pool = ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context(context),
+                               initializer=_attach, initargs=initargs)
+    pending: dict[Future, int] = {}
+    done: dict[int, list] = {}
+    sent = received = 0
+    per_item: Optional[float] = None
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(pending) < 2 * jobs:
+                n = _chunk_size(per_item, remaining, jobs, chunk_seconds)
+                chunk = [item for _, item in zip(range(n), source)]
+                if len(chunk) < n:
+                    exhausted = True
+                if chunk:
+                    pending[pool.submit(_run_chunk, chunk)] = sent
+                    sent += 1
+                    if remaining is not None:
+                        remaining -= len(chunk)
+            if not pending:
+                break
+
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                seq = pending.pop(future)
+                results, seconds = future.result()
+                if results:
+                    cost = seconds / len(results)
+                    per_item = cost if per_item is None else 0.7 * per_item + 0.3 * cost
+                if ordered:
+                    done[seq] = results
+                else:
+                    yield from results
+            while received in done:
+                yield from done.pop(received)
+                received += 1
+    finally:
+        pool.shutdown(wait=not pending, cancel_futures=True)
+        if block is not None:
+            block.close()
+            block.unlink()
@@ -1,20 +1,45 @@
-"""HTML parsing helpers using BeautifulSoup for AoC."""
+"""HTML parsing helpers using BeautifulSoup for AoC.
+
+Parsed trees are shared: the most recently parsed pages are kept, and
+concurrent parses of the same HTML are coalesced, so fetch_code() and
+fetch_example() on one page only parse it once.
+"""
 from dataclasses import dataclass
-from typing import Optional, Union
+from functools import lru_cache
+from typing import Any, Optional, Sequence, Union
 import re
 
 from bs4 import BeautifulSoup
 from bs4.element import Tag
 
+from .singleflight import Group
+from .trace import traced
+
+_flights = Group()
+
+Index = Union[int, slice, Sequence[Union[int, slice]]]
+"""Block selection: an index, a slice, or a sequence of both (see parse_index)."""
+
+
+@lru_cache(maxsize=8)
+def _parse(html: str) -> BeautifulSoup:
+    return BeautifulSoup(html, "html.parser")
+
+
+def _soup(html: str) -> BeautifulSoup:
+    """Return the parsed tree of `html`. Callers must not modify it."""
+    return _flights.do(html, _parse, html)
+
 
 def _find_tag(elem, name: str) -> Optional[Tag]:
     found = elem.find(name)
     return found if isinstance(found, Tag) else None
 
 
+@traced("parser.extract_level")
 def extract_level(html: str) -> Optional[int]:
     """Extract hidden input level value from the form, if present."""
-    soup = BeautifulSoup(html, "html.parser")
+    soup = _soup(html)
     inp = soup.find("input", attrs={"type": "hidden", "name": "level"})
     if not isinstance(inp, Tag):
         return None
@@ -29,57 +54,215 @@ def extract_level(html: str) -> Optional[int]:
         return None
 
 
-def extract_code(html: str, idx: Optional[int] = None, sep: str = "\n") -> Union[str, list[str]]:
-    """Extract <pre><code> blocks from HTML."""
-    soup = BeautifulSoup(html, "html.parser")
-    blocks = []
+@traced("parser.extract_stars")
+def extract_stars(html: str, days: int = 25) -> list[int]:
+    """Extract per-day star counts (0, 1 or 2) from a /{year} calendar page.
 
-    for pre in soup.find_all("pre"):
-        code = pre.find("code")
-        if code is not None:
-            blocks.append(code.get_text())
-    
-    if idx is not None:
+    Returns a list indexed by day - 1. Locked days count as 0 stars.
+    """
+    soup = _soup(html)
+    stars = [0] * days
+    day_class = re.compile(r"^calendar-day(\d+)$")
+
+    for a in soup.find_all("a", class_=day_class):
+        classes = a.get("class") or []
+        day = int(next(m for c in classes if (m := day_class.match(c))).group(1))
+        if not 1 <= day <= days:
+            continue
+        if "calendar-verycomplete" in classes:
+            stars[day - 1] = 2
+        elif "calendar-complete" in classes:
+            stars[day - 1] = 1
+
+    return stars
+
+
+def parse_index(spec: str) -> list[Union[int, slice]]:
+    """Parse a block selection like "0,2:4,-1" (slices exclude their end, as in Python)."""
+    items: list[Union[int, slice]] = []
+    for item in spec.split(","):
+        item = item.strip()
         try:
-            return blocks[idx]
-        except IndexError:
-            raise IndexError(f"No code block at {idx=}")
+            if ":" in item:
+                bounds = item.split(":")
+                if len(bounds) > 3:
+                    raise ValueError
+                items.append(slice(*(int(b) if b.strip() else None for b in bounds)))
+            else:
+                items.append(int(item))
+        except ValueError:
+            raise ValueError(f"Invalid index {item!r}; expected N, START:END or a comma separated list") from None
+    return items
 
-    return sep.join(blocks)
 
+def select_indices(count: int, idx: Index, kind: str = "block") -> list[int]:
+    """Resolve a selection against `count` blocks, in the order given; raises IndexError for missing indices."""
+    indices: list[int] = []
+    for item in [idx] if isinstance(idx, (int, slice)) else idx:
+        if isinstance(item, slice):
+            indices.extend(range(count)[item])
+        elif -count <= item < count:
+            indices.append(item % count)
+        else:
+            raise IndexError(f"No {kind} at idx={item}")
+    return indices
 
-def extract_example(html: str, idx: Optional[int] = None, sep: str = "\n") -> Union[str, list[str]]:
-    """Extract <pre><code> blocks immediately preceded by a <p> containing 'for example:'."""
-    soup = BeautifulSoup(html, "html.parser")
-    candidates = []
 
+def _blocks(html: str) -> list[dict[str, Any]]:
+    """Every <pre><code> block with its index, puzzle part and whether it is an example."""
+    soup = _soup(html)
+    parts = {id(article): n for n, article in enumerate(soup.find_all("article", class_="day-desc"), 1)}
+    blocks = []
     for pre in soup.find_all("pre"):
         code = pre.find("code")
         if code is None:
             continue
         prev = pre.find_previous_sibling("p")
-        if prev is None:
-            continue
-        # Flexible spacing and any text
-        text = prev.get_text()
-        if re.search(r".*for.*example.*:.*", text, re.I):
-            candidates.append(code.get_text())
+        article = pre.find_parent("article")
+        text = code.get_text()
+        blocks.append({
+            "block": len(blocks),
+            # Flexible spacing and any text
+            "example": prev is not None and re.search(r".*for.*example.*:.*", prev.get_text(), re.I) is not None,
+            "part": parts.get(id(article)),
+            "lines": len(text.splitlines()),
+            "text": text,
+        })
+    return blocks
 
-    if idx is not None:
+
+def _code_blocks(html: str) -> list[str]:
+    return [block["text"] for block in _blocks(html)]
+
+
+def _select(blocks: list[str], idx: Optional[Index], sep: str, kind: str) -> Union[str, list[str]]:
+    if idx is None:
+        return sep.join(blocks)
+    if isinstance(idx, int):
         try:
-            return candidates[idx]
+            return blocks[idx]
         except IndexError:
-            raise IndexError(f"No example block at {idx=}")
-    return sep.join(candidates)
+            raise IndexError(f"No {kind} at {idx=}")
+    return [blocks[i] for i in select_indices(len(blocks), idx, kind)]
+
+
+@traced("parser.extract_code")
+def extract_code(html: str, idx: Optional[Index] = None, sep: str = "\n") -> Union[str, list[str]]:
+    """Extract <pre><code> blocks from HTML.
+
+    All blocks joined by `sep`, one block for an int `idx`, or a list for a
+    slice or sequence of indices.
+    """
+    return _select(_code_blocks(html), idx, sep, "code block")
+
+
+def _examples(html: str) -> list[str]:
+    return [block["text"] for block in _blocks(html) if block["example"]]
+
+
+@traced("parser.extract_example")
+def extract_example(html: str, idx: Optional[Index] = None, sep: str = "\n") -> Union[str, list[str]]:
+    """Extract <pre><code> blocks immediately preceded by a <p> containing 'for example:'.
+
+    `idx` selects blocks as in extract_code().
+    """
+    return _select(_examples(html), idx, sep, "example block")
+
+
+@traced("parser.extract_blocks")
+def extract_blocks(html: str, examples: bool = False, idx: Optional[Index] = None) -> list[dict[str, Any]]:
+    """Code blocks (or only example blocks) with metadata, for machine-readable output.
+
+    Each entry has "index" (among the selected kind), "block" (among all
+    code blocks), "example", "part" (1, 2 or None), "lines" and "text".
+    """
+    blocks = [b for b in _blocks(html) if b["example"] or not examples]
+    selected = range(len(blocks)) if idx is None else select_indices(
+        len(blocks), idx, "example block" if examples else "code block")
+    return [{"index": i, **blocks[i]} for i in selected]
+
+@traced("parser.extract_code_blocks")
+def extract_code_blocks(html: str) -> list[str]:
+    """Extract every <pre><code> block as a list."""
+    return _code_blocks(html)
+
+
+@traced("parser.extract_examples")
+def extract_examples(html: str) -> list[str]:
+    """Extract every example block (see extract_example) as a list."""
+    return _examples(html)
+
+
+@traced("parser.extract_expected")
+def extract_expected(html: str) -> list[Optional[str]]:
+    """Guess the example answer of each part from its description.
+
+    AoC highlights the example result as <code><em>42</em></code>; the last
+    such highlight in each <article class="day-desc"> is taken as the answer.
+    Returns one entry per unlocked part, None where nothing matched.
+    """
+    expected: list[Optional[str]] = []
+    for article in _soup(html).find_all("article", class_="day-desc"):
+        found = None
+        for code in article.find_all("code"):
+            em = _find_tag(code, "em")
+            if em is not None and em.get_text() == code.get_text():
+                found = em.get_text().strip()
+            elif isinstance(code.parent, Tag) and code.parent.name == "em":
+                found = code.get_text().strip()
+        expected.append(found)
+    return expected
+
+
+@traced("parser.extract_title")
+def extract_title(html: str) -> Optional[str]:
+    """Extract the puzzle title from "--- Day 1: Trebuchet?! ---"."""
+    h2 = _find_tag(_soup(html), "h2")
+    if h2 is None:
+        return None
+    m = re.match(r"-+\s*Day\s+\d+:\s*(.*?)\s*-+$", h2.get_text().strip())
+    return m.group(1) if m else None
+
+
+@traced("parser.extract_answers")
+def extract_answers(html: str) -> list[str]:
+    """Extract the accepted answers ("Your puzzle answer was <code>...</code>") in part order."""
+    answers = []
+    for p in _soup(html).find_all("p"):
+        if p.get_text().strip().lower().startswith("your puzzle answer was"):
+            code = p.find("code")
+            if code is not None:
+                answers.append(code.get_text().strip())
+    return answers
+
 
 @dataclass
 class SubmissionResult:
     kind: str
     message: str
+    wait: Optional[float] = None
+    """Seconds the server asks to wait before the next submission, if it says so."""
+
+
+_NUMBERS = {"a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "five": 5, "ten": 10}
+
+
+def parse_wait(text: str) -> Optional[float]:
+    """Extract a cooldown from "You have 1m 15s left to wait" or "Please wait 5 minutes"."""
+    m = re.search(r"you have (?:(\d+)m)?\s*(?:(\d+)s)? left to wait", text, re.I)
+    if m and (m.group(1) or m.group(2)):
+        return 60.0 * int(m.group(1) or 0) + int(m.group(2) or 0)
+    m = re.search(r"wait (\d+|an?|one|two|three|five|ten) (second|minute|hour)s?", text, re.I)
+    if m:
+        count = m.group(1).lower()
+        n = int(count) if count.isdigit() else _NUMBERS[count]
+        return float(n * {"second": 1, "minute": 60, "hour": 3600}[m.group(2).lower()])
+    return None
 
+@traced("parser.parse_submission_response")
 def parse_submission_response(html: str) -> SubmissionResult:
     """Parse AoC submission response HTML."""
-    soup = BeautifulSoup(html, "html.parser")
+    soup = _soup(html)
     article = _find_tag(soup, "article")
     if article is None:
         main = _find_tag(soup, "main")
@@ -91,7 +274,9 @@ def parse_submission_response(html: str) -> SubmissionResult:
     if "that's the right answer" in lowered:
         return SubmissionResult("correct", text)
     if "that's not the right answer" in lowered:
-        return SubmissionResult("wrong", text)
+        return SubmissionResult("wrong", text, parse_wait(text))
+    if "you gave an answer too recently" in lowered:
+        return SubmissionResult("too_soon", text, parse_wait(text))
     if "you don't seem to be solving the right level" in lowered:
         return SubmissionResult("incorrect_level", text)
     if not _find_tag(soup, "input") or not soup.find("input", attrs={"name": "level"}):
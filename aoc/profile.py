@@ -0,0 +1,246 @@
+"""Memory and CPU profiling of solvers.
+
+Memory: tracemalloc
+-------------------
+
+`aoc run --memory` traces every allocation while the solvers run and
+reports, per part, the peak traced memory and the change in resident set
+size, plus the largest allocation sites. Solvers can mark interesting
+points (after parsing, before a big search, ...) to get a snapshot there:
+
+    from aoc.profile import checkpoint
+
+    def part1(data):
+        graph = parse(data)
+        checkpoint("parsed")
+        ...
+
+checkpoint() does nothing unless a profile is running, so it can stay in
+the solver. Tracing makes allocations several times slower; timings of a
+memory run are not comparable with normal runs.
+
+CPU: cProfile
+-------------
+`aoc run --cprofile` profiles the parts of every solver and saves, per
+day, a .prof file (for snakeviz, pstats, ...), collapsed stacks for
+flamegraph tools (flamegraph.pl, speedscope, inferno) and a hotspot table.
+cProfile only records caller/callee pairs, so stacks deeper than two
+frames are estimated by splitting each call's time over its callers.
+Branches under a microsecond are folded into their caller, and the walk
+stops descending after MAX_FRAMES frames.
+"""
+import cProfile
+import linecache
+import os
+import pstats
+import sys
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator, Optional, Union
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+FRAMES = 1
+TOP = 10
+
+# Allocations made by the profiler and the import machinery are not the solver's
+_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, linecache.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, __file__),
+]
+
+
+@dataclass
+class Session:
+    checkpoints: list[dict[str, Any]] = field(default_factory=list)
+    top: list[dict[str, Any]] = field(default_factory=list)
+    part: Optional[int] = None
+    _largest: int = -1
+
+
+_session: Optional[Session] = None
+
+
+def rss() -> Optional[int]:
+    """Resident set size of this process in bytes (the peak where the current value is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    if resource is None:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+def top_sites(snapshot: tracemalloc.Snapshot, limit: int = TOP) -> list[dict[str, Any]]:
+    """The `limit` source lines holding the most traced memory in `snapshot`."""
+    stats = snapshot.filter_traces(_FILTERS).statistics("lineno")
+    return [
+        {"file": stat.traceback[0].filename, "line": stat.traceback[0].lineno, "size": stat.size, "count": stat.count}
+        for stat in stats[:limit]
+    ]
+
+
+def _snapshot() -> tuple[int, list[dict[str, Any]]]:
+    """Take a snapshot; keep its sites as the session top if it is the largest so far."""
+    snapshot = tracemalloc.take_snapshot()
+    sites = top_sites(snapshot)
+    size = sum(trace.size for trace in snapshot.filter_traces(_FILTERS).traces)
+    if _session is not None and size > _session._largest:
+        _session._largest = size
+        _session.top = sites
+    return size, sites
+
+
+def enabled() -> bool:
+    return _session is not None
+
+
+def start() -> Session:
+    """Start tracing allocations in this process."""
+    global _session
+    tracemalloc.start(FRAMES)
+    _session = Session()
+    return _session
+
+
+def stop() -> Session:
+    """Stop tracing; returns the checkpoints and the top sites of the largest snapshot."""
+    global _session
+    session, _session = _session, None
+    tracemalloc.stop()
+    if session is None:
+        raise RuntimeError("No memory profile is running")
+    return session
+
+
+def checkpoint(name: str) -> None:
+    """Record traced memory, RSS and the top allocation sites at this point of a solver."""
+    if _session is None:
+        return
+    current, peak = tracemalloc.get_traced_memory()
+    _, sites = _snapshot()
+    _session.checkpoints.append({
+        "name": name,
+        "part": _session.part,
+        "current": current,
+        "peak": peak,
+        "rss": rss(),
+        "top": sites[:3],
+    })
+
+
+@contextmanager
+def measure(part: int) -> Iterator[dict[str, Optional[int]]]:
+    """Measure one part: yields a dict filled with "peak" and "rss_delta" (bytes) on exit."""
+    stats: dict[str, Optional[int]] = {"peak": None, "rss_delta": None}
+    if _session is None:
+        yield stats
+        return
+
+    _session.part = part
+    tracemalloc.reset_peak()
+    before = rss()
+    try:
+        yield stats
+    finally:
+        stats["peak"] = tracemalloc.get_traced_memory()[1]
+        after = rss()
+        stats["rss_delta"] = after - before if after is not None and before is not None else None
+        _snapshot()
+        _session.part = None
+
+
+# ------------------------------
+# cProfile
+# ------------------------------
+HOTSPOTS = 15
+MAX_DEPTH = 64
+MAX_FRAMES = 100_000  # frames visited by collapsed_stacks(); shared helpers multiply the paths
+RESOLUTION = 1e-6  # collapsed stacks are written in microseconds
+
+Func = tuple[str, int, str]
+
+
+def _label(func: Func) -> str:
+    filename, line, name = func
+    if filename == "~":
+        return name  # <built-in method ...>
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+def hotspots(stats: pstats.Stats, limit: int = HOTSPOTS) -> list[dict[str, Any]]:
+    """The functions with the most own time, most expensive first."""
+    rows = [
+        {"function": _label(func), "calls": nc, "own": tt, "cumulative": ct}
+        for func, (cc, nc, tt, ct, callers) in stats.stats.items()
+    ]
+    rows.sort(key=lambda row: row["own"], reverse=True)
+    return rows[:limit]
+
+
+def collapsed_stacks(stats: pstats.Stats) -> list[str]:
+    """Estimated stacks as "root;caller;callee microseconds" lines (Brendan Gregg's collapsed format)."""
+    callees: dict[Func, dict[Func, float]] = {}
+    for func, (cc, nc, tt, ct, callers) in stats.stats.items():
+        for caller, edge in callers.items():
+            if caller != func:
+                callees.setdefault(caller, {})[func] = edge[3]
+    roots = [func for func, entry in stats.stats.items() if not set(entry[4]) - {func}]
+
+    labels = {func: _label(func) for func in stats.stats}
+    lines: dict[str, float] = {}
+    visited = 0
+
+    def walk(func: Func, seconds: float, path: list[Func], stack: str) -> None:
+        nonlocal visited
+        visited += 1
+        total = stats.stats[func][3] or seconds
+        children = 0.0
+        if len(path) < MAX_DEPTH and visited < MAX_FRAMES:
+            for child, edge in callees.get(func, {}).items():
+                if child in path:
+                    continue  # recursion: its time stays with the outer frame
+                share = edge * seconds / total if total else 0.0
+                if share < RESOLUTION or visited >= MAX_FRAMES:
+                    continue  # too small to show, or out of budget: it stays with this frame
+                children += share
+                walk(child, share, path + [child], f"{stack};{labels[child]}")
+        own = max(seconds - children, 0.0)
+        if own > 0:
+            lines[stack] = lines.get(stack, 0.0) + own
+
+    for root in roots:
+        walk(root, stats.stats[root][3], [root], labels[root])
+    return [f"{stack} {round(seconds * 1e6)}" for stack, seconds in lines.items() if round(seconds * 1e6) > 0]
+
+
+def save_cprofile(profiler: cProfile.Profile, prefix: Union[str, Path]) -> dict[str, Any]:
+    """Write <prefix>.prof, <prefix>.collapsed and <prefix>.txt; returns their paths and the hotspots."""
+    prefix = Path(prefix)
+    prefix.parent.mkdir(parents=True, exist_ok=True)
+    stats = pstats.Stats(profiler)
+    top = hotspots(stats)
+
+    paths = {kind: str(prefix.with_name(f"{prefix.name}.{kind}")) for kind in ("prof", "collapsed", "txt")}
+    stats.dump_stats(paths["prof"])
+    Path(paths["collapsed"]).write_text("".join(f"{line}\n" for line in collapsed_stacks(stats)))
+    Path(paths["txt"]).write_text(format_hotspots(top) + "\n")
+    return {**paths, "hotspots": top}
+
+
+def format_hotspots(rows: list[dict[str, Any]]) -> str:
+    lines = [f"{'own':>10} {'cumulative':>10} {'calls':>8}  function"]
+    for row in rows:
+        lines.append(f"{row['own'] * 1000:>8.2f}ms {row['cumulative'] * 1000:>8.2f}ms {row['calls']:>8}  {row['function']}")
+    return "\n".join(lines)
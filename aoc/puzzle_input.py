@@ -0,0 +1,103 @@
+"""Puzzle input text with lazily computed, cached views.
+
+    data = fetch_input(typed=True)
+    data.lines          # ("1abc2", "pqr3stu8vwx", ...)
+    data.paragraphs     # blocks separated by blank lines, as tuples of lines
+    data.ints()         # every integer, as a compact array('q')
+    data.grid           # rows of a rectangular character grid
+    data.tokens         # whitespace separated tokens per line
+
+Every view is computed on first access and kept on the object, and
+fetch_input(typed=True) hands out the same object for the same puzzle, so
+each view is computed at most once per process.
+"""
+import re
+from array import array
+from functools import cached_property
+from typing import Any, Union
+
+_INT = re.compile(r"-?\d+")
+
+
+def _ints_numpy(text: str) -> Any:
+    """Vectorized integer extraction: digit runs are found and summed with NumPy."""
+    try:
+        import numpy as np
+    except ImportError:
+        raise ImportError("ints(numpy=True) requires NumPy (pip install numpy)") from None
+
+    buf = np.frombuffer(text.encode("ascii"), dtype=np.uint8)
+    digits = buf.astype(np.int64) - ord("0")
+    is_digit = (digits >= 0) & (digits <= 9)
+    if not is_digit.any():
+        return np.zeros(0, dtype=np.int64)
+
+    edges = np.diff(np.concatenate(([False], is_digit, [False])).astype(np.int8))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    if (ends - starts).max() > 18:
+        raise OverflowError("integer too large for int64")
+
+    # Weight each digit by 10 ** (distance to the end of its run)
+    idx = np.flatnonzero(is_digit)
+    run_end = np.repeat(ends, ends - starts)
+    values = np.add.reduceat(digits[idx] * 10 ** (run_end - idx - 1), np.cumsum(ends - starts) - (ends - starts))
+
+    negative = np.zeros(len(starts), dtype=bool)
+    has_prev = starts > 0
+    negative[has_prev] = buf[starts[has_prev] - 1] == ord("-")
+    return np.where(negative, -values, values)
+
+
+class PuzzleInput(str):
+    """A str with cached, compact views for the common ways of parsing puzzle input."""
+
+    @cached_property
+    def lines(self) -> tuple[str, ...]:
+        """The lines of the input, without line endings."""
+        return tuple(self.splitlines())
+
+    @cached_property
+    def paragraphs(self) -> tuple[tuple[str, ...], ...]:
+        """Blocks of lines separated by blank lines."""
+        text = self.strip("\n")
+        if not text:
+            return ()
+        return tuple(tuple(block.splitlines()) for block in re.split(r"\n[ \t]*\n", text))
+
+    @cached_property
+    def tokens(self) -> tuple[tuple[str, ...], ...]:
+        """Whitespace separated tokens of every line."""
+        return tuple(tuple(line.split()) for line in self.lines)
+
+    @cached_property
+    def grid(self) -> tuple[str, ...]:
+        """The rows of a rectangular character grid: grid[row][col]."""
+        rows = self.lines
+        while rows and not rows[-1]:
+            rows = rows[:-1]
+        if rows and any(len(row) != len(rows[0]) for row in rows):
+            raise ValueError("Input is not a rectangular grid")
+        return rows
+
+    def ints(self, numpy: bool = False) -> Union[array, tuple[int, ...], Any]:
+        """Every integer in the input, including a leading minus sign.
+
+        Returns an array('q'), or a tuple if some value does not fit in 64 bits.
+        With numpy=True, returns an int64 NumPy array computed without regexes.
+        """
+        key = "_ints_numpy" if numpy else "_ints"
+        cached = self.__dict__.get(key)
+        if cached is not None:
+            return cached
+
+        if numpy:
+            values = _ints_numpy(self)
+        else:
+            found = [int(m) for m in _INT.findall(self)]
+            try:
+                values = array("q", found)
+            except OverflowError:
+                values = tuple(found)
+        self.__dict__[key] = values
+        return values
@@ -0,0 +1,130 @@
+"""Render puzzle descriptions as terminal text.
+
+Converts the <article class="day-desc"> sections of a puzzle page into
+plain text with ANSI styles: titles and <em> in bold, inline <code> in
+colour, links followed by their URL and <pre> blocks indented verbatim.
+With a width, paragraphs and list items are reflowed to fit it.
+"""
+from typing import Optional
+
+import click
+from bs4.element import NavigableString, Tag
+
+from .client import BASE
+from .parser import _soup
+from .trace import traced
+
+# (text, styles) runs of inline content
+Run = tuple[str, frozenset[str]]
+
+_STYLES = {
+    "em": {"bold": True, "fg": "bright_white"},
+    "code": {"fg": "green"},
+    "link": {"underline": True},
+}
+
+
+def _style(text: str, styles: frozenset[str]) -> str:
+    kwargs: dict = {}
+    for name in sorted(styles):
+        kwargs.update(_STYLES[name])
+    return click.style(text, **kwargs) if kwargs else text
+
+
+def _inline(node, styles: frozenset[str] = frozenset()) -> list[Run]:
+    """Flatten inline markup into styled runs."""
+    if isinstance(node, NavigableString):
+        return [(str(node), styles)]
+    if not isinstance(node, Tag):
+        return []
+
+    if node.name == "em":
+        styles = styles | {"em"}
+    elif node.name == "code":
+        styles = styles | {"code"}
+    elif node.name == "br":
+        return [("\n", styles)]
+
+    runs = [run for child in node.children for run in _inline(child, styles)]
+    if node.name == "a" and (href := node.get("href")):
+        url = href if "://" in href else f"{BASE}{href}"
+        runs = [(text, s | {"link"}) for text, s in runs] + [(f" <{url}>", styles)]
+    return runs
+
+
+def _words(runs: list[Run]) -> list[list[Run]]:
+    """Split runs into words; a word may span several styles (e.g. "<em>x</em>,")."""
+    words: list[list[Run]] = []
+    current: list[Run] = []
+    for text, styles in runs:
+        for i, piece in enumerate(text.replace("\n", " ").split(" ")):
+            if i > 0 and current:
+                words.append(current)
+                current = []
+            if piece:
+                current.append((piece, styles))
+    if current:
+        words.append(current)
+    return words
+
+
+def _reflow(runs: list[Run], width: Optional[int], indent: str = "", hanging: str = "") -> str:
+    """Join runs into lines of at most `width` visible characters (unlimited if None)."""
+    lines: list[str] = []
+    line, visible, empty = indent, len(indent), True
+    for word in _words(runs):
+        size = sum(len(text) for text, _ in word)
+        if not empty and width is not None and visible + 1 + size > width:
+            lines.append(line)
+            line, visible, empty = hanging, len(hanging), True
+        if not empty:
+            line += " "
+            visible += 1
+        line += "".join(_style(text, styles) for text, styles in word)
+        visible += size
+        empty = False
+    lines.append(line)
+    return "\n".join(lines)
+
+
+def _block(node: Tag, width: Optional[int]) -> list[str]:
+    """Render a block-level element as a list of paragraphs."""
+    if node.name == "h2":
+        return [_style(node.get_text().strip(), frozenset({"em"}))]
+    if node.name == "pre":
+        # Style every line separately so escape codes never span a newline
+        lines, line = [], ""
+        for text, styles in _inline(node):
+            for i, piece in enumerate(text.split("\n")):
+                if i > 0:
+                    lines.append(line)
+                    line = ""
+                line += _style(piece, styles) if piece else ""
+        lines.append(line)
+        while lines and not lines[-1]:
+            lines.pop()
+        return ["\n".join(f"    {line}" for line in lines)]
+    if node.name in ("ul", "ol"):
+        items = []
+        for n, li in enumerate(node.find_all("li", recursive=False), start=1):
+            bullet = "  - " if node.name == "ul" else f"  {n}. "
+            items.append(_reflow(_inline(li), width, indent=bullet, hanging=" " * len(bullet)))
+        return ["\n".join(items)]
+    return [_reflow(_inline(node), width)]
+
+
+@traced("render.render_description")
+def render_description(html: str, part: Optional[int] = None, width: Optional[int] = None) -> str:
+    """Render the description of one part (1 or 2), or all unlocked parts, as terminal text."""
+    articles = _soup(html).find_all("article", class_="day-desc")
+    if part is not None:
+        if not 1 <= part <= len(articles):
+            raise IndexError(f"No description for part {part} on this page")
+        articles = [articles[part - 1]]
+
+    paragraphs = []
+    for article in articles:
+        for child in article.children:
+            if isinstance(child, Tag):
+                paragraphs.extend(_block(child, width))
+    return "\n\n".join(paragraphs) + "\n"
@@ -0,0 +1,535 @@
+"""Run a year of solvers in parallel and check them against accepted answers.
+
+A solver is a Python file named after its day ("day01.py", "day_1.py" or
+"01.py") in the solver directory, or in a "<year>" subdirectory of it.
+It defines part1(data) and/or part2(data), which receive the cached input
+as a PuzzleInput and return the answer:
+
+    def part1(data):
+        return sum(data.ints())
+
+Solvers run in a ProcessPoolExecutor, one task per day, with a timeout
+and an optional address-space cap per task. With memory=True every task
+is traced with tracemalloc, and with cprofile_dir every task is profiled
+with cProfile (see aoc.profile). Sections timed with aoc.timer inside a
+solver are reported per part.
+
+Every day gets a fingerprint of its input, its solver file and the local
+modules the solver imports (transitively, from its directory). Results of
+successful runs are stored under that fingerprint, and run_year(...,
+incremental=True) reuses them for days whose fingerprint is unchanged
+instead of running the solver again.
+"""
+import ast
+import cProfile
+import hashlib
+import importlib.util
+import os
+import re
+import signal
+import sys
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Iterable, Optional, Union
+
+from . import api, cache, memoize, profile, timing
+from .errors import UnknownDateError
+from .fallbacks import param_fallback, env_int, config, today
+from .puzzle_input import PuzzleInput
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+SOLVER_PATTERN = re.compile(r"^(?:day)?_?(\d{1,2})\.py$", re.I)
+PARTS = (1, 2)
+FINGERPRINT_VERSION = b"1"
+SOLVER_MODULE_PREFIX = "_aoc_solver_"
+
+
+@dataclass
+class PartResult:
+    part: int
+    status: str
+    """"ok", "wrong", "unchecked" (no accepted answer yet), "missing", "error" or "timeout"."""
+    answer: Optional[str] = None
+    expected: Optional[str] = None
+    seconds: Optional[float] = None
+    error: Optional[str] = None
+    peak_memory: Optional[int] = None
+    """Peak traced memory in bytes (memory runs only)."""
+    rss_delta: Optional[int] = None
+    sections: Optional[list[dict[str, Any]]] = None
+    """Sections timed with aoc.timer: {"name", "seconds", "calls"} dicts."""
+
+
+@dataclass
+class DayResult:
+    year: int
+    day: int
+    path: str
+    parts: list[PartResult] = field(default_factory=list)
+    error: Optional[str] = None
+    input_hash: Optional[str] = None
+    memory: Optional[dict[str, Any]] = None
+    """Top allocation sites and checkpoints of a memory run."""
+    cprofile: Optional[dict[str, Any]] = None
+    """Paths of the saved profile files and the hotspots of a cProfile run."""
+    fingerprint: Optional[str] = None
+    """Hash of the input, the solver and its local imports."""
+    cached: bool = False
+    """Whether the parts were reused from an earlier run with the same fingerprint."""
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and all(p.status in ("ok", "unchecked", "missing") for p in self.parts)
+
+    @property
+    def seconds(self) -> float:
+        return sum(p.seconds or 0.0 for p in self.parts)
+
+
+# ------------------------------
+# Discovery
+# ------------------------------
+def discover(path: Union[str, Path], year: int) -> dict[int, Path]:
+    """Map day -> solver file, looking in `path/<year>` if it exists, else in `path`."""
+    root = Path(path)
+    if (root / str(year)).is_dir():
+        root = root / str(year)
+
+    solvers: dict[int, Path] = {}
+    for file in sorted(root.glob("*.py")):
+        m = SOLVER_PATTERN.match(file.name)
+        if m and 1 <= int(m.group(1)) <= 25:
+            solvers.setdefault(int(m.group(1)), file)
+    return solvers
+
+
+# ------------------------------
+# Fingerprints
+# ------------------------------
+def _module_file(root: Path, name: str) -> Optional[Path]:
+    parts = name.split(".")
+    for candidate in (root.joinpath(*parts).with_suffix(".py"), root.joinpath(*parts, "__init__.py")):
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def _imported_names(file: Path, root: Path) -> set[str]:
+    """Absolute names of the modules `file` may import (and their parent packages)."""
+    try:
+        tree = ast.parse(file.read_bytes(), str(file))
+    except (OSError, SyntaxError, ValueError):
+        return set()
+    package = list(file.relative_to(root).parent.parts)
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                base = package[:len(package) - node.level + 1] if node.level <= len(package) + 1 else []
+                module = ".".join(base + ([node.module] if node.module else []))
+            else:
+                module = node.module or ""
+            if module:
+                names.add(module)
+            # `from pkg import mod` may import a submodule
+            names.update(f"{module}.{alias.name}" if module else alias.name for alias in node.names)
+    for name in list(names):
+        parts = name.split(".")
+        names.update(".".join(parts[:i]) for i in range(1, len(parts)))
+    return names
+
+
+def local_imports(file: Union[str, Path]) -> list[Path]:
+    """Modules in the solver's directory that it imports, directly or through each other."""
+    file = Path(file).resolve()
+    root = file.parent
+    found: dict[Path, None] = {}
+    todo = [file]
+    while todo:
+        for name in _imported_names(todo.pop(), root):
+            module = _module_file(root, name)
+            if module is not None and module != file and module not in found:
+                found[module] = None
+                todo.append(module)
+    return sorted(found)
+
+
+def fingerprint(file: Union[str, Path], input_hash: str) -> str:
+    """Hash of an input, a solver file and its local imports; changes whenever one of them does."""
+    file = Path(file).resolve()
+    h = hashlib.sha256(FINGERPRINT_VERSION + b"\0" + input_hash.encode("utf8"))
+    for path in [file] + local_imports(file):
+        h.update(b"\0" + str(path.relative_to(file.parent)).encode("utf8") + b"\0")
+        h.update(path.read_bytes())
+    return h.hexdigest()[:16]
+
+
+def _reusable(raw: dict[str, Any]) -> bool:
+    return bool(raw["parts"]) and not any("error" in entry for entry in raw["parts"])
+
+
+# ------------------------------
+# Worker side
+# ------------------------------
+class _Timeout(Exception):
+    pass
+
+
+def _on_alarm(signum, frame):
+    raise _Timeout()
+
+
+def load_solver(path: Union[str, Path], name: str) -> Any:
+    """Import a solver file as a fresh module; its directory is importable for local helpers."""
+    path = Path(path).resolve()
+    if str(path.parent) not in sys.path:
+        sys.path.insert(0, str(path.parent))
+    spec = importlib.util.spec_from_file_location(name, path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Cannot load solver {path}")
+    module = importlib.util.module_from_spec(spec)
+    # Registered so its functions pickle by reference; aoc.parallel reloads it in
+    # workers that were not forked from this process
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def call_part(module: Any, part: int, data: PuzzleInput) -> tuple[Optional[str], Optional[float]]:
+    """Run partN of a solver module. Returns (answer, seconds), or (None, None) if missing."""
+    func = getattr(module, f"part{part}", None)
+    if func is None:
+        return None, None
+    start = perf_counter()
+    answer = func(data)
+    return str(answer), perf_counter() - start
+
+
+def run_task(path: str, day: int, data: str, timeout: Optional[float],
+              memory_limit: Optional[int], memory: bool = False,
+              cprofile_prefix: Optional[str] = None) -> dict[str, Any]:
+    """Run both parts of one solver, normally inside a pool worker; returns the raw part results.
+
+    Each part entry has the answer and seconds, or an "error" (timeout,
+    memory limit, exception) that ends the run. `timeout` is in seconds for
+    both parts and `memory_limit` in bytes; both change process-wide
+    settings, so the call belongs in a worker process.
+    """
+    use_alarm = timeout is not None and hasattr(signal, "setitimer")
+    limits = None
+    if memory_limit is not None and resource is not None:
+        limits = resource.getrlimit(resource.RLIMIT_AS)
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, limits[1]))
+    if use_alarm:
+        previous = signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+
+    results: list[dict[str, Any]] = []
+    profiler = cProfile.Profile() if cprofile_prefix is not None else None
+    if memory:
+        profile.start()
+    try:
+        module = load_solver(path, f"{SOLVER_MODULE_PREFIX}day{day:02d}")
+        puzzle_input = PuzzleInput(data)
+        with memoize.using_input(data):
+            for part in PARTS:
+                with profile.measure(part) as stats, timing.collect() as sections:
+                    if profiler is not None:
+                        profiler.enable()
+                    try:
+                        answer, seconds = call_part(module, part, puzzle_input)
+                    finally:
+                        if profiler is not None:
+                            profiler.disable()
+                results.append({"part": part, "answer": answer, "seconds": seconds,
+                                "peak_memory": stats["peak"], "rss_delta": stats["rss_delta"],
+                                "sections": sections or None})
+    except _Timeout:
+        results.append({"part": len(results) + 1, "error": "timeout"})
+    except MemoryError:
+        results.append({"part": len(results) + 1, "error": "memory limit exceeded"})
+    except BaseException as exc:
+        results.append({"part": len(results) + 1, "error": f"{type(exc).__name__}: {exc}"})
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+        if limits is not None:
+            resource.setrlimit(resource.RLIMIT_AS, limits)
+        session = profile.stop() if memory else None
+    raw: dict[str, Any] = {"parts": results}
+    if session is not None:
+        raw["memory"] = {"top": session.top, "checkpoints": session.checkpoints}
+    if profiler is not None:
+        raw["cprofile"] = profile.save_cprofile(profiler, cprofile_prefix)
+    return raw
+
+
+# ------------------------------
+# Parent side
+# ------------------------------
+def _expected(year: int, day: int, stars: Optional[list[int]], cookie: Optional[str]) -> list[str]:
+    if stars is not None and stars[day - 1] == 0:
+        return []
+    try:
+        return api.fetch_answers(year, day, cookie=cookie)
+    except Exception:
+        return []
+
+
+def _collect(result: DayResult, raw: dict[str, Any], expected: list[str]) -> None:
+    result.memory = raw.get("memory")
+    result.cprofile = raw.get("cprofile")
+    for entry in raw["parts"]:
+        part = entry["part"]
+        want = expected[part - 1] if part <= len(expected) else None
+        if "error" in entry:
+            status = "timeout" if entry["error"] == "timeout" else "error"
+            result.parts.append(PartResult(part, status, expected=want, error=entry["error"]))
+            continue
+        answer = entry["answer"]
+        if answer is None:
+            status = "missing"
+        elif want is None:
+            status = "unchecked"
+        else:
+            status = "ok" if answer == want else "wrong"
+        result.parts.append(PartResult(part, status, answer, want, entry["seconds"],
+                                       peak_memory=entry.get("peak_memory"), rss_delta=entry.get("rss_delta"),
+                                       sections=entry.get("sections")))
+
+
+@param_fallback("year", env_int, config, today)
+def run_year(year: Optional[int] = None, path: Union[str, Path] = ".", days: Optional[Iterable[int]] = None,
+             jobs: Optional[int] = None, timeout: Optional[float] = 60.0,
+             memory_limit: Optional[int] = None, cookie: Optional[str] = None,
+             memory: bool = False, cprofile_dir: Union[str, Path, None] = None,
+             incremental: bool = False) -> list[DayResult]:
+    """Run the solvers of a year (or only `days`) across cores and check their answers.
+
+    `timeout` is in seconds per day, `memory_limit` in bytes per day. With
+    `memory`, allocations are traced and reported per part and per day. With
+    `cprofile_dir`, every day is profiled and its .prof, .collapsed and
+    hotspot files are written there. With `incremental`, days whose
+    fingerprint matches a stored successful run are not run again; their
+    stored answers and timings are reported with `cached` set.
+    """
+    if year is None:
+        raise UnknownDateError("Puzzle year not set")
+
+    solvers = discover(path, year)
+    if days is not None:
+        wanted = set(days)
+        solvers = {d: p for d, p in solvers.items() if d in wanted}
+
+    try:
+        stars = api.fetch_stars(year, cookie=cookie)
+    except Exception:
+        stars = None
+
+    results: dict[int, DayResult] = {}
+    inputs: dict[int, str] = {}
+    for day, file in solvers.items():
+        results[day] = DayResult(year, day, str(file))
+        try:
+            inputs[day] = api.fetch_input(year, day, cookie=cookie)
+        except Exception as exc:
+            results[day].error = f"no input: {exc}"
+            continue
+        results[day].input_hash = memoize.input_digest(inputs[day])
+        try:
+            results[day].fingerprint = fingerprint(file, results[day].input_hash)
+        except OSError:
+            pass
+
+    # Memory and cProfile runs need fresh measurements, and store nothing
+    plain = not memory and cprofile_dir is None
+    runs = cache.load_runs(year) if plain else {}
+    if incremental and plain:
+        for day in list(inputs):
+            stored = runs.get(str(day))
+            current = results[day].fingerprint
+            if current is not None and stored and stored.get("fingerprint") == current:
+                _collect(results[day], stored["raw"], _expected(year, day, stars, cookie))
+                results[day].cached = True
+                del inputs[day]
+
+    def prefix(day: int) -> Optional[str]:
+        return None if cprofile_dir is None else str(Path(cprofile_dir).resolve() / f"{year}-day{day:02d}")
+
+    pool = ProcessPoolExecutor(max_workers=jobs or os.cpu_count())
+    stuck = False
+    try:
+        futures = {
+            day: pool.submit(run_task, str(solvers[day]), day, data, timeout, memory_limit, memory,
+                             prefix(day))
+            for day, data in inputs.items()
+        }
+        for day, future in futures.items():
+            try:
+                # The alarm in the worker normally fires first; this catches solvers stuck in C code
+                raw = future.result(timeout=None if timeout is None else timeout + 10)
+            except FutureTimeout:
+                stuck = True
+                raw = {"parts": [{"part": 1, "error": "timeout"}]}
+            except BrokenProcessPool:
+                raw = {"parts": [{"part": 1, "error": "worker died (memory limit?)"}]}
+            _collect(results[day], raw, _expected(year, day, stars, cookie))
+            if plain and results[day].fingerprint is not None and _reusable(raw):
+                runs[str(day)] = {"fingerprint": results[day].fingerprint, "raw": raw}
+    finally:
+        if stuck:
+            # Shutting down would wait for the stuck worker forever
+            for proc in list((getattr(pool, "_processes", None) or {}).values()):
+                proc.terminate()
+        pool.shutdown(wait=not stuck, cancel_futures=True)
+
+    if plain and inputs:
+        try:
+            cache.save_runs(year, runs)
+        except OSError:
+            pass
+    return [results[day] for day in sorted(results)]
+
+
+# ------------------------------
+# Reporting
+# ------------------------------
+def _cell(part: Optional[PartResult]) -> str:
+    if part is None:
+        return "-"
+    if part.status in ("error", "timeout"):
+        return part.status
+    if part.status == "missing":
+        return "-"
+    mark = {"ok": "", "unchecked": " ?", "wrong": f" != {part.expected}"}[part.status]
+    return f"{part.answer}{mark}"
+
+
+def format_duration(seconds: float) -> str:
+    """A duration as "12.3 ms" below a second, else "1.23 s"."""
+    if seconds < 1:
+        return f"{seconds * 1000:.1f} ms"
+    return f"{seconds:.2f} s"
+
+
+def format_size(size: Optional[int]) -> str:
+    """A byte count with a binary unit ("1.5 MiB"); None as "-"."""
+    if size is None:
+        return "-"
+    sign = "-" if size < 0 else ""
+    size = abs(size)
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{sign}{size:.0f} {unit}" if unit == "B" else f"{sign}{size:.1f} {unit}"
+        size /= 1024
+    return f"{sign}{size:.1f} GiB"
+
+
+def _status(result: DayResult) -> str:
+    if result.error:
+        return result.error
+    failed = [p for p in result.parts if p.status not in ("ok", "unchecked", "missing")]
+    return ", ".join(f"part {p.part}: {p.error or p.status}" for p in failed) or "ok"
+
+
+def format_table(results: list[DayResult]) -> str:
+    """Render results as a per-day table of answers, timings and status (and peak memory, if traced)."""
+    memory = any(p.peak_memory is not None for r in results for p in r.parts)
+    rows = [("Day", "Part 1", "Part 2", "Time") + (("Peak",) if memory else ()) + ("Status",)]
+    for r in results:
+        parts = {p.part: p for p in r.parts}
+        row = (str(r.day), _cell(parts.get(1)), _cell(parts.get(2)), format_duration(r.seconds))
+        if memory:
+            peaks = [p.peak_memory for p in r.parts if p.peak_memory is not None]
+            row += (format_size(max(peaks)) if peaks else "-",)
+        rows.append(row + (_status(r) + (" (cached)" if r.cached else ""),))
+
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    right = (0, 3, 4) if memory else (0, 3)
+    lines = []
+    for row in rows:
+        cells = [cell.rjust(w) if i in right else cell.ljust(w) for i, (cell, w) in enumerate(zip(row, widths))]
+        lines.append("  ".join(cells).rstrip())
+    total = sum(r.seconds for r in results)
+    lines.append(f"{sum(r.ok for r in results)}/{len(results)} days ok in {format_duration(total)}")
+    return "\n".join(lines)
+
+
+def format_cached(results: list[DayResult]) -> str:
+    """One line naming the days whose results were reused, or "" if every day ran."""
+    days = [str(r.day) for r in results if r.cached]
+    if not days:
+        return ""
+    return f"Skipped {len(days)} unchanged day{'s' if len(days) > 1 else ''}: {', '.join(days)}"
+
+
+def format_memory(results: list[DayResult]) -> str:
+    """Render the per-part memory, top allocation sites and checkpoints of a memory run."""
+    blocks = []
+    for r in results:
+        lines = [f"Day {r.day}"]
+        for p in r.parts:
+            if p.peak_memory is not None:
+                lines.append(f"  part {p.part}: peak {format_size(p.peak_memory)}, rss {format_size(p.rss_delta)}")
+        memory = r.memory or {}
+        for cp in memory.get("checkpoints", []):
+            where = f" (part {cp['part']})" if cp["part"] else ""
+            lines.append(f"  checkpoint {cp['name']}{where}: {format_size(cp['current'])}, peak {format_size(cp['peak'])}")
+        if memory.get("top"):
+            lines.append("  top allocation sites:")
+            for site in memory["top"]:
+                lines.append(f"    {format_size(site['size']):>10}  {site['file']}:{site['line']} ({site['count']} blocks)")
+        if len(lines) > 1:
+            blocks.append("\n".join(lines))
+    return "\n\n".join(blocks)
+
+
+def format_sections(results: list[DayResult]) -> str:
+    """Render the sections timed with aoc.timer, per day and part."""
+    lines = []
+    for r in results:
+        for p in r.parts:
+            for section in p.sections or []:
+                lines.append((f"{r.day}.{p.part}", section["name"], format_duration(section["seconds"]), str(section["calls"])))
+    if not lines:
+        return ""
+    rows = [("Part", "Section", "Time", "Calls")] + lines
+    widths = [max(len(row[i]) for row in rows) for i in range(4)]
+    return "\n".join(
+        "  ".join(cell.rjust(w) if i >= 2 else cell.ljust(w) for i, (cell, w) in enumerate(zip(row, widths))).rstrip()
+        for row in rows
+    )
+
+
+def format_hotspots(results: list[DayResult]) -> str:
+    """Render the cProfile hotspots of every day, with the paths of the saved profiles."""
+    blocks = []
+    for r in results:
+        if r.cprofile:
+            blocks.append(f"Day {r.day} ({r.cprofile['prof']}, {r.cprofile['collapsed']})\n"
+                          + profile.format_hotspots(r.cprofile["hotspots"][:10]))
+    return "\n\n".join(blocks)
+
+
+def to_json(results: list[DayResult]) -> list[dict[str, Any]]:
+    """Results as JSON-serializable dicts, for CI."""
+    return [{**asdict(r), "ok": r.ok, "seconds": r.seconds} for r in results]
+
+
+def from_json(data: list[dict[str, Any]]) -> list[DayResult]:
+    """Inverse of to_json(), e.g. to record saved results in the benchmark history."""
+    results = []
+    for entry in data:
+        fields = {k: v for k, v in entry.items() if k not in ("ok", "seconds", "parts")}
+        results.append(DayResult(**fields, parts=[PartResult(**p) for p in entry.get("parts", [])]))
+    return results
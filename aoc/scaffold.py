@@ -0,0 +1,112 @@
+"""Start a new puzzle: solver skeleton, examples and a primed cache.
+
+new() writes <path>/<year>/dayDD.py from a template, unless it exists, and
+dayDD.json next to it with the examples, the guessed example answers and
+any answers already accepted by the server:
+
+    {"year": 2023, "day": 1, "title": "Trebuchet?!",
+     "examples": ["1abc2\\n..."], "expected": ["142", null], "answers": []}
+
+The input, the puzzle page and (if there is no star index yet) the
+calendar are fetched concurrently over the client's pooled session, which
+fills every cache `aoc run` reads, so the first run works offline.
+
+The template is a Python file with $year, $day and $title placeholders
+(string.Template syntax), set with AOC_TEMPLATE or the `template` config
+value.
+"""
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from string import Template
+from typing import Optional, Union
+
+from . import api, cache, client, parser
+from .errors import InputNotFoundError, MissingCookieError, UnknownDateError
+from .fallbacks import param_fallback, env_int, env, config, today, cookie_error, setting
+
+DEFAULT_TEMPLATE = '''"""Advent of Code $year, day $day: $title"""
+
+
+def part1(data):
+    pass
+
+
+def part2(data):
+    pass
+'''
+
+
+@dataclass
+class NewPuzzle:
+    solver: Path
+    sidecar: Path
+    created: bool
+    """False if the solver already existed and was left alone."""
+    examples: list[str]
+    expected: list[Optional[str]]
+    input_bytes: int
+
+
+def load_template(template: Optional[Union[str, Path]] = None) -> str:
+    """Read the solver template: `template`, else the `template` setting, else the default."""
+    template = template or setting("template")
+    if template is None:
+        return DEFAULT_TEMPLATE
+    return Path(template).expanduser().read_text()
+
+
+def _prefetch(year: int, day: int, cookie: str) -> tuple[bytes, str]:
+    """Fetch input, page and calendar at the same time; each lands in its cache."""
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        data = pool.submit(client.fetch_input_bytes, year, day, cookie)
+        page = pool.submit(client.fetch_page, year, day, cookie)
+        if cache.load_stars(year) is None:
+            pool.submit(api.fetch_stars, year, cookie=cookie)
+        try:
+            return data.result(), page.result()
+        except Exception as exc:
+            raise InputNotFoundError(f"Could not fetch puzzle {year}/{day}: {exc}") from exc
+
+
+@param_fallback("year", env_int, config, today)
+@param_fallback("day", env_int, config, today)
+@param_fallback("cookie", env, config, cookie_error)
+def new(year: Optional[int] = None, day: Optional[int] = None, path: Union[str, Path] = ".",
+        template: Optional[Union[str, Path]] = None, cookie: Optional[str] = None,
+        overwrite: bool = False) -> NewPuzzle:
+    """Create the solver skeleton and example sidecar of a puzzle and prime the caches."""
+    if year is None or day is None:
+        raise UnknownDateError("Puzzle year or day not set")
+
+    if cookie is None:
+        raise MissingCookieError("Personal cookie not provided, and no AOC_COOKIE envvar or config value present")
+
+    source = Template(load_template(template))
+    data, html = _prefetch(year, day, cookie)
+
+    examples = parser.extract_examples(html)
+    expected = parser.extract_expected(html)
+    answers = parser.extract_answers(html)
+    title = parser.extract_title(html) or ""
+    cache.update_meta(year, day, answers=answers)
+
+    root = Path(path) / str(year)
+    root.mkdir(parents=True, exist_ok=True)
+    solver = root / f"day{day:02d}.py"
+    created = overwrite or not solver.exists()
+    if created:
+        solver.write_text(source.safe_substitute(year=year, day=day, title=title))
+
+    sidecar = solver.with_suffix(".json")
+    sidecar.write_text(json.dumps({
+        "year": year,
+        "day": day,
+        "title": title,
+        "examples": examples,
+        "expected": expected,
+        "answers": answers,
+    }, indent=2) + "\n")
+
+    return NewPuzzle(solver, sidecar, created, examples, expected, len(data))
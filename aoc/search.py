@@ -0,0 +1,283 @@
+"""Shortest paths and state-space search over integer-encoded states.
+
+A state is an int: a flat Grid index, or several values packed into one
+(pos * 4 + facing, ...). Every search takes the start state (or several)
+and a neighbour function:
+
+    dijkstra, astar, bfs01    neighbors(s) -> iterable of (next, cost)
+    bfs, bidirectional_bfs    neighbors(s) -> iterable of next states
+
+Neighbour functions should return one batch per call (a list or tuple);
+grid_graph() precomputes them for a Grid. bfs(batch=True) goes further:
+neighbors gets a whole frontier and returns every state it reaches, so
+there is one call per level instead of one per state.
+
+When every state is below `size`, pass it: distances, visited flags and
+parents then live in flat arrays (array('q'), bytearray) instead of dicts
+and sets, and heap entries are single ints (cost * size + state) instead
+of tuples. `goal` is a state or a predicate; a search stops as soon as it
+settles one.
+
+    grid = Grid(fetch_input())
+    graph = grid_graph(grid, weights=grid.cells.translate(DIGITS))
+    result = dijkstra(grid.index(0, 0), graph, goal=grid.index(grid.height - 1, grid.width - 1),
+                      size=len(grid.cells))
+    result.cost, result.path()
+"""
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from heapq import heapify, heappop, heappush
+from itertools import compress
+from typing import Any, Callable, Iterable, Optional, Sequence, Union
+
+from .grid import Grid, _table
+
+State = int
+Goal = Union[int, Callable[[int], bool], None]
+
+DIGITS = bytes(b - 48 if 48 <= b <= 57 else 0 for b in range(256))
+"""bytes.translate table mapping "0".."9" to their value, for digit-weighted grids."""
+
+
+class _Table(dict):
+    """A dict that reads missing states as `default`, standing in for a flat array."""
+
+    def __init__(self, default: int):
+        super().__init__()
+        self.default = default
+
+    def __missing__(self, key: int) -> int:
+        return self.default
+
+
+def _tables(size: Optional[int], paths: bool) -> tuple[Any, Any, Any]:
+    """dist (-1 = unreached), done (0/1) and prev (-1 = none, or None) for a search."""
+    if size is None:
+        return _Table(-1), _Table(0), _Table(-1) if paths else None
+    return array("q", [-1]) * size, bytearray(size), array("q", [-1]) * size if paths else None
+
+
+def _starts(start: Union[State, Iterable[State]]) -> list[State]:
+    return [start] if isinstance(start, int) else list(start)
+
+
+def _goal_test(goal: Goal) -> Optional[Callable[[int], bool]]:
+    if goal is None or callable(goal):
+        return goal
+    return goal.__eq__
+
+
+@dataclass
+class SearchResult:
+    dist: Any
+    """Cost per state: an array('q') with -1 for unreached states when `size` was given, else a dict."""
+    goal: Optional[State] = None
+    """The goal state the search stopped at, if any."""
+    prev: Any = None
+    """Parent per state (paths=True only), -1 for start states."""
+
+    def distance(self, state: State) -> int:
+        """Cost of reaching `state`, or -1. Exact for settled states; an upper bound for the rest."""
+        if isinstance(self.dist, dict):
+            return self.dist.get(state, -1)
+        return self.dist[state] if 0 <= state < len(self.dist) else -1
+
+    @property
+    def cost(self) -> int:
+        return -1 if self.goal is None else self.distance(self.goal)
+
+    def path(self, state: Optional[State] = None) -> list[State]:
+        """States from a start to `state` (default: the goal), or [] if it was not reached."""
+        if self.prev is None:
+            raise ValueError("Run the search with paths=True to reconstruct paths")
+        state = self.goal if state is None else state
+        if state is None or self.distance(state) < 0:
+            return []
+        path = [state]
+        while (state := self.prev[state]) != -1:
+            path.append(state)
+        return path[::-1]
+
+
+# ------------------------------
+# Weighted searches
+# ------------------------------
+def _best_first(start: Union[State, Iterable[State]], neighbors: Callable[[State], Iterable[tuple[State, int]]],
+                goal: Goal, heuristic: Optional[Callable[[State], int]], size: Optional[int],
+                paths: bool) -> SearchResult:
+    is_goal = _goal_test(goal)
+    dist, done, prev = _tables(size, paths)
+    heap: list[Any] = []
+    for s in _starts(start):
+        dist[s] = 0
+        h = heuristic(s) if heuristic else 0
+        heap.append(h * size + s if size else (h, s))
+    heapify(heap)
+
+    while heap:
+        if size:
+            s = heappop(heap) % size
+        else:
+            s = heappop(heap)[1]
+        if done[s]:
+            continue
+        done[s] = 1
+        if is_goal is not None and is_goal(s):
+            return SearchResult(dist, s, prev)
+        d = dist[s]
+        for t, cost in neighbors(s):
+            nd = d + cost
+            old = dist[t]
+            if old < 0 or nd < old:
+                dist[t] = nd
+                if prev is not None:
+                    prev[t] = s
+                f = nd + heuristic(t) if heuristic else nd
+                heappush(heap, f * size + t if size else (f, t))
+    return SearchResult(dist, None, prev)
+
+
+def dijkstra(start: Union[State, Iterable[State]], neighbors: Callable[[State], Iterable[tuple[State, int]]],
+             goal: Goal = None, size: Optional[int] = None, paths: bool = False) -> SearchResult:
+    """Cheapest costs from `start` with a binary heap; costs must be non-negative integers."""
+    return _best_first(start, neighbors, goal, None, size, paths)
+
+
+def astar(start: Union[State, Iterable[State]], neighbors: Callable[[State], Iterable[tuple[State, int]]],
+          goal: Goal, heuristic: Callable[[State], int], size: Optional[int] = None,
+          paths: bool = False) -> SearchResult:
+    """Dijkstra guided by a consistent `heuristic`: h(s) <= cost(s, t) + h(t) for every step."""
+    return _best_first(start, neighbors, goal, heuristic, size, paths)
+
+
+def bfs01(start: Union[State, Iterable[State]], neighbors: Callable[[State], Iterable[tuple[State, int]]],
+          goal: Goal = None, size: Optional[int] = None, paths: bool = False) -> SearchResult:
+    """Cheapest costs when every step costs 0 or 1, with a deque instead of a heap."""
+    is_goal = _goal_test(goal)
+    dist, done, prev = _tables(size, paths)
+    queue = deque(_starts(start))
+    for s in queue:
+        dist[s] = 0
+
+    while queue:
+        s = queue.popleft()
+        if done[s]:
+            continue
+        done[s] = 1
+        if is_goal is not None and is_goal(s):
+            return SearchResult(dist, s, prev)
+        d = dist[s]
+        for t, cost in neighbors(s):
+            nd = d + cost
+            old = dist[t]
+            if old < 0 or nd < old:
+                dist[t] = nd
+                if prev is not None:
+                    prev[t] = s
+                if cost:
+                    queue.append(t)
+                else:
+                    queue.appendleft(t)
+    return SearchResult(dist, None, prev)
+
+
+# ------------------------------
+# Unweighted searches
+# ------------------------------
+def bfs(start: Union[State, Iterable[State]], neighbors: Callable[[Any], Iterable[State]], goal: Goal = None,
+        size: Optional[int] = None, batch: bool = False, paths: bool = False) -> SearchResult:
+    """Fewest steps from `start`, level by level.
+
+    With batch=True, neighbors(frontier) receives the list of states of a
+    level and returns all the states they lead to (paths are not tracked).
+    """
+    if batch and paths:
+        raise ValueError("paths=True needs per-state neighbours; use batch=False")
+    is_goal = _goal_test(goal)
+    dist, _, prev = _tables(size, paths)
+    frontier = _starts(start)
+    for s in frontier:
+        dist[s] = 0
+        if is_goal is not None and is_goal(s):
+            return SearchResult(dist, s, prev)
+
+    level = 0
+    while frontier:
+        level += 1
+        nxt: list[State] = []
+        if batch:
+            for t in neighbors(frontier):
+                if dist[t] < 0:
+                    dist[t] = level
+                    if is_goal is not None and is_goal(t):
+                        return SearchResult(dist, t, prev)
+                    nxt.append(t)
+        else:
+            for s in frontier:
+                for t in neighbors(s):
+                    if dist[t] < 0:
+                        dist[t] = level
+                        if prev is not None:
+                            prev[t] = s
+                        if is_goal is not None and is_goal(t):
+                            return SearchResult(dist, t, prev)
+                        nxt.append(t)
+        frontier = nxt
+    return SearchResult(dist, None, prev)
+
+
+def bidirectional_bfs(start: State, goal: State, neighbors: Callable[[State], Iterable[State]],
+                      reverse: Optional[Callable[[State], Iterable[State]]] = None,
+                      size: Optional[int] = None) -> int:
+    """Fewest steps from `start` to `goal`, or -1, growing the smaller frontier from either end.
+
+    `reverse` gives the predecessors of a state; it defaults to `neighbors`
+    (an undirected graph).
+    """
+    if start == goal:
+        return 0
+    seen = [_tables(size, False)[0], _tables(size, False)[0]]
+    steps = [neighbors, reverse or neighbors]
+    frontiers = [[start], [goal]]
+    seen[0][start] = seen[1][goal] = 0
+
+    while frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        mine, other, step = seen[side], seen[1 - side], steps[side]
+        level = mine[frontiers[side][0]] + 1
+        best = -1
+        nxt: list[State] = []
+        for s in frontiers[side]:
+            for t in step(s):
+                if mine[t] < 0:
+                    mine[t] = level
+                    if other[t] >= 0 and (best < 0 or level + other[t] < best):
+                        best = level + other[t]
+                    nxt.append(t)
+        if best >= 0:
+            return best
+        frontiers[side] = nxt
+    return -1
+
+
+# ------------------------------
+# Grid graphs
+# ------------------------------
+def grid_graph(grid: Grid, walls: str = "#", diagonal: bool = False,
+               weights: Optional[Sequence[int]] = None) -> Callable[[State], tuple]:
+    """Precomputed neighbour function over the flat indices of `grid`, avoiding `walls`.
+
+    Returns next states, or (next, weights[next]) pairs when `weights`
+    (a cost per flat index) is given. Use size=len(grid.cells).
+    """
+    free = grid.cells.translate(_table(walls + "\n", b"\x00", b"\x01"))
+    offsets = grid.offsets(diagonal)
+    table: list[tuple] = [()] * len(grid.cells)
+    for i in compress(range(len(free)), free):
+        if grid.wrap:
+            near = [j for j in grid.neighbors(i, diagonal) if free[j]]
+        else:
+            near = [j for j in [i + d for d in offsets] if free[j]]
+        table[i] = tuple(near) if weights is None else tuple([(j, weights[j]) for j in near])
+    return table.__getitem__
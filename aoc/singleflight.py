@@ -0,0 +1,108 @@
+"""In-process request coalescing ("single flight").
+
+When several threads (or coroutines) ask for the same key at the same
+moment, only the first one runs the work; the others wait for it and share
+its result or exception. Once the call finishes the key is forgotten, so
+later calls run again (caching is a separate concern).
+
+Usage:
+
+    flights = Group()
+    html = flights.do(("GET", url), fetch, url)
+
+    @flights.wrap
+    def fetch(url): ...
+"""
+import asyncio
+import threading
+from concurrent.futures import Future
+from functools import wraps
+from inspect import signature
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+from . import trace
+
+T = TypeVar("T")
+
+
+class Group:
+    """A namespace of keys whose concurrent calls are coalesced."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, Future] = {}
+        self._followers: dict[Hashable, int] = {}
+
+    def _join(self, key: Hashable) -> tuple[Future, bool]:
+        """Return the in-flight future for `key` and whether the caller leads it."""
+        with self._lock:
+            fut = self._calls.get(key)
+            if fut is not None:
+                trace.count("coalesced_calls")
+                self._followers[key] += 1
+                return fut, False
+            fut = self._calls[key] = Future()
+            self._followers[key] = 0
+            return fut, True
+
+    def _finish(self, key: Hashable) -> None:
+        with self._lock:
+            del self._calls[key]
+            del self._followers[key]
+
+    def followers(self, key: Hashable) -> int:
+        """Number of callers waiting on the in-flight call for `key` (0 when none is in flight)."""
+        with self._lock:
+            return self._followers.get(key, 0)
+
+    def do(self, key: Hashable, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run fn(*args, **kwargs), unless a call for `key` is already in flight."""
+        fut, leader = self._join(key)
+        if not leader:
+            return fut.result()
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as exc:
+            fut.set_exception(exc)
+            raise
+        else:
+            fut.set_result(result)
+            return result
+        finally:
+            self._finish(key)
+
+    async def do_async(self, key: Hashable, fn: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+        """Async variant of do(); shares in-flight calls with threads and other event loops."""
+        fut, leader = self._join(key)
+        if not leader:
+            return await asyncio.wrap_future(fut)
+
+        try:
+            result = await fn(*args, **kwargs)
+        except BaseException as exc:
+            fut.set_exception(exc)
+            raise
+        else:
+            fut.set_result(result)
+            return result
+        finally:
+            self._finish(key)
+
+    def wrap(self, func: Callable[..., T]) -> Callable[..., T]:
+        """Decorator: coalesce concurrent calls of `func` with equal arguments.
+
+        Arguments are bound to the signature with defaults filled in, so
+        f(1), f(1, None) and f(x=1) share a key when None is the default.
+        Calls that differ in any argument (another cookie, or none) do not.
+        """
+        sig = signature(func)
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            bound = sig.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = (func.__qualname__, tuple(bound.arguments.items()))
+            return self.do(key, func, *args, **kwargs)
+
+        return wrapper
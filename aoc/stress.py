@@ -0,0 +1,358 @@
+"""Stress-test solvers on scaled synthetic inputs and fit their complexity.
+
+    results = stress(2023, 5, path="solutions/")
+    print(format_report(results))
+
+scale(text, factor) builds an input about `factor` times larger than
+`text` with the same structure. Sections (separated by blank lines) are
+handled by shape:
+
+    grid        rows of equal length without spaces: the grid is tiled, and
+                characters that occur only once or twice (S, E, ...) are
+                kept in the first tile only
+    lines       every line is a format with integer fields ("Game {}: {} red");
+                new lines reuse the formats, with each field drawn from the
+                range it spans in the input; a leading header line is kept once
+    one line    its comma- or space-separated items are scaled like lines,
+                and a line of bare characters by sampling them
+
+Inputs made of three or more similar sections (all grids, or all starting
+with the same line format) repeat whole sections instead. Only the
+shape of the input is preserved, not its meaning: names that refer to
+other lines, or answers the puzzle guarantees to exist, can make a solver
+fail on synthetic input, and those sizes are reported as errors.
+
+stress() runs the solver in a worker process on the real input (or, if it
+is not available, the largest example block), then on inputs 2, 10 and
+100 times larger, and on the example as an extra small point. It stops
+at the first size that times out. fit() estimates the exponent k of
+time ~ n^k from the timings and picks the closest of O(1), O(log n),
+O(n), O(n log n), O(n^2) and O(n^3), where n is the input size in bytes.
+"""
+import math
+import os
+import random
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional, Union
+
+from . import api, runner
+from .errors import UnknownDateError
+from .fallbacks import param_fallback, env_int, config, today
+
+FACTORS = (2, 10, 100)
+NUMBER = re.compile(r"-?\d+")
+SEPARATOR = re.compile(r",\s*|\s+")
+
+MODELS: dict[str, Callable[[float], float]] = {
+    "O(1)": lambda n: 1.0,
+    "O(log n)": lambda n: math.log(n),
+    "O(n)": lambda n: n,
+    "O(n log n)": lambda n: n * math.log(n),
+    "O(n^2)": lambda n: n * n,
+    "O(n^3)": lambda n: n ** 3,
+}
+
+
+# ------------------------------
+# Structure
+# ------------------------------
+def _sections(text: str) -> list[list[str]]:
+    blocks = re.split(r"\n[ \t]*\n", text.strip("\n"))
+    return [block.split("\n") for block in blocks if block.strip()]
+
+
+def _is_grid(lines: list[str]) -> bool:
+    return (len(lines) >= 2 and len(set(map(len, lines))) == 1 and len(lines[0]) >= 2
+            and not any(" " in line for line in lines))
+
+
+def _kind(lines: list[str]) -> str:
+    if _is_grid(lines):
+        return "grid"
+    return "lines" if len(lines) > 1 else "line"
+
+
+def _formats(lines: list[str]) -> dict[str, list[tuple[int, int]]]:
+    """Format of every line (integers replaced by {}) -> (min, max) of each of its fields."""
+    ranges: dict[str, list[tuple[int, int]]] = {}
+    for line in lines:
+        fmt = NUMBER.sub("{}", line.replace("{", "{{").replace("}", "}}"))
+        values = [int(v) for v in NUMBER.findall(line)]
+        known = ranges.get(fmt)
+        if known is None:
+            ranges[fmt] = [(v, v) for v in values]
+        else:
+            ranges[fmt] = [(min(lo, v), max(hi, v)) for (lo, hi), v in zip(known, values)]
+    return ranges
+
+
+def _records(sections: list[list[str]]) -> bool:
+    """Whether the sections are repeated records (all grids, or sharing their first line's format)."""
+    if len(sections) < 3:
+        return False
+    if all(_is_grid(lines) for lines in sections):
+        return True
+    return len({NUMBER.sub("{}", lines[0]) for lines in sections}) == 1
+
+
+def describe(text: str) -> str:
+    """A one-line summary of the structure scale() sees in `text`."""
+    parts = []
+    for lines in _sections(text):
+        kind = _kind(lines)
+        if kind == "grid":
+            parts.append(f"{len(lines)}x{len(lines[0])} grid")
+            continue
+        items = lines if kind == "lines" else _items(lines[0])[0]
+        values = [int(v) for item in items for v in NUMBER.findall(item)]
+        desc = f"{len(items)} {'lines' if kind == 'lines' else 'items'}, {len(_formats(items))} formats"
+        if values:
+            desc += f", ints {min(values)}..{max(values)}"
+        parts.append(desc)
+    if _records(_sections(text)):
+        return f"{len(parts)} sections like: {parts[0]}"
+    return "; ".join(parts) or "empty"
+
+
+# ------------------------------
+# Scaling
+# ------------------------------
+def _tile(lines: list[str], factor: float) -> list[str]:
+    rows = max(1, round(math.sqrt(factor)))
+    cols = max(1, round(factor / rows))
+    counts = Counter("".join(lines))
+    rare = {ch for ch, n in counts.items() if n <= 2}
+    if rare:
+        # Rare markers become the most common character next to them
+        h, w = len(lines), len(lines[0])
+        near: Counter[str] = Counter()
+        for r in range(h):
+            for c in range(w):
+                if lines[r][c] in rare:
+                    for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+                        if 0 <= r + dr < h and 0 <= c + dc < w and lines[r + dr][c + dc] not in rare:
+                            near[lines[r + dr][c + dc]] += 1
+        filler = (near or counts).most_common(1)[0][0]
+        plain = [line.translate(str.maketrans({ch: filler for ch in rare})) for line in lines]
+    else:
+        plain = lines
+    out = []
+    for tile_row in range(rows):
+        for r, line in enumerate(lines):
+            first = line if tile_row == 0 else plain[r]
+            out.append(first + plain[r] * (cols - 1))
+    return out
+
+
+def _generate(items: list[str], count: int, rng: random.Random) -> list[str]:
+    """`count` new items shaped like `items`, with integer fields drawn from their observed ranges."""
+    ranges = _formats(items)
+    formats = [NUMBER.sub("{}", item.replace("{", "{{").replace("}", "}}")) for item in items]
+    out = []
+    for _ in range(count):
+        fmt = rng.choice(formats)
+        out.append(fmt.format(*(rng.randint(lo, hi) for lo, hi in ranges[fmt])))
+    return out
+
+
+def _items(line: str) -> tuple[list[str], str]:
+    """The items of a one-line input and the separator joining them."""
+    sep = SEPARATOR.search(line)
+    if sep is None:
+        return list(line), ""
+    return SEPARATOR.split(line), sep.group()
+
+
+def scale(text: str, factor: float, seed: int = 0) -> str:
+    """An input about `factor` times the size of `text` with the same structure (see module doc)."""
+    rng = random.Random(seed)
+    sections = _sections(text)
+    if _records(sections):
+        count = max(len(sections), round(len(sections) * factor))
+        chosen = sections + [rng.choice(sections) for _ in range(count - len(sections))]
+        return "\n\n".join("\n".join(lines) for lines in chosen) + "\n"
+
+    out = []
+    for lines in sections:
+        kind = _kind(lines)
+        if kind == "grid":
+            out.append(_tile(lines, factor))
+        elif kind == "lines":
+            # A first line unlike the repeated rest ("seed-to-soil map:") is a header, not a record
+            rest = _formats(lines[1:])
+            header = len(rest) < len(lines) - 1 and not set(_formats(lines[:1])) & set(rest)
+            body = lines[1:] if header else lines
+            out.append(lines + _generate(body, max(0, round(len(body) * (factor - 1))), rng))
+        elif len(sections) == 1:
+            items, sep = _items(lines[0])
+            extra = max(0, round(len(items) * (factor - 1)))
+            more = [rng.choice(items) for _ in range(extra)] if not sep else _generate(items, extra, rng)
+            out.append([sep.join(items + more)])
+        else:
+            out.append(lines)  # a header line next to the scaled section
+    return "\n\n".join("\n".join(lines) for lines in out) + "\n"
+
+
+# ------------------------------
+# Fitting
+# ------------------------------
+@dataclass
+class Fit:
+    exponent: float
+    """Slope of log(time) against log(size): time ~ size^exponent."""
+    model: str
+    """The closest of MODELS, by least squares in log space."""
+    points: int
+
+
+def fit(sizes: Iterable[float], seconds: Iterable[float]) -> Optional[Fit]:
+    """Fit time against size; None with fewer than two distinct sizes."""
+    pts = [(float(n), float(t)) for n, t in zip(sizes, seconds) if n > 1 and t > 0]
+    if len({n for n, _ in pts}) < 2:
+        return None
+    xs = [math.log(n) for n, _ in pts]
+    ys = [math.log(t) for _, t in pts]
+    mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
+    slope = sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / sum((x - mx) ** 2 for x in xs)
+
+    def residual(f: Callable[[float], float]) -> float:
+        diffs = [y - math.log(f(n)) for (n, _), y in zip(pts, ys)]
+        mean = sum(diffs) / len(diffs)
+        return sum((d - mean) ** 2 for d in diffs)
+
+    return Fit(slope, min(MODELS, key=lambda name: residual(MODELS[name])), len(pts))
+
+
+# ------------------------------
+# Running
+# ------------------------------
+@dataclass
+class StressPoint:
+    label: str
+    """"1x" for the base input, "2x", ... for scaled ones, "example" for the example block."""
+    size: int
+    """Input size in bytes."""
+    parts: list[dict[str, Any]] = field(default_factory=list)
+    """{"part", "seconds", "answer"} or {"part", "error"} per part, as returned by the worker."""
+
+
+@dataclass
+class StressResult:
+    year: int
+    day: int
+    path: str
+    source: str
+    """"input" or "example": what the scaled inputs are built from."""
+    structure: str
+    points: list[StressPoint] = field(default_factory=list)
+    fits: dict[int, Optional[Fit]] = field(default_factory=dict)
+
+
+def _no_memo() -> None:
+    # Timings must not come from aoc.memo entries of earlier runs
+    os.environ["AOC_MEMO_MAX_MB"] = "0"
+
+
+def _examples(year: int, day: int) -> list[str]:
+    try:
+        blocks = api.fetch_blocks(year, day, examples=True)
+    except Exception:
+        return []
+    return [b["text"] for b in sorted(blocks, key=lambda b: -b["lines"])]
+
+
+@param_fallback("year", env_int, config, today)
+@param_fallback("day", env_int, config, today)
+def stress(year: Optional[int] = None, day: Optional[int] = None, path: Union[str, Path] = ".",
+           factors: Iterable[float] = FACTORS, timeout: Optional[float] = 60.0, seed: int = 0,
+           cookie: Optional[str] = None,
+           progress: Optional[Callable[[StressPoint], None]] = None) -> StressResult:
+    """Time a day's solver on its input and on scaled copies of it, and fit each part's growth."""
+    if year is None or day is None:
+        raise UnknownDateError("Puzzle year or day not set")
+    solver = runner.discover(path, year).get(day)
+    if solver is None:
+        raise FileNotFoundError(f"No solver for {year} day {day} in {path}")
+
+    examples = _examples(year, day)
+    try:
+        base, source = api.fetch_input(year, day, cookie=cookie), "input"
+    except Exception:
+        if not examples:
+            raise
+        base, source = examples.pop(0), "example"
+    kind = [_kind(lines) for lines in _sections(base)]
+    inputs = [("1x", base)] + [(f"{f:g}x", scale(base, f, seed)) for f in factors]
+    # The largest example of the same shape adds a small-size point
+    example = next((e for e in examples if [_kind(lines) for lines in _sections(e)] == kind), None)
+    if example is not None:
+        inputs.insert(0, ("example", example))
+
+    result = StressResult(year, day, str(solver), source, describe(base))
+    pool = ProcessPoolExecutor(max_workers=1, initializer=_no_memo)
+    stuck = False
+    try:
+        for label, data in inputs:
+            future = pool.submit(runner.run_task, str(solver), day, data, timeout, None)
+            try:
+                raw = future.result(timeout=None if timeout is None else timeout + 10)
+            except FutureTimeout:
+                stuck = True
+                raw = {"parts": [{"part": 1, "error": "timeout"}]}
+            except BrokenProcessPool:
+                raw = {"parts": [{"part": 1, "error": "worker died"}]}
+            point = StressPoint(label, len(data.encode("utf8")), raw["parts"])
+            result.points.append(point)
+            if progress is not None:
+                progress(point)
+            if stuck or any(e.get("error") == "timeout" for e in point.parts):
+                break  # larger inputs would only time out too
+    finally:
+        if stuck:
+            for proc in list((getattr(pool, "_processes", None) or {}).values()):
+                proc.terminate()
+        pool.shutdown(wait=not stuck, cancel_futures=True)
+
+    for part in runner.PARTS:
+        timed = [(p.size, e["seconds"]) for p in result.points for e in p.parts
+                 if e["part"] == part and e.get("seconds") is not None]
+        result.fits[part] = fit([n for n, _ in timed], [t for _, t in timed])
+    return result
+
+
+# ------------------------------
+# Reporting
+# ------------------------------
+def _cell(entry: Optional[dict[str, Any]]) -> str:
+    if entry is None:
+        return "-"
+    if "error" in entry:
+        return "timeout" if entry["error"] == "timeout" else "error"
+    if entry.get("seconds") is None:
+        return "-"
+    return runner.format_duration(entry["seconds"])
+
+
+def format_report(result: StressResult) -> str:
+    """Render the timings per size and the fitted growth of each part."""
+    lines = [f"{result.year} day {result.day}: {result.structure} (scaled from the {result.source})"]
+    rows = [("Input", "Size", "Part 1", "Part 2")]
+    for p in result.points:
+        parts = {e["part"]: e for e in p.parts}
+        rows.append((p.label, runner.format_size(p.size), _cell(parts.get(1)), _cell(parts.get(2))))
+    widths = [max(len(row[i]) for row in rows) for i in range(4)]
+    for row in rows:
+        lines.append("  ".join(cell.ljust(w) if i == 0 else cell.rjust(w)
+                               for i, (cell, w) in enumerate(zip(row, widths))).rstrip())
+    for part, f in result.fits.items():
+        if f is not None:
+            lines.append(f"Part {part}: time ~ n^{f.exponent:.2f}, closest to {f.model} ({f.points} sizes)")
+    errors = sorted({e["error"] for p in result.points for e in p.parts
+                     if "error" in e and e["error"] != "timeout"})
+    lines.extend(f"error: {error}" for error in errors)
+    return "\n".join(lines)
@@ -0,0 +1,119 @@
+"""Cross-process token-bucket throttle for requests to adventofcode.com.
+
+Every process on the machine draws from one bucket whose state lives in
+<cache dir>/throttle.json, guarded by an advisory file lock. The bucket
+refills at `rate` tokens per second up to `burst` tokens; each request
+takes one. When the bucket is empty a caller reserves the next token
+(the level goes negative) and sleeps outside the lock, so queued callers
+from all processes are spaced 1/rate seconds apart.
+
+Configure with AOC_RATE / AOC_BURST or the `rate` / `burst` config values.
+A rate of 0 disables throttling.
+"""
+import json
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Callable, Iterator
+
+from . import cache, trace
+from .fallbacks import setting
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+DEFAULT_RATE = 1.0
+DEFAULT_BURST = 5
+STATE_FILENAME = "throttle.json"
+
+_thread_lock = threading.Lock()
+
+
+@contextmanager
+def _file_lock(f: IO[bytes]) -> Iterator[None]:
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    elif msvcrt is not None:  # pragma: no cover - Windows
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+    else:  # pragma: no cover
+        yield
+
+
+class TokenBucket:
+    """Token bucket whose state is shared through a lock-protected file."""
+
+    def __init__(self, path: Path, rate: float, burst: int,
+                 clock: Callable[[], float] = time.time,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.path = path
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+
+    def reserve(self) -> float:
+        """Take one token and return how long the caller must wait before using it."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with _thread_lock, open(self.path, "a+b") as f, _file_lock(f):
+            f.seek(0)
+            try:
+                state = json.loads(f.read() or b"{}")
+                tokens, updated = float(state["tokens"]), float(state["updated"])
+            except (ValueError, KeyError, TypeError):
+                tokens, updated = float(self.burst), self._clock()
+
+            now = self._clock()
+            tokens = min(float(self.burst), tokens + max(0.0, now - updated) * self.rate)
+            tokens -= 1
+            wait = -tokens / self.rate if tokens < 0 else 0.0
+
+            f.seek(0)
+            f.truncate()
+            f.write(json.dumps({"tokens": tokens, "updated": now}).encode("utf8"))
+            f.flush()
+        return wait
+
+    def acquire(self) -> float:
+        """Block until a token is available. Returns the time spent queueing."""
+        wait = self.reserve()
+        if wait > 0:
+            with trace.span("throttle.wait", delay=wait):
+                self._sleep(wait)
+            trace.count("throttled_requests")
+        return wait
+
+
+def bucket() -> TokenBucket:
+    """Return the machine-wide bucket configured by AOC_RATE / AOC_BURST."""
+    rate = float(setting("rate", DEFAULT_RATE))
+    burst = max(1, int(setting("burst", DEFAULT_BURST)))
+    return TokenBucket(cache.cache_dir() / STATE_FILENAME, rate, burst)
+
+
+def acquire() -> float:
+    """Wait for the machine-wide bucket before sending a request.
+
+    Returns the queueing delay in seconds (0 when throttling is disabled).
+    """
+    b = bucket()
+    if b.rate <= 0:
+        return 0.0
+    return b.acquire()
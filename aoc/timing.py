@@ -0,0 +1,85 @@
+"""Named timing sections inside solvers.
+
+    from aoc import timer
+
+    @timer
+    def parse(data): ...
+
+    def part1(data):
+        grid = parse(data)
+        with timer("search"):
+            ...
+
+While `aoc run` executes a part, every timed section adds its duration and
+call count to that part's report. Outside a run (or before collect() is
+used) a timed call costs one global lookup and records nothing.
+"""
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter
+from typing import Any, Callable, Iterator, Optional, Union
+
+# name -> [seconds, calls] of the sections being collected, or None
+_sections: Optional[dict[str, list]] = None
+
+
+def _record(name: str, seconds: float) -> None:
+    if _sections is not None:
+        entry = _sections.setdefault(name, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+
+
+class _Timer:
+    def __init__(self, name: str):
+        self.name = name
+        self._starts: list[float] = []
+
+    def __enter__(self) -> "_Timer":
+        self._starts.append(perf_counter())
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        _record(self.name, perf_counter() - self._starts.pop())
+
+    def __call__(self, func: Callable) -> Callable:
+        name = self.name
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _sections is None:
+                return func(*args, **kwargs)
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _record(name, perf_counter() - start)
+
+        return wrapper
+
+
+def timer(name: Union[str, Callable, None] = None) -> Any:
+    """Time a section: @timer, @timer("name") or `with timer("name"):`.
+
+    Decorated functions are reported under their qualified name.
+    """
+    if callable(name):
+        return _Timer(name.__qualname__)(name)
+    return _Timer(name or "section")
+
+
+@contextmanager
+def collect() -> Iterator[list[dict[str, Any]]]:
+    """Collect the sections timed inside the block.
+
+    Yields a list that is filled on exit with {"name", "seconds", "calls"}
+    dicts, in the order the sections first ran.
+    """
+    global _sections
+    previous, _sections = _sections, {}
+    report: list[dict[str, Any]] = []
+    try:
+        yield report
+    finally:
+        sections, _sections = _sections, previous
+        report.extend({"name": name, "seconds": s, "calls": n} for name, (s, n) in sections.items())
@@ -0,0 +1,183 @@
+"""Lightweight timing spans and counters for the hot paths of aoc.
+
+Spans are emitted around parameter fallback resolution, every HTTP request
+made by client.py, every parser call and the waits in submit(). They cost a
+single list check while no hook is registered.
+
+Library users register hooks that receive every finished Span:
+
+    from aoc import trace
+
+    trace.add_hook(lambda span: print(span.name, span.duration, span.attrs))
+
+The CLI --profile flag records spans and counters into a JSON or Chrome
+trace file (open it in chrome://tracing or https://ui.perfetto.dev).
+"""
+import json
+import os
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import wraps
+from time import perf_counter
+from typing import Any, Callable, Iterator, Optional
+
+Hook = Callable[["Span"], None]
+
+
+@dataclass
+class Span:
+    name: str
+    start: float
+    """perf_counter() value at the start of the span, in seconds."""
+    duration: float
+    thread: int
+    attrs: dict[str, Any] = field(default_factory=dict)
+
+
+_hooks: list[Hook] = []
+_lock = threading.Lock()
+counters: Counter[str] = Counter()
+
+
+# ------------------------------
+# Hooks
+# ------------------------------
+def add_hook(hook: Hook) -> None:
+    """Call `hook(span)` for every span that finishes from now on."""
+    _hooks.append(hook)
+
+
+def remove_hook(hook: Hook) -> None:
+    """Stop calling a hook previously registered with add_hook()."""
+    try:
+        _hooks.remove(hook)
+    except ValueError:
+        pass
+
+
+def enabled() -> bool:
+    """Whether any hook is registered (and spans are therefore timed)."""
+    return bool(_hooks)
+
+
+# ------------------------------
+# Spans and counters
+# ------------------------------
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[dict[str, Any]]:
+    """Time the enclosed block as a span named `name`.
+
+    Yields the attribute dict, so the block can attach results
+    (status codes, byte counts, ...) to the span.
+    """
+    if not _hooks:
+        yield attrs
+        return
+
+    start = perf_counter()
+    try:
+        yield attrs
+    finally:
+        finished = Span(name, start, perf_counter() - start, threading.get_ident(), attrs)
+        for hook in list(_hooks):
+            hook(finished)
+
+
+def traced(name: str):
+    """Decorator: run every call of the function inside span(name)."""
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _hooks:
+                return func(*args, **kwargs)
+            with span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def count(name: str, n: int = 1) -> None:
+    """Increment a process-wide counter such as "requests" or "bytes_received"."""
+    with _lock:
+        counters[name] += n
+
+
+# ------------------------------
+# Recording to a file
+# ------------------------------
+class Recorder:
+    """Hook that keeps every span, and dumps them with the counters to a file.
+
+    Usage:
+
+        rec = Recorder().start()
+        ...
+        rec.stop()
+        rec.dump("trace.json")
+    """
+
+    def __init__(self):
+        self.spans: list[Span] = []
+        self.origin = perf_counter()
+        self._baseline = Counter(counters)
+
+    def __call__(self, finished: Span) -> None:
+        self.spans.append(finished)
+
+    def start(self) -> "Recorder":
+        add_hook(self)
+        return self
+
+    def stop(self) -> None:
+        remove_hook(self)
+
+    def counters(self) -> dict[str, int]:
+        """Counter increments since this recorder was created."""
+        with _lock:
+            delta = Counter(counters)
+        delta.subtract(self._baseline)
+        return {k: v for k, v in sorted(delta.items()) if v}
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "spans": [
+                {
+                    "name": s.name,
+                    "start": s.start - self.origin,
+                    "duration": s.duration,
+                    "thread": s.thread,
+                    "attrs": s.attrs,
+                }
+                for s in self.spans
+            ],
+            "counters": self.counters(),
+        }
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        pid = os.getpid()
+        events: list[dict[str, Any]] = [
+            {
+                "name": s.name,
+                "ph": "X",
+                "ts": (s.start - self.origin) * 1e6,
+                "dur": s.duration * 1e6,
+                "pid": pid,
+                "tid": s.thread,
+                "args": s.attrs,
+            }
+            for s in self.spans
+        ]
+        end = max((e["ts"] + e["dur"] for e in events), default=0.0)
+        events.append({"name": "counters", "ph": "C", "ts": end, "pid": pid, "args": self.counters()})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def dump(self, path: str, format: Optional[str] = "chrome") -> None:
+        """Write the recording to `path` as "chrome" trace events or plain "json"."""
+        data = self.to_json() if format == "json" else self.to_chrome_trace()
+        with open(path, "w", encoding="utf8") as f:
+            json.dump(data, f, default=str)
@@ -0,0 +1,336 @@
+"""Pluggable HTTP transports for the client.
+
+Every backend sends one request and returns a Response with the status,
+headers, time to first byte and a body that is either read up front or
+streamed in chunks. Connections are pooled per transport, and one shared
+transport serves the whole process (see default()).
+
+Backends, chosen with AOC_TRANSPORT or the `transport` config value:
+
+    requests      requests.Session (default)
+    urllib3       urllib3.PoolManager, without the requests layer on top
+    http.client   the standard library; one keep-alive connection per host and thread
+    httpx         httpx.Client, over HTTP/2 when the h2 package is installed
+
+Backend libraries are imported when the transport is created, so only the
+chosen one is loaded. Failures surface as errors.NetworkError (no response)
+and errors.HTTPError (status >= 400, raised by the client).
+"""
+import http.client
+import importlib.util
+import threading
+from abc import ABC, abstractmethod
+from time import perf_counter
+from typing import Callable, Iterator, Optional
+from urllib.parse import urlsplit
+
+from .errors import NetworkError
+from .fallbacks import setting
+
+DEFAULT = "requests"
+TIMEOUT = 30.0
+USER_AGENT = "aoc-tools (+https://github.com/programmeerbeertjes/aoc-tools)"
+
+
+class Response:
+    """A response whose body is either already read or streamed on demand."""
+
+    def __init__(self, status: int, headers: dict[str, str], elapsed: float,
+                 read: Callable[[int], Iterator[bytes]], close: Callable[[], None],
+                 content: Optional[bytes] = None):
+        self.status = status
+        self.headers = headers
+        self.elapsed = elapsed
+        """Seconds between sending the request and receiving the response headers."""
+        self._read = read
+        self._close = close
+        self._content = content
+
+    @property
+    def ok(self) -> bool:
+        return self.status < 400
+
+    @property
+    def content(self) -> bytes:
+        if self._content is None:
+            self._content = b"".join(self._read(64 * 1024))
+            self.close()
+        return self._content
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf8")
+
+    def iter_content(self, size: int) -> Iterator[bytes]:
+        if self._content is not None:
+            for i in range(0, len(self._content), size):
+                yield self._content[i:i + size]
+            return
+        yield from self._read(size)
+
+    def close(self) -> None:
+        self._close()
+
+    def __enter__(self) -> "Response":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class Transport(ABC):
+    """Base class: sends requests over pooled connections."""
+
+    name = ""
+
+    def __init__(self, timeout: float = TIMEOUT):
+        self.timeout = timeout
+
+    @abstractmethod
+    def request(self, method: str, url: str, headers: Optional[dict[str, str]] = None,
+                body: Optional[bytes] = None, stream: bool = False) -> Response:
+        ...
+
+    def warm(self, url: str) -> None:
+        """Open a pooled connection to the host of `url` ahead of the first request (best effort)."""
+
+    def close(self) -> None:
+        pass
+
+
+def _warm_pool(pool) -> None:
+    """Connect an idle connection of a urllib3 connection pool and put it back."""
+    conn = pool._get_conn()
+    try:
+        if conn.sock is None:
+            conn.connect()
+    finally:
+        pool._put_conn(conn)
+
+
+class RequestsTransport(Transport):
+    name = "requests"
+
+    def __init__(self, timeout: float = TIMEOUT):
+        super().__init__(timeout)
+        import requests
+
+        self._errors = requests.RequestException
+        self._session = requests.Session()
+        self._session.headers["User-Agent"] = USER_AGENT
+
+    def request(self, method, url, headers=None, body=None, stream=False):
+        try:
+            resp = self._session.request(method, url, headers=headers, data=body, stream=stream,
+                                         timeout=self.timeout)
+            content = None if stream else resp.content
+        except self._errors as exc:
+            raise NetworkError(f"{method} {url} failed: {exc}") from exc
+        return Response(resp.status_code, dict(resp.headers), resp.elapsed.total_seconds(),
+                        resp.iter_content, resp.close, content)
+
+    def warm(self, url):
+        try:
+            adapter = self._session.get_adapter(url)
+            if hasattr(adapter, "get_connection_with_tls_context"):
+                # requests >= 2.32 keys pools by the TLS settings a request resolves to
+                import requests
+
+                env = self._session.merge_environment_settings(url, {}, False, None, None)
+                pool = adapter.get_connection_with_tls_context(requests.Request("GET", url).prepare(),
+                                                               env["verify"], env["proxies"], env["cert"])
+            else:
+                pool = adapter.get_connection(url)
+            _warm_pool(pool)
+        except Exception:
+            pass  # the request will connect instead
+
+    def close(self):
+        self._session.close()
+
+
+class Urllib3Transport(Transport):
+    name = "urllib3"
+
+    def __init__(self, timeout: float = TIMEOUT):
+        super().__init__(timeout)
+        import urllib3
+
+        self._errors = urllib3.exceptions.HTTPError
+        self._pool = urllib3.PoolManager(maxsize=10, retries=False, timeout=timeout)
+
+    def request(self, method, url, headers=None, body=None, stream=False):
+        try:
+            start = perf_counter()
+            resp = self._pool.request(method, url, headers={"User-Agent": USER_AGENT, **(headers or {})},
+                                      body=body, preload_content=False)
+            elapsed = perf_counter() - start
+            content = None
+            if not stream:
+                content = resp.read()
+                resp.release_conn()
+        except self._errors as exc:
+            raise NetworkError(f"{method} {url} failed: {exc}") from exc
+        return Response(resp.status, dict(resp.headers), elapsed, resp.stream, resp.release_conn, content)
+
+    def warm(self, url):
+        try:
+            _warm_pool(self._pool.connection_from_url(url))
+        except Exception:
+            pass  # the request will connect instead
+
+    def close(self):
+        self._pool.clear()
+
+
+class HTTPClientTransport(Transport):
+    """Standard library backend: one keep-alive connection per host and thread."""
+
+    name = "http.client"
+
+    def __init__(self, timeout: float = TIMEOUT):
+        super().__init__(timeout)
+        self._local = threading.local()
+        self._all: list[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+
+    def _connections(self) -> dict[tuple[str, str], http.client.HTTPConnection]:
+        if not hasattr(self._local, "connections"):
+            self._local.connections = {}
+        return self._local.connections
+
+    def _connect(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        key = (scheme, netloc)
+        conn = self._connections().get(key)
+        if conn is None:
+            cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            conn = self._connections()[key] = cls(netloc, timeout=self.timeout)
+            with self._lock:
+                self._all.append(conn)
+        return conn
+
+    def _drop(self, scheme: str, netloc: str, conn: http.client.HTTPConnection) -> None:
+        conn.close()
+        self._connections().pop((scheme, netloc), None)
+        with self._lock:
+            if conn in self._all:
+                self._all.remove(conn)
+
+    def request(self, method, url, headers=None, body=None, stream=False):
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path += f"?{parts.query}"
+        headers = {"User-Agent": USER_AGENT, **(headers or {})}
+
+        for attempt in (1, 2):
+            conn = self._connect(parts.scheme, parts.netloc)
+            reused = conn.sock is not None
+            try:
+                start = perf_counter()
+                conn.request(method, path, body=body, headers=headers)
+                resp = conn.getresponse()
+                elapsed = perf_counter() - start
+                content = None if stream else resp.read()
+                break
+            except (OSError, http.client.HTTPException) as exc:
+                self._drop(parts.scheme, parts.netloc, conn)
+                # The server may have closed an idle keep-alive connection; retry once on a new
+                # one, unless the request may have been processed (an answer POST must not repeat)
+                if not reused or attempt == 2 or method not in ("GET", "HEAD"):
+                    raise NetworkError(f"{method} {url} failed: {exc}") from exc
+
+        def read(size: int) -> Iterator[bytes]:
+            while chunk := resp.read(size):
+                yield chunk
+
+        def close() -> None:
+            # A partly read response leaves the connection unusable
+            if not resp.isclosed():
+                self._drop(parts.scheme, parts.netloc, conn)
+
+        return Response(resp.status, {k.lower(): v for k, v in resp.getheaders()}, elapsed, read, close, content)
+
+    def warm(self, url):
+        # Connections are per thread: only requests from this thread benefit
+        parts = urlsplit(url)
+        conn = self._connect(parts.scheme, parts.netloc)
+        if conn.sock is None:
+            try:
+                conn.connect()
+            except OSError:
+                self._drop(parts.scheme, parts.netloc, conn)
+
+    def close(self):
+        with self._lock:
+            conns, self._all = self._all, []
+        for conn in conns:
+            conn.close()
+
+
+class HttpxTransport(Transport):
+    name = "httpx"
+
+    def __init__(self, timeout: float = TIMEOUT):
+        super().__init__(timeout)
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError("The httpx transport requires httpx (pip install 'httpx[http2]')") from None
+
+        self._errors = httpx.HTTPError
+        self.http2 = importlib.util.find_spec("h2") is not None
+        self._client = httpx.Client(http2=self.http2, timeout=timeout, headers={"User-Agent": USER_AGENT})
+
+    def request(self, method, url, headers=None, body=None, stream=False):
+        try:
+            start = perf_counter()
+            resp = self._client.send(self._client.build_request(method, url, headers=headers, content=body),
+                                     stream=True)
+            elapsed = perf_counter() - start
+            content = None
+            if not stream:
+                content = resp.read()
+                resp.close()
+        except self._errors as exc:
+            raise NetworkError(f"{method} {url} failed: {exc}") from exc
+        return Response(resp.status_code, dict(resp.headers), elapsed, resp.iter_bytes, resp.close, content)
+
+    def close(self):
+        self._client.close()
+
+
+BACKENDS: dict[str, type[Transport]] = {
+    cls.name: cls for cls in (RequestsTransport, Urllib3Transport, HTTPClientTransport, HttpxTransport)
+}
+
+_default: Optional[Transport] = None
+_default_lock = threading.Lock()
+
+
+def create(name: Optional[str] = None, timeout: float = TIMEOUT) -> Transport:
+    """Create a new transport; `name` defaults to the `transport` setting."""
+    name = name or setting("transport", DEFAULT)
+    try:
+        cls = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown transport {name!r}; choose from {', '.join(BACKENDS)}") from None
+    return cls(timeout)
+
+
+def default() -> Transport:
+    """The transport shared by every request of this process."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = create()
+        return _default
+
+
+def reset() -> None:
+    """Close the shared transport; the next request creates one from the current setting."""
+    global _default
+    with _default_lock:
+        transport, _default = _default, None
+    if transport is not None:
+        transport.close()
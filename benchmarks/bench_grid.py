@@ -0,0 +1,142 @@
+"""Compare aoc.grid.Grid against the usual dict-of-tuples grid.
+
+    python benchmarks/bench_grid.py [--size 141] [--walls 0.2] [--repeat 10] [--json]
+
+Both sides get the same random maze (start in the middle) and do the same
+work; times include building the grid from the input text, like a solver
+would. Operations:
+
+    bfs        distance from the start to every reachable cell
+    fill       the region connected to the start
+    distance   steps from the start to the far corner
+    find       positions of every wall
+"""
+import argparse
+import json
+import random
+import sys
+from collections import deque
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from aoc.grid import Grid  # noqa: E402
+
+DIRS = ((-1, 0), (0, 1), (1, 0), (0, -1))
+
+
+def maze(size: int, walls: float, seed: int = 1) -> str:
+    rng = random.Random(seed)
+    rows = [["#" if rng.random() < walls else "." for _ in range(size)] for _ in range(size)]
+    rows[size // 2][size // 2] = "S"
+    rows[-1][-1] = "E"
+    return "\n".join("".join(row) for row in rows) + "\n"
+
+
+def parse(text: str) -> dict[tuple[int, int], str]:
+    return {(r, c): ch for r, row in enumerate(text.splitlines()) for c, ch in enumerate(row)}
+
+
+def dict_bfs(text: str) -> dict[tuple[int, int], int]:
+    grid = parse(text)
+    start = next(p for p, ch in grid.items() if ch == "S")
+    dist = {start: 0}
+    queue = deque([start])
+    while queue:
+        pos = queue.popleft()
+        for dr, dc in DIRS:
+            nxt = (pos[0] + dr, pos[1] + dc)
+            if grid.get(nxt, "#") != "#" and nxt not in dist:
+                dist[nxt] = dist[pos] + 1
+                queue.append(nxt)
+    return dist
+
+
+def dict_fill(text: str) -> set[tuple[int, int]]:
+    grid = parse(text)
+    start = next(p for p, ch in grid.items() if ch == "S")
+    seen = {start}
+    stack = [start]
+    while stack:
+        r, c = stack.pop()
+        for dr, dc in DIRS:
+            nxt = (r + dr, c + dc)
+            if nxt not in seen and grid.get(nxt, "#") != "#":
+                seen.add(nxt)
+                stack.append(nxt)
+    return seen
+
+
+def dict_distance(text: str) -> int:
+    return dict_bfs(text).get(max(parse(text)), -1)
+
+
+def dict_find(text: str) -> list[tuple[int, int]]:
+    return [p for p, ch in parse(text).items() if ch == "#"]
+
+
+def grid_bfs(text: str):
+    grid = Grid(text)
+    return grid.bfs(grid.find("S")[0])
+
+
+def grid_fill(text: str):
+    grid = Grid(text)
+    return grid.flood_fill(grid.find("S")[0], walls="#")
+
+
+def grid_distance(text: str) -> int:
+    grid = Grid(text)
+    return grid.distance(grid.find("S")[0], (grid.height - 1, grid.width - 1))
+
+
+def grid_find(text: str):
+    return Grid(text).find("#")
+
+
+CASES = {
+    "bfs": (dict_bfs, grid_bfs),
+    "fill": (dict_fill, grid_fill),
+    "distance": (dict_distance, grid_distance),
+    "find": (dict_find, grid_find),
+}
+
+
+def timed(fn, text: str, repeat: int) -> float:
+    runs = []
+    for _ in range(repeat):
+        start = perf_counter()
+        fn(text)
+        runs.append(perf_counter() - start)
+    return median(runs)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--size", type=int, default=141, help="Grid side (real inputs are 130-141)")
+    ap.add_argument("--walls", type=float, default=0.2, help="Fraction of wall cells")
+    ap.add_argument("--repeat", type=int, default=10)
+    ap.add_argument("--json", action="store_true")
+    args = ap.parse_args()
+
+    text = maze(args.size, args.walls)
+    assert len(dict_fill(text)) == len(grid_fill(text))
+    assert dict_distance(text) == grid_distance(text)
+
+    results = {}
+    for name, (baseline, fast) in CASES.items():
+        base, new = timed(baseline, text, args.repeat), timed(fast, text, args.repeat)
+        results[name] = {"dict_ms": base * 1000, "grid_ms": new * 1000, "speedup": base / new}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'operation':<10} {'dict':>10} {'Grid':>10} {'speedup':>8}")
+    for name, r in results.items():
+        print(f"{name:<10} {r['dict_ms']:>8.2f}ms {r['grid_ms']:>8.2f}ms {r['speedup']:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
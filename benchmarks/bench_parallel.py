@@ -0,0 +1,105 @@
+"""Compare aoc.parallel.pmap against a naive multiprocessing map.
+
+    python benchmarks/bench_parallel.py [--size 141] [--tasks 2000] [--jobs N] [--repeat 3] [--json]
+
+The workload is a typical brute force: for every task, block one cell of a
+random maze and walk a fixed route through it (about a millisecond of
+work each). Sides:
+
+    serial     a plain loop in this process
+    naive      multiprocessing.Pool.map over (task, grid text) pairs, so the
+               input is pickled into every task
+    pmap       pmap(shared=Grid), which puts the cells in shared memory once
+"""
+import argparse
+import json
+import random
+import sys
+from multiprocessing import Pool
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from aoc.grid import Grid  # noqa: E402
+from aoc.parallel import pmap  # noqa: E402
+
+
+def maze(size: int, seed: int = 1) -> str:
+    rng = random.Random(seed)
+    return "\n".join("".join("#" if rng.random() < 0.1 else "." for _ in range(size)) for _ in range(size)) + "\n"
+
+
+def walk(task: int, grid: Grid) -> int:
+    """Cells visited by a wall-following walk of 2000 steps with cell `task` blocked."""
+    cells = grid.cells
+    blocked = grid.index(*divmod(task % len(grid), grid.width))
+    offsets = grid.offsets()
+    pos, facing, seen = grid.index(grid.height // 2, grid.width // 2), 0, set()
+    for _ in range(2000):
+        nxt = pos + offsets[facing]
+        if nxt == blocked or cells[nxt] != 46:  # "."
+            facing = (facing + 1) % 4
+        else:
+            pos = nxt
+            seen.add(pos)
+    return len(seen)
+
+
+def naive_task(args: tuple[int, str]) -> int:
+    task, text = args
+    return walk(task, Grid(text))
+
+
+def timed(fn, repeat: int) -> tuple[float, object]:
+    runs, value = [], None
+    for _ in range(repeat):
+        start = perf_counter()
+        value = fn()
+        runs.append(perf_counter() - start)
+    return median(runs), value
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--size", type=int, default=141)
+    ap.add_argument("--tasks", type=int, default=2000)
+    ap.add_argument("--jobs", type=int, default=None)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--json", action="store_true")
+    args = ap.parse_args()
+
+    text = maze(args.size)
+    grid = Grid(text)
+    tasks = range(args.tasks)
+
+    def naive():
+        with Pool(args.jobs) as pool:
+            return pool.map(naive_task, [(t, text) for t in tasks])
+
+    cases = {
+        "serial": lambda: [walk(t, grid) for t in tasks],
+        "naive": naive,
+        "pmap": lambda: list(pmap(walk, tasks, shared=grid, jobs=args.jobs)),
+    }
+    results, expected = {}, None
+    for name, fn in cases.items():
+        seconds, value = timed(fn, args.repeat)
+        expected = value if expected is None else expected
+        assert value == expected, f"{name} disagrees"
+        results[name] = {"ms": seconds * 1000}
+    for r in results.values():
+        r["speedup"] = results["serial"]["ms"] / r["ms"]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{args.tasks} tasks on a {args.size}x{args.size} grid")
+    print(f"{'case':<8} {'time':>10} {'speedup':>8}")
+    for name, r in results.items():
+        print(f"{name:<8} {r['ms']:>8.1f}ms {r['speedup']:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""Compare aoc.search against hand-rolled searches over tuple states.
+
+    python benchmarks/bench_search.py [--input FILE | --year 2023 --day 17] [--repeat 5] [--json]
+
+The graph comes from a recorded puzzle input: a file, or the cached input
+of --year/--day (fetched once, then read from the cache). Digit cells are
+step costs and "#" cells are walls; anything else costs 1. Without an
+input, a random 141x141 digit grid is used. Cases, from the top-left to
+the bottom-right cell:
+
+    dijkstra    cheapest path over the cell costs
+    astar       the same, guided by the Manhattan distance
+    crucible    2023 day 17: move 1-3 cells, then turn; states pack (cell, axis)
+    bfs         fewest steps, ignoring costs
+    bidir       fewest steps, searching from both ends
+
+The hand-rolled side is the usual heapq over (cost, (row, col)) tuples with
+dict distances; aoc.search runs on flat Grid indices with size=... set.
+Graph construction (grid_graph) is reported separately.
+"""
+import argparse
+import heapq
+import json
+import random
+import sys
+from collections import deque
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from aoc import search  # noqa: E402
+from aoc.grid import Grid  # noqa: E402
+
+DIRS = ((-1, 0), (0, 1), (1, 0), (0, -1))
+
+
+def load(args: argparse.Namespace) -> str:
+    if args.input:
+        return Path(args.input).read_text()
+    if args.year and args.day:
+        from aoc import fetch_input
+
+        return fetch_input(args.year, args.day)
+    rng = random.Random(1)
+    return "\n".join("".join(rng.choice("123456789") for _ in range(141)) for _ in range(141)) + "\n"
+
+
+def weight(ch: str) -> int:
+    return int(ch) if ch.isdigit() else 1
+
+
+# ------------------------------
+# Hand-rolled
+# ------------------------------
+def tuple_dijkstra(rows: list[str], heuristic: bool = False) -> int:
+    h, w = len(rows), len(rows[0])
+    goal = (h - 1, w - 1)
+    dist = {(0, 0): 0}
+    heap = [(0, (0, 0))]
+    done = set()
+    while heap:
+        _, pos = heapq.heappop(heap)
+        if pos in done:
+            continue
+        done.add(pos)
+        if pos == goal:
+            return dist[pos]
+        for dr, dc in DIRS:
+            r, c = pos[0] + dr, pos[1] + dc
+            if 0 <= r < h and 0 <= c < w and rows[r][c] != "#":
+                nd = dist[pos] + weight(rows[r][c])
+                if nd < dist.get((r, c), float("inf")):
+                    dist[(r, c)] = nd
+                    f = nd + (goal[0] - r) + (goal[1] - c) if heuristic else nd
+                    heapq.heappush(heap, (f, (r, c)))
+    return -1
+
+
+def tuple_crucible(rows: list[str]) -> int:
+    h, w = len(rows), len(rows[0])
+    heap = [(0, 0, 0, 0), (0, 0, 0, 1)]
+    dist = {(0, 0, 0): 0, (0, 0, 1): 0}
+    done = set()
+    while heap:
+        d, r, c, axis = heapq.heappop(heap)
+        if (r, c, axis) in done:
+            continue
+        done.add((r, c, axis))
+        if (r, c) == (h - 1, w - 1):
+            return d
+        for sign in (1, -1):
+            nd, nr, nc = d, r, c
+            for _ in range(3):
+                nr, nc = (nr + sign, nc) if axis == 0 else (nr, nc + sign)
+                if not (0 <= nr < h and 0 <= nc < w) or rows[nr][nc] == "#":
+                    break
+                nd += weight(rows[nr][nc])
+                key = (nr, nc, 1 - axis)
+                if nd < dist.get(key, float("inf")):
+                    dist[key] = nd
+                    heapq.heappush(heap, (nd, nr, nc, 1 - axis))
+    return -1
+
+
+def tuple_bfs(rows: list[str]) -> int:
+    h, w = len(rows), len(rows[0])
+    dist = {(0, 0): 0}
+    queue = deque([(0, 0)])
+    while queue:
+        pos = queue.popleft()
+        if pos == (h - 1, w - 1):
+            return dist[pos]
+        for dr, dc in DIRS:
+            r, c = pos[0] + dr, pos[1] + dc
+            if 0 <= r < h and 0 <= c < w and rows[r][c] != "#" and (r, c) not in dist:
+                dist[(r, c)] = dist[pos] + 1
+                queue.append((r, c))
+    return -1
+
+
+# ------------------------------
+# aoc.search
+# ------------------------------
+def crucible_graph(grid: Grid, costs: bytes):
+    """States are cell * 2 + axis (0: next move is vertical, 1: horizontal)."""
+    free = [grid.cells[i] not in b"#\n" for i in range(len(grid.cells))]
+    table: list[tuple] = [()] * (2 * len(grid.cells))
+    for i in grid:
+        for axis, step in ((0, grid.stride), (1, 1)):
+            moves = []
+            for sign in (step, -step):
+                cost, j = 0, i
+                for _ in range(3):
+                    j += sign
+                    if not free[j]:
+                        break
+                    cost += costs[j]
+                    moves.append((j * 2 + 1 - axis, cost))
+            table[i * 2 + axis] = tuple(moves)
+    return table.__getitem__
+
+
+def timed(fn, repeat: int) -> tuple[float, object]:
+    runs, value = [], None
+    for _ in range(repeat):
+        start = perf_counter()
+        value = fn()
+        runs.append(perf_counter() - start)
+    return median(runs), value
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--input", help="File with a recorded grid input")
+    ap.add_argument("--year", type=int)
+    ap.add_argument("--day", type=int)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--json", action="store_true")
+    args = ap.parse_args()
+
+    grid = Grid(load(args))
+    for corner in ((0, 0), (grid.height - 1, grid.width - 1)):
+        if grid[corner] == "#":
+            grid[corner] = "."
+    rows = str(grid).splitlines()
+    costs = bytes(weight(chr(b)) if b != 10 else 0 for b in grid.cells)
+    size = len(grid.cells)
+    start, goal = grid.index(0, 0), grid.index(grid.height - 1, grid.width - 1)
+    gr, gc = grid.coords(goal)
+    stride = grid.stride
+
+    build = {}
+    build["weighted"], weighted = timed(lambda: search.grid_graph(grid, weights=costs), 1)
+    build["steps"], steps = timed(lambda: search.grid_graph(grid), 1)
+    build["crucible"], crucible = timed(lambda: crucible_graph(grid, costs), 1)
+
+    def manhattan(i: int) -> int:
+        return abs(i // stride - 1 - gr) + abs(i % stride - gc)
+
+    cases = {
+        "dijkstra": (lambda: tuple_dijkstra(rows),
+                     lambda: search.dijkstra(start, weighted, goal, size=size).cost),
+        "astar": (lambda: tuple_dijkstra(rows, heuristic=True),
+                  lambda: search.astar(start, weighted, goal, manhattan, size=size).cost),
+        "crucible": (lambda: tuple_crucible(rows),
+                     lambda: search.dijkstra((start * 2, start * 2 + 1), crucible,
+                                             lambda s: s >> 1 == goal, size=2 * size).cost),
+        "bfs": (lambda: tuple_bfs(rows),
+                lambda: search.bfs(start, steps, goal, size=size).cost),
+        "bidir": (lambda: tuple_bfs(rows),
+                  lambda: search.bidirectional_bfs(start, goal, steps, size=size)),
+    }
+
+    results = {}
+    for name, (baseline, fast) in cases.items():
+        (base, expected), (new, got) = timed(baseline, args.repeat), timed(fast, args.repeat)
+        assert expected == got, f"{name}: {expected} != {got}"
+        results[name] = {"answer": got, "tuples_ms": base * 1000, "search_ms": new * 1000, "speedup": base / new}
+
+    if args.json:
+        print(json.dumps({"build_ms": {k: v * 1000 for k, v in build.items()}, "cases": results}, indent=2))
+        return
+    print(f"{grid.height}x{grid.width} grid; graph build: "
+          + ", ".join(f"{k} {v * 1000:.1f}ms" for k, v in build.items()))
+    print(f"{'case':<10} {'answer':>8} {'tuples':>10} {'search':>10} {'speedup':>8}")
+    for name, r in results.items():
+        print(f"{name:<10} {r['answer']:>8} {r['tuples_ms']:>8.2f}ms {r['search_ms']:>8.2f}ms {r['speedup']:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Compare the HTTP transports of aoc.transport against a local stub server.
+
+    python benchmarks/bench_transport.py [--requests 200] [--size 20000] [--json]
+
+For every installed backend this measures:
+
+    import    time to import the backend library in a fresh interpreter
+    cold      first request of a new transport (connection setup included)
+    warm      later requests over the pooled connection
+    parallel  requests/s and MB/s with --threads threads sharing one transport
+
+The stub server speaks plain HTTP/1.1 on localhost, so httpx runs without
+HTTP/2 here (h2 needs TLS); numbers show client overhead, not network time.
+"""
+import argparse
+import json
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from aoc import transport  # noqa: E402
+
+MODULES = {"requests": "requests", "urllib3": "urllib3", "http.client": "http.client", "httpx": "httpx"}
+
+
+def _handler(body: bytes) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def import_cost(module: str, repeat: int = 5) -> float:
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    runs = [float(subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout)
+            for _ in range(repeat)]
+    return median(runs)
+
+
+def bench(name: str, url: str, count: int, threads: int) -> dict[str, float]:
+    cold = []
+    for _ in range(5):
+        t = transport.create(name)
+        start = perf_counter()
+        t.request("GET", url).content
+        cold.append(perf_counter() - start)
+        t.close()
+
+    t = transport.create(name)
+    t.request("GET", url).content
+    warm = []
+    for _ in range(count):
+        start = perf_counter()
+        t.request("GET", url).content
+        warm.append(perf_counter() - start)
+
+    size = len(t.request("GET", url).content)
+    start = perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(lambda _: t.request("GET", url).content, range(count)))
+    elapsed = perf_counter() - start
+    t.close()
+
+    return {
+        "import_ms": import_cost(MODULES[name]) * 1000,
+        "cold_ms": median(cold) * 1000,
+        "warm_ms": median(warm) * 1000,
+        "parallel_rps": count / elapsed,
+        "parallel_mbps": count * size / elapsed / 1e6,
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--requests", type=int, default=200, help="Warm and parallel requests per backend")
+    ap.add_argument("--size", type=int, default=20_000, help="Response body size in bytes (inputs are ~20 kB)")
+    ap.add_argument("--threads", type=int, default=8)
+    ap.add_argument("--json", action="store_true")
+    args = ap.parse_args()
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _handler(b"x" * args.size))
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{httpd.server_address[1]}/2023/day/1/input"
+
+    results = {}
+    for name in transport.BACKENDS:
+        try:
+            results[name] = bench(name, url, args.requests, args.threads)
+        except ImportError as exc:
+            print(f"skipping {name}: {exc}", file=sys.stderr)
+    httpd.shutdown()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'backend':<12} {'import':>9} {'cold':>9} {'warm':>9} {'req/s':>9} {'MB/s':>9}")
+    for name, r in results.items():
+        print(f"{name:<12} {r['import_ms']:>7.1f}ms {r['cold_ms']:>7.2f}ms {r['warm_ms']:>7.3f}ms "
+              f"{r['parallel_rps']:>9.0f} {r['parallel_mbps']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
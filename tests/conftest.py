@@ -0,0 +1,9 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Point the on-disk cache at a fresh directory for every test."""
+    path = tmp_path / "cache"
+    monkeypatch.setenv("AOC_CACHE_DIR", str(path))
+    return path
@@ -1,12 +1,19 @@
 import pytest
 from unittest.mock import patch
-from aoc.api import fetch_input, fetch_code, fetch_example, submit
-from aoc.errors import InputNotFoundError, WrongAnswerError, FormNotFoundError
+from aoc import cache
+from aoc.api import (fetch_input, fetch_code, fetch_example, fetch_description, fetch_stars, fetch_answers, submit,
+                     submit_batch, read_batch, prepare_submit, SubmitTarget)
+from aoc.errors import (InputNotFoundError, WrongAnswerError, WrongLevelError, FormNotFoundError, CooldownError,
+                        MissingCookieError)
 
 @patch("aoc.client.fetch_input", return_value="ABC")
 def test_fetch_input(mock_fetch):
     assert fetch_input(2023,1) == "ABC"
 
+@patch("aoc.client.fetch_input_bytes", return_value=b"ABC")
+def test_fetch_input_bytes(mock_fetch):
+    assert fetch_input(2023, 1, as_bytes=True) == b"ABC"
+
 @patch("aoc.client.fetch_page", return_value='<pre><code>AAA</code></pre>')
 def test_fetch_code_idx(mock_page):
     assert fetch_code(2023,1, idx=0) == "AAA"
@@ -62,3 +69,221 @@ def test_submit_wrong_answer(mock_submit_answer, mock_get_day_html):
 def test_submit_no_form(mock_get_day_html):
     with pytest.raises(FormNotFoundError):
         submit(1111, year=2023, day=1)
+
+CALENDAR = ('<a class="calendar-day1 calendar-verycomplete">1</a>'
+            '<a class="calendar-day2 calendar-complete">2</a>')
+
+@patch("aoc.client.fetch_calendar", return_value=CALENDAR)
+def test_fetch_stars_cached(mock_calendar):
+    assert fetch_stars(2023)[:3] == [2, 1, 0]
+    assert fetch_stars(2023)[:3] == [2, 1, 0]
+    assert mock_calendar.call_count == 1
+    fetch_stars(2023, refresh=True)
+    assert mock_calendar.call_count == 2
+
+@patch("aoc.client.fetch_page")
+@patch("aoc.client.submit_answer", return_value="<article><p>That's the right answer!</p></article>")
+def test_submit_uses_star_index(mock_submit, mock_page):
+    cache.save_stars(2023, [2, 1] + [0] * 23)
+    submit(1234, year=2023, day=2)
+    mock_page.assert_not_called()
+    assert mock_submit.call_args.args[3] == 2
+    assert cache.load_stars(2023)[:2] == [2, 2]
+
+@patch("aoc.client.fetch_page")
+@patch("aoc.client.submit_answer", return_value="<article><p>That's the right answer!</p></article>")
+def test_submit_with_level_skips_lookup(mock_submit, mock_page):
+    submit(1234, year=2023, day=3, level=2)
+    mock_page.assert_not_called()
+    assert mock_submit.call_args.args[3] == 2
+    with pytest.raises(ValueError):
+        submit(1234, year=2023, day=3, level=3)
+
+@patch("aoc.client.warm")
+def test_prepare_submit(mock_warm):
+    cache.save_stars(2023, [2, 1] + [0] * 23)
+    assert prepare_submit(2023, 2, cookie="c") == SubmitTarget(2023, 2, "c", 2)
+    mock_warm.assert_called_once()
+    with pytest.raises(FormNotFoundError):
+        prepare_submit(2023, 1, cookie="c")
+
+def test_submit_star_index_completed():
+    cache.save_stars(2023, [2] * 25)
+    with pytest.raises(FormNotFoundError):
+        submit(1234, year=2023, day=1)
+
+@patch("aoc.client.submit_answer", return_value="<article><p>You don't seem to be solving the right level.</p></article>")
+def test_submit_wrong_level_drops_index(mock_submit):
+    cache.save_stars(2023, [0] * 25)
+    with pytest.raises(WrongLevelError):
+        submit(1234, year=2023, day=1)
+    assert cache.load_stars(2023) is None
+
+@patch("aoc.client.fetch_page", return_value='<article class="day-desc"><p>Hello <em>there</em></p></article>')
+def test_fetch_description_cached(mock_page):
+    with patch("aoc.render.render_description", wraps=__import__("aoc.render").render.render_description) as mock_render:
+        first = fetch_description(2023, 1)
+        second = fetch_description(2023, 1)
+    assert first == second
+    assert "Hello" in first
+    assert mock_render.call_count == 1
+
+@patch("aoc.client.fetch_page", return_value="<p>Your puzzle answer was <code>55123</code>.</p>")
+def test_fetch_answers_cached(mock_page):
+    cache.save_stars(2023, [1] + [0] * 24)
+    assert fetch_answers(2023, 1) == ["55123"]
+    assert fetch_answers(2023, 1) == ["55123"]
+    assert mock_page.call_count == 1
+    assert fetch_answers(2023, 2) == []
+
+@patch("aoc.client.submit_answer", return_value="<article><p>That's the right answer!</p></article>")
+def test_submit_records_answer(mock_submit):
+    cache.save_stars(2023, [0] * 25)
+    submit(1234, year=2023, day=3)
+    assert cache.read_meta(2023, 3)["answers"] == ["1234"]
+
+CORRECT = "<article><p>That's the right answer!</p></article>"
+WRONG = "<article><p>That's not the right answer. Please wait one minute before trying again.</p></article>"
+TOO_SOON = "<article><p>You gave an answer too recently. You have 1m 5s left to wait.</p></article>"
+
+@patch("aoc.api.sleep")
+@patch("aoc.client.submit_answer")
+def test_submit_batch(mock_submit, mock_sleep, tmp_path):
+    cache.save_stars(2023, [2, 0, 0, 0] + [0] * 21)
+    batch = tmp_path / "answers.csv"
+    batch.write_text("year,day,part,answer\n2023,3,2,33\n2023,2,2,22\n2023,2,1,21\n2023,1,1,11\n2023,3,1,31\n")
+    log = tmp_path / "answers.log.jsonl"
+    mock_submit.side_effect = [CORRECT, TOO_SOON, CORRECT, WRONG]
+
+    results = submit_batch(batch, log=log, interval=0)
+    assert [(r.day, r.part, r.status) for r in results] == [
+        (1, 1, "solved"), (2, 1, "correct"), (2, 2, "correct"), (3, 1, "wrong"), (3, 2, "blocked")]
+    assert [c.args[:4] for c in mock_submit.call_args_list] == [
+        ("21", 2023, 2, 1), ("22", 2023, 2, 2), ("22", 2023, 2, 2), ("31", 2023, 3, 1)]
+    mock_sleep.assert_called_once_with(66.0)
+    assert cache.load_stars(2023)[:3] == [2, 2, 0]
+    assert cache.read_meta(2023, 2)["answers"] == ["21", "22"]
+
+    # Resuming skips settled entries and retries the blocked one
+    mock_submit.reset_mock()
+    results = submit_batch(batch, log=log, interval=0)
+    assert [(r.day, r.part, r.status) for r in results] == [(3, 2, "blocked")]
+    mock_submit.assert_not_called()
+    assert len(log.read_text().splitlines()) == 6
+
+def test_read_batch(tmp_path):
+    path = tmp_path / "a.csv"
+    path.write_text("# backfill\n2022,1,1,abc\n\n2022, 1, 2, def\n")
+    assert read_batch(path) == [(2022, 1, 1, "abc"), (2022, 1, 2, "def")]
+    path.write_text("answer,part,day,year\nx,1,5,2021\n")
+    assert read_batch(path) == [(2021, 5, 1, "x")]
+    path.write_text("2022,1,3,abc\n")
+    with pytest.raises(ValueError):
+        read_batch(path)
+
+@patch("aoc.client.submit_answer", return_value=TOO_SOON)
+def test_submit_too_soon(mock_submit):
+    cache.save_stars(2023, [0] * 25)
+    with pytest.raises(CooldownError) as info:
+        submit(1234, year=2023, day=1)
+    assert info.value.wait == 65
+
+PAGE = ('<article class="day-desc"><p>For example:</p><pre><code>1 2</code></pre></article>'
+        '<pre><code>other</code></pre><form><input type="hidden" name="level" value="1"></form>')
+
+@patch("aoc.client.fetch_input", return_value="1 2\n")
+@patch("aoc.client.fetch_page")
+def test_puzzle_memoizes_and_shares_page(mock_page, mock_input):
+    import threading
+    import time
+    from aoc import Puzzle
+
+    def slow_page(*args):
+        time.sleep(0.05)
+        return PAGE
+    mock_page.side_effect = slow_page
+
+    puzzle = Puzzle(2023, 1, cookie="cookie")
+    threads = [threading.Thread(target=lambda: puzzle.examples) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert puzzle.examples == ["1 2"]
+    assert puzzle.code_blocks == ["1 2", "other"]
+    assert puzzle.level == 1
+    assert list(puzzle.input.ints()) == [1, 2]
+    assert puzzle.input is puzzle.input
+    assert mock_page.call_count == 1
+
+@patch("aoc.client.submit_answer", return_value=CORRECT)
+@patch("aoc.client.fetch_input", return_value="1 2\n")
+@patch("aoc.client.fetch_page", return_value=PAGE)
+def test_puzzle_submit_refreshes_page_only(mock_page, mock_input, mock_submit):
+    from aoc import Puzzle
+
+    puzzle = Puzzle(2023, 1, cookie="cookie")
+    data = puzzle.input
+    assert puzzle.level == 1
+    assert puzzle.submit(3) == "That's the right answer!"
+    assert mock_submit.call_args.args[3] == 1
+
+    assert puzzle.input is data
+    assert puzzle.examples == ["1 2"]
+    assert mock_page.call_count == 2
+
+def test_puzzle_needs_cookie_for_input(monkeypatch):
+    from aoc import Puzzle
+
+    monkeypatch.delenv("AOC_COOKIE", raising=False)
+    with pytest.raises(MissingCookieError):
+        Puzzle(2023, 1).input
+
+
+PART1_PAGE = ('<article class="day-desc"><p>For example:</p><pre><code>p1</code></pre></article>'
+              '<p>Your puzzle answer was <code>7</code>.</p>')
+PART2_PAGE = PART1_PAGE + ('<article class="day-desc"><p>For example:</p><pre><code>p2</code></pre></article>'
+                           '<p>Your puzzle answer was <code>8</code>.</p>')
+
+
+@patch("aoc.client._request")
+def test_cached_page_refetched_after_part_solved_elsewhere(mock_request):
+    mock_request.return_value.content = PART2_PAGE.encode()
+    mock_request.return_value.text = PART2_PAGE
+    cache.write(2023, 9, "page", PART1_PAGE.encode())
+    assert fetch_example(2023, 9) == "p1"  # no star index: the cached page is used
+
+    cache.save_stars(2023, [0] * 8 + [2] + [0] * 16)  # part 2 solved in the browser
+    assert fetch_example(2023, 9) == "p1\np2"
+    assert "p2" in fetch_description(2023, 9, part=2)
+    assert mock_request.call_count == 1
+    assert cache.read(2023, 9, "page") == PART2_PAGE.encode()
+
+
+@patch("aoc.client.fetch_calendar", return_value=CALENDAR)
+def test_fetch_stars_refresh_drops_changed_pages(mock_calendar):
+    cache.save_stars(2023, [1] * 25)
+    cache.write(2023, 1, "page", PART1_PAGE.encode())
+    cache.write(2023, 2, "page", PART1_PAGE.encode())
+    fetch_stars(2023, refresh=True)
+    assert cache.read(2023, 1, "page") is None
+    assert cache.read(2023, 2, "page") is not None
+
+
+@patch("aoc.client._request")
+def test_fetch_description_refresh(mock_request):
+    mock_request.return_value.content = PART2_PAGE.encode()
+    mock_request.return_value.text = PART2_PAGE
+    cache.write(2023, 10, "page", PART1_PAGE.encode())
+    with pytest.raises(IndexError):
+        fetch_description(2023, 10, part=2)
+    assert "p2" in fetch_description(2023, 10, part=2, refresh=True)
+
+
+def test_fetch_input_cached_needs_no_cookie(monkeypatch):
+    monkeypatch.delenv("AOC_COOKIE", raising=False)
+    with pytest.raises(MissingCookieError):
+        fetch_input(2023, 11)
+    cache.write(2023, 11, "input", b"cached")
+    assert fetch_input(2023, 11) == "cached"
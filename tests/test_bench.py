@@ -0,0 +1,125 @@
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+
+from aoc import bench
+from aoc.cli import cli
+from aoc.runner import DayResult, PartResult
+
+
+def _results(seconds, day=1, input_hash="abc"):
+    return [DayResult(2023, day, "day01.py", [PartResult(1, "ok", "1", "1", seconds)], input_hash=input_hash)]
+
+
+def _record(commit, samples, **kwargs):
+    return bench.record([_results(s, **kwargs) for s in samples], commit)
+
+
+def test_mann_whitney():
+    assert bench.mann_whitney_p([1.0] * 5, [1.0] * 5) == 1.0
+    assert bench.mann_whitney_p([1, 2, 3, 4, 5], [6, 7, 8, 9, 10]) < 0.05
+    assert bench.mann_whitney_p([1, 3, 5, 7, 9], [2, 4, 6, 8, 10]) > 0.5
+    assert bench.mann_whitney_p([], [1.0]) == 1.0
+
+
+def test_iqr():
+    assert bench.iqr([1.0, 2.0, 3.0, 4.0, 5.0]) == 2.0
+    assert bench.iqr([1.0]) == 0.0
+
+
+def test_compare_detects_slowdown():
+    _record("aaa", [0.10, 0.11, 0.10, 0.12, 0.10])
+    _record("bbb", [0.20, 0.21, 0.19, 0.20, 0.22])
+    # Different input: never compared with the other runs
+    _record("bbb", [5.0], input_hash="other")
+
+    [c] = bench.compare()
+    assert (c.year, c.day, c.part) == (2023, 1, 1)
+    assert c.verdict == "slower"
+    assert c.change == pytest.approx(1.0)
+    assert bench.regressions([c], 0.5) == [c]
+    assert bench.regressions([c], 1.5) == []
+
+    [c] = bench.compare("bbb", against="aaa")
+    assert c.verdict == "faster"
+
+
+def test_compare_noise_is_same():
+    _record("aaa", [0.10, 0.12, 0.11])
+    _record("bbb", [0.11, 0.10, 0.12])
+    [c] = bench.compare("aaa")
+    assert c.verdict == "same"
+
+
+def test_compare_keeps_dirty_runs_apart():
+    _record("aaa1", [0.10, 0.11, 0.10])
+    _record("aaa1-dirty", [5.0])  # uncommitted experiment on top of aaa1
+    _record("bbb2", [0.10, 0.12, 0.11])
+
+    [c] = bench.compare("aaa", against="bbb2")
+    assert c.base == [0.10, 0.11, 0.10]
+    [c] = bench.compare("aaa1-dirty", against="aaa1")
+    assert c.base == [5.0] and c.new == [0.10, 0.11, 0.10]
+
+
+def test_compare_without_history():
+    with pytest.raises(ValueError):
+        bench.compare()
+    _record("aaa", [0.1])
+    with pytest.raises(ValueError):
+        bench.compare()
+
+
+def test_record_skips_failed_parts():
+    results = [DayResult(2023, 1, "day01.py", [PartResult(1, "error", error="boom"), PartResult(2, "missing")])]
+    run_id = bench.record([results], "aaa")
+    count = bench.connect().execute("SELECT COUNT(*) FROM timings WHERE run_id = ?", (run_id,)).fetchone()[0]
+    assert count == 0
+
+
+def test_cli_compare_exit_code():
+    _record("aaa", [0.10, 0.11, 0.10, 0.12, 0.10])
+    _record("bbb", [0.20, 0.21, 0.19, 0.20, 0.22])
+
+    result = CliRunner().invoke(cli, ["bench", "compare", "aaa", "--threshold", "50"])
+    assert result.exit_code == 1
+    assert "slower" in result.output
+
+    result = CliRunner().invoke(cli, ["bench", "compare", "aaa", "--threshold", "200"])
+    assert result.exit_code == 0
+
+
+@patch("aoc.bench.git_commit", return_value="ccc")
+@patch("aoc.runner.run_year", return_value=_results(0.1))
+def test_cli_bench_run(mock_run, mock_commit, tmp_path):
+    result = CliRunner().invoke(cli, ["bench", "run", "-y", "2023", "-P", str(tmp_path), "--repeat", "3"])
+    assert result.exit_code == 0, result.output
+    assert mock_run.call_count == 3
+    assert bench.recent_commits(bench.connect()) == ["ccc"]
+
+
+def test_memory_rows_excluded_from_timings():
+    _record("aaa", [0.10, 0.11, 0.10])
+    _record("bbb", [0.10, 0.11, 0.10])
+    traced = _results(9.0)
+    traced[0].parts[0].peak_memory = 1234
+    bench.record([traced], "bbb")
+
+    [c] = bench.compare("aaa")
+    assert max(c.new) < 1
+    peak = bench.connect().execute("SELECT peak_memory FROM timings WHERE peak_memory IS NOT NULL").fetchone()
+    assert peak == (1234,)
+
+
+def test_migrates_old_database(tmp_path):
+    path = tmp_path / "old.sqlite3"
+    conn = sqlite3.connect(path)
+    conn.executescript(bench._SCHEMA)
+    conn.close()
+
+    conn = bench.connect(path)
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(timings)")]
+    assert "peak_memory" in columns
+    bench.connect(path)  # already migrated
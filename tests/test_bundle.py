@@ -0,0 +1,66 @@
+import pytest
+from unittest.mock import patch
+
+from aoc import bundle, cache, client
+from aoc.errors import BundleError
+
+
+def _fill_cache():
+    cache.write(2023, 1, "input", b"1abc2\npqr3stu8vwx\n")
+    cache.write(2023, 1, "page", b"<article>Day 1</article>")
+    cache.write(2023, 2, "input", b"Game 1: 3 blue\n")
+    cache.save_stars(2023, [1] + [0] * 24)
+
+
+def test_bundle_roundtrip(tmp_path):
+    _fill_cache()
+    path = tmp_path / "aoc.bundle"
+    assert bundle.export_cache(path) == 4
+
+    for use_mmap in (False, True):
+        with bundle.Bundle(path, use_mmap=use_mmap) as b:
+            assert b.read(2023, 2, "input") == b"Game 1: 3 blue\n"
+            assert b.read(2023, 1, "page") == b"<article>Day 1</article>"
+            assert b.read(2023, 3, "input") is None
+
+
+def test_bundle_export_years(tmp_path):
+    _fill_cache()
+    cache.write(2022, 1, "input", b"x")
+    path = tmp_path / "aoc.bundle"
+    bundle.export_cache(path, years=[2022])
+    with bundle.Bundle(path) as b:
+        assert "2022/1/input" in b
+        assert "2023/1/input" not in b
+
+
+def test_bundle_import(tmp_path, monkeypatch):
+    _fill_cache()
+    path = tmp_path / "aoc.bundle"
+    bundle.export_cache(path)
+
+    monkeypatch.setenv("AOC_CACHE_DIR", str(tmp_path / "other"))
+    assert bundle.import_bundle(path) == 4
+    assert cache.read(2023, 1, "input") == b"1abc2\npqr3stu8vwx\n"
+    assert cache.load_stars(2023)[0] == 1
+    # Already cached entries are kept
+    assert bundle.import_bundle(path) == 0
+
+
+def test_bundle_invalid(tmp_path):
+    path = tmp_path / "not.bundle"
+    path.write_bytes(b"hello world, not a bundle")
+    with pytest.raises(BundleError):
+        bundle.Bundle(path)
+
+
+@patch("requests.Session.request", side_effect=AssertionError("no network"))
+def test_client_serves_from_mounted_bundle(_mock_get, tmp_path, monkeypatch):
+    _fill_cache()
+    path = tmp_path / "aoc.bundle"
+    bundle.export_cache(path)
+
+    monkeypatch.setenv("AOC_CACHE_DIR", str(tmp_path / "empty"))
+    monkeypatch.setenv("AOC_BUNDLE", str(path))
+    assert client.fetch_input(2023, 1, "cookie") == "1abc2\npqr3stu8vwx\n"
+    assert client.fetch_page(2023, 1) == "<article>Day 1</article>"
@@ -1,14 +1,28 @@
+import json
 import pytest
 from click.testing import CliRunner
+import io
+import threading
 from unittest.mock import patch
 from aoc.cli import cli
 from aoc import config
+from aoc.api import SubmitTarget
+from aoc.errors import InputNotFoundError
 
 @pytest.fixture
 def runner():
     return CliRunner()
 
-@patch("aoc.api.fetch_input", return_value="INPUT")
+@pytest.fixture(autouse=True)
+def prepare_submit():
+    with patch("aoc.api.prepare_submit", return_value=SubmitTarget(2023, 5, "c", 1)) as mock:
+        yield mock
+
+def _stream_input(sink, **kwargs):
+    sink.write(b"INPUT")
+    return 5
+
+@patch("aoc.api.stream_input", side_effect=_stream_input)
 def test_cli_fetch_input(mock_fetch, runner):
     result = runner.invoke(cli, ["fetch", "input", "--year", "2023", "--day", "5"])
     assert result.exit_code == 0
@@ -31,6 +45,7 @@ def test_cli_submit_single(mock_submit, runner):
     result = runner.invoke(cli, ["submit", "1234", "--year", "2023", "--day", "5"])
     assert result.exit_code == 0
     assert "OK" in result.output
+    assert mock_submit.call_args.kwargs["level"] == 1
 
 @patch("aoc.api.submit", return_value="First OK\nSecond OK")
 def test_cli_submit_two(mock_submit, runner):
@@ -54,6 +69,53 @@ def test_cli_submit_two_stdin(mock_submit, runner):
     assert result.exit_code == 0
     assert "First OK\nSecond OK" in result.output
 
+class _SlowStdin(io.BytesIO):
+    """stdin that only delivers once the level lookup has started."""
+
+    def __init__(self, data, started):
+        super().__init__(data)
+        self.started = started
+
+    def read(self, size=-1):
+        if size:
+            assert self.started.wait(5)
+        return super().read(size)
+
+    read1 = read
+
+    def readinto(self, buf):
+        assert self.started.wait(5)
+        return super().readinto(buf)
+
+@patch("aoc.api.submit", return_value="OK")
+def test_cli_submit_prepares_while_reading_stdin(mock_submit, runner, prepare_submit):
+    started = threading.Event()
+    calls = []
+
+    def prepare(**kwargs):
+        calls.append(threading.current_thread())
+        started.set()
+        return SubmitTarget(2023, 5, "c", 2)
+
+    def submit(*args, **kwargs):
+        calls.append(threading.current_thread())
+        return "OK"
+
+    prepare_submit.side_effect = prepare
+    mock_submit.side_effect = submit
+    result = runner.invoke(cli, ["submit", "--year", "2023", "--day", "5"],
+                           input=_SlowStdin(b"1234\n", started))
+    assert result.exit_code == 0
+    assert prepare_submit.call_args.kwargs == {"year": 2023, "day": 5, "cookie": None}
+    assert mock_submit.call_args.kwargs["level"] == 2
+    assert calls[0] is calls[1]  # the POST reuses the worker's connection
+
+@patch("aoc.api.prepare_submit", side_effect=InputNotFoundError("nope"))
+def test_cli_submit_prepare_error(mock_prepare, runner):
+    result = runner.invoke(cli, ["submit", "1234", "--year", "2023", "--day", "5"])
+    assert result.exit_code == 4
+    assert "nope" in result.output
+
 def test_cli_submit_no_answers(runner):
     result = runner.invoke(cli, ["submit", "--year", "2023", "--day", "5"])
     assert result.exit_code == 2
@@ -69,7 +131,7 @@ def test_cli_submit_three_stdin(runner):
     assert result.exit_code == 2
     assert "Too many answers" in result.output
 
-@patch("aoc.api.fetch_input", return_value="INPUT")
+@patch("aoc.api.stream_input", side_effect=_stream_input)
 def test_cli_fetch_input_today(mock_fetch, runner):
     result = runner.invoke(cli, ["fetch", "input", "--date", "today"])
     assert result.exit_code == 0
@@ -80,3 +142,116 @@ def test_cli_submit_today(mock_submit, runner):
     result = runner.invoke(cli, ["submit", "1234", "--date", "today"])
     assert result.exit_code == 0
     assert "OK" in result.output
+
+@patch("aoc.api.fetch_stars", return_value=[2, 1] + [0] * 23)
+def test_cli_status(mock_stars, runner):
+    result = runner.invoke(cli, ["status", "--year", "2023"])
+    assert result.exit_code == 0
+    assert " 1 **\n 2 *\n 3\n" in result.output
+    assert "3/50 stars" in result.output
+
+@patch("aoc.bundle.export_cache", return_value=3)
+def test_cli_export(mock_export, runner, tmp_path):
+    result = runner.invoke(cli, ["export", str(tmp_path / "aoc.bundle"), "--year", "2023"])
+    assert result.exit_code == 0
+    assert "exported 3 entries" in result.output
+    assert mock_export.call_args.kwargs["years"] == (2023,)
+
+@patch("aoc.api.stream_input", side_effect=_stream_input)
+def test_cli_profile(mock_fetch, runner, tmp_path):
+    path = tmp_path / "trace.json"
+    result = runner.invoke(cli, ["--profile", str(path), "--profile-format", "json",
+                                 "fetch", "input", "--year", "2023", "--day", "5"])
+    assert result.exit_code == 0
+    assert "spans" in json.loads(path.read_text())
+
+@patch("aoc.api.fetch_description", return_value="--- Day 5 ---\n")
+def test_cli_show(mock_show, runner):
+    result = runner.invoke(cli, ["show", "--year", "2023", "--day", "5", "--part", "1", "--width", "60"])
+    assert result.exit_code == 0
+    assert result.output == "--- Day 5 ---\n"
+    assert mock_show.call_args.kwargs["width"] == 60
+
+@patch("aoc.api.stream_input", side_effect=InputNotFoundError("Could not fetch puzzle input: 404"))
+def test_cli_fetch_input_error(mock_fetch, runner):
+    result = runner.invoke(cli, ["fetch", "input", "--year", "2023", "--day", "5"])
+    assert result.exit_code == 1
+    assert "404" in result.output
+
+def test_cli_run_requires_days(runner):
+    result = runner.invoke(cli, ["run", "--year", "2023"])
+    assert result.exit_code == 2
+
+
+@patch("aoc.runner.run_year", return_value=[])
+def test_cli_run_no_solvers(mock_run, runner, tmp_path):
+    result = runner.invoke(cli, ["run", "--year", "2023", "--all", "--path", str(tmp_path)])
+    assert result.exit_code == 1
+    assert mock_run.call_args.kwargs["days"] is None
+    assert mock_run.call_args.kwargs["incremental"] is True
+    runner.invoke(cli, ["run", "--year", "2023", "--day", "1", "--force", "--path", str(tmp_path)])
+    assert mock_run.call_args.kwargs["incremental"] is False
+
+
+@patch("aoc.stress.stress")
+def test_cli_stress(mock_stress, runner, tmp_path):
+    from aoc.stress import Fit, StressPoint, StressResult
+
+    mock_stress.return_value = StressResult(2023, 9, "day09.py", "input", "300 lines",
+                                            [StressPoint("1x", 1000, [{"part": 1, "seconds": 0.5, "answer": "1"}])],
+                                            {1: Fit(1.98, "O(n^2)", 4), 2: None})
+    result = runner.invoke(cli, ["stress", "-y", "2023", "-d", "9", "-P", str(tmp_path), "-f", "3"])
+    assert result.exit_code == 0
+    assert mock_stress.call_args.kwargs["factors"] == (3.0,)
+    assert "Part 1: time ~ n^1.98, closest to O(n^2)" in result.output
+    result = runner.invoke(cli, ["stress", "-y", "2023", "-d", "9", "-P", str(tmp_path), "--json"])
+    assert json.loads(result.output)["fits"]["1"]["model"] == "O(n^2)"
+
+@patch("aoc.scaffold.new")
+def test_cli_new(mock_new, runner, tmp_path):
+    from aoc.scaffold import NewPuzzle
+
+    mock_new.return_value = NewPuzzle(tmp_path / "day01.py", tmp_path / "day01.json", True, ["ex"], ["142"], 10)
+    result = runner.invoke(cli, ["new", "2023", "1", "--path", str(tmp_path)])
+    assert result.exit_code == 0
+    assert "1 examples, expected 142" in result.output
+    assert mock_new.call_args.args == (2023, 1)
+
+
+@patch("aoc.api.submit_batch")
+def test_cli_submit_batch(mock_batch, runner, tmp_path):
+    from aoc.api import BatchResult
+
+    path = tmp_path / "answers.csv"
+    path.write_text("2023,1,1,11\n")
+    mock_batch.return_value = [BatchResult(2023, 1, 1, "11", "wrong", "too low")]
+    result = runner.invoke(cli, ["submit", "--batch", str(path)])
+    assert result.exit_code == 1
+    assert "1 wrong" in result.output
+    assert mock_batch.call_args.kwargs["log"] == f"{path}.log.jsonl"
+
+    result = runner.invoke(cli, ["submit", "123", "--batch", str(path)])
+    assert result.exit_code == 2
+
+PAGE = ('<p>For example:</p><pre><code>A</code></pre><p>x</p><pre><code>B</code></pre>'
+        '<p>For example:</p><pre><code>C</code></pre>')
+
+@patch("aoc.client.fetch_page", return_value=PAGE)
+def test_cli_fetch_code_multiple_indices(mock_page, runner):
+    result = runner.invoke(cli, ["fetch", "code", "-y", "2023", "-d", "5", "-i", "0,1:3", "-s", "|"])
+    assert result.exit_code == 0
+    assert result.output == "A|B|C\n"
+
+    result = runner.invoke(cli, ["fetch", "code", "-y", "2023", "-d", "5", "-i", "2,0", "-0"])
+    assert result.output == "C\0A\0"
+
+    result = runner.invoke(cli, ["fetch", "example", "-y", "2023", "-d", "5", "-i", "1:", "--json"])
+    assert result.exit_code == 0
+    [block] = json.loads(result.output)
+    assert (block["index"], block["block"], block["text"]) == (1, 2, "C")
+    assert mock_page.call_count == 3  # one page fetch per command
+
+def test_cli_fetch_code_bad_index(runner):
+    result = runner.invoke(cli, ["fetch", "code", "-y", "2023", "-d", "5", "-i", "1:x"])
+    assert result.exit_code == 2
+    assert "Invalid index" in result.output
@@ -0,0 +1,153 @@
+import io
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from aoc import cache, client, transport
+from aoc.errors import HTTPError, InputNotFoundError, NetworkError, NotUnlockedError, ServerError
+
+
+def _response(body: bytes, status: int = 200):
+    resp = MagicMock()
+    resp.status_code = status
+    resp.ok = status < 400
+    resp.content = body
+    resp.request.body = None
+    resp.iter_content.side_effect = lambda size: (body[i:i + size] for i in range(0, len(body), size))
+    resp.__enter__.return_value = resp
+    if status >= 400:
+        resp.raise_for_status.side_effect = requests.HTTPError(f"{status} Error")
+    return resp
+
+
+@pytest.fixture(autouse=True)
+def no_throttle(monkeypatch):
+    monkeypatch.setenv("AOC_RATE", "0")
+
+
+@patch("requests.Session.request")
+def test_stream_input_writes_sink_and_cache(mock_request, monkeypatch):
+    monkeypatch.setattr(client, "CHUNK_SIZE", 4)
+    body = b"1abc2\npqr3stu8vwx\n"
+    mock_request.return_value = _response(body)
+    sink = io.BytesIO()
+
+    assert client.stream_input(2023, 1, "cookie", sink) == len(body)
+    assert sink.getvalue() == body
+    assert cache.read(2023, 1, "input") == body
+    assert mock_request.call_args.kwargs["stream"] is True
+
+    # Served from the cache afterwards
+    sink = io.BytesIO()
+    client.stream_input(2023, 1, "cookie", sink)
+    assert sink.getvalue() == body
+    assert mock_request.call_count == 1
+
+
+@patch("requests.Session.request")
+def test_stream_input_error_leaves_no_cache(mock_request):
+    mock_request.return_value = _response(b"Please don't repeatedly request this endpoint", status=404)
+    with pytest.raises(HTTPError) as info:
+        client.stream_input(2023, 25, "cookie", io.BytesIO())
+    assert info.value.status == 404
+    assert cache.read(2023, 25, "input") is None
+
+
+@patch("requests.Session.request")
+def test_fetch_input_bytes_and_text(mock_request):
+    mock_request.return_value = _response(b"42\n")
+    assert client.fetch_input_bytes(2023, 2, "cookie") == b"42\n"
+    assert client.fetch_input(2023, 2, "cookie") == "42\n"
+    assert mock_request.call_count == 1
+
+
+class FakeTransport(transport.Transport):
+    """Replays (status, body, headers, delay) tuples, one per request."""
+
+    def __init__(self, *replies):
+        super().__init__()
+        self.replies = list(replies)
+        self.calls = []
+
+    def request(self, method, url, headers=None, body=None, stream=False):
+        self.calls.append((method, url))
+        reply = self.replies.pop(0)
+        if isinstance(reply[0], Exception):
+            raise reply[0]
+        status, content, headers, delay = (*reply, None, None)[:4]
+        time.sleep(delay or 0)
+        return transport.Response(status, headers or {}, 0.0, iter, lambda: None, content)
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    def install(*replies):
+        t = FakeTransport(*replies)
+        monkeypatch.setattr(transport, "_default", t)
+        return t
+    return install
+
+
+@patch("aoc.client.sleep")
+def test_retries_transient_errors(mock_sleep, fake):
+    t = fake((503, b""), (NetworkError("reset"),), (429, b"", {"Retry-After": "7"}), (200, b"ok"))
+    assert client.fetch_calendar(2023, "cookie") == "ok"
+    assert len(t.calls) == 4
+    assert mock_sleep.call_count == 3
+    assert mock_sleep.call_args_list[2].args[0] >= 7
+
+
+@patch("aoc.client.sleep")
+def test_retry_gives_up(mock_sleep, fake, monkeypatch):
+    monkeypatch.setenv("AOC_RETRIES", "2")
+    fake((500, b""), (502, b""), (200, b""))
+    with pytest.raises(ServerError) as info:
+        client.fetch_calendar(2023, "cookie")
+    assert info.value.status == 502
+
+
+@patch("aoc.client.sleep")
+def test_post_not_retried_on_server_error(mock_sleep, fake):
+    t = fake((500, b""), (200, b""))
+    with pytest.raises(ServerError):
+        client.submit_answer("1", 2023, 1, 1, "cookie")
+    assert len(t.calls) == 1
+
+    t = fake((429, b""), (200, b"done"))
+    assert client.submit_answer("1", 2023, 1, 1, "cookie") == "done"
+    assert len(t.calls) == 2
+
+
+def test_not_unlocked(fake):
+    fake((404, b"Please don't repeatedly request this endpoint before it unlocks!"))
+    with pytest.raises(NotUnlockedError) as info:
+        client.fetch_input(2999, 1, "cookie")
+    assert info.value.unlocks_at == client.unlock_time(2999, 1)
+    assert isinstance(info.value, InputNotFoundError)
+
+    fake((404, b""))
+    with pytest.raises(HTTPError) as info:
+        client.fetch_input(2015, 1, "cookie")
+    assert type(info.value) is HTTPError
+
+    for day in (0, 26, 32):  # not puzzles; December has no day 32
+        fake((404, b""))
+        with pytest.raises(HTTPError) as info:
+            client.fetch_input(2999, day, "cookie")
+        assert type(info.value) is HTTPError
+
+
+def test_hedged_get(fake, monkeypatch):
+    monkeypatch.setenv("AOC_HEDGE", "0.05")
+    t = fake((200, b"slow", {}, 0.5), (200, b"fast"))
+    start = time.perf_counter()
+    assert client.fetch_calendar(2023, "cookie") == "fast"
+    assert time.perf_counter() - start < 0.4
+    assert len(t.calls) == 2
+
+    # Fast responses are not duplicated
+    t = fake((200, b"quick"))
+    assert client.fetch_calendar(2024, "cookie") == "quick"
+    assert len(t.calls) == 1
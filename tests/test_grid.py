@@ -0,0 +1,120 @@
+import random
+from collections import deque
+
+import pytest
+
+from aoc.grid import Grid
+
+MAZE = """\
+#########
+#S..#...#
+#.#.#.#.#
+#.#...#E#
+#########
+"""
+
+
+def _dict_distances(text, start, diagonal=False):
+    grid = {(r, c): ch for r, row in enumerate(text.splitlines()) for c, ch in enumerate(row)}
+    steps = [(-1, 0), (0, 1), (1, 0), (0, -1)] + ([(-1, -1), (-1, 1), (1, 1), (1, -1)] if diagonal else [])
+    dist = {start: 0}
+    queue = deque([start])
+    while queue:
+        r, c = pos = queue.popleft()
+        for dr, dc in steps:
+            nxt = (r + dr, c + dc)
+            if grid.get(nxt, "#") != "#" and nxt not in dist:
+                dist[nxt] = dist[pos] + 1
+                queue.append(nxt)
+    return dist
+
+
+def test_layout_and_access():
+    grid = Grid(MAZE)
+    assert (grid.height, grid.width) == (5, 9)
+    assert str(grid) == MAZE
+    start = grid.find("S")[0]
+    assert grid.coords(start) == (1, 1)
+    assert grid.index(1, 1) == start
+    assert grid[start] == grid[1, 1] == "S"
+    assert sorted(grid.neighbors(start)) == sorted([grid.index(0, 1), grid.index(1, 2), grid.index(2, 1),
+                                                    grid.index(1, 0)])
+    assert (4, 8) in grid and (5, 0) not in grid
+    with pytest.raises(IndexError):
+        grid.index(0, 9)
+
+    grid[1, 2] = "x"
+    assert grid[start + 1] == "x"
+
+
+def test_corner_neighbors_stay_on_grid():
+    grid = Grid("ab\ncd\n")
+    assert sorted(grid[j] for j in grid.neighbors(grid.index(0, 0), diagonal=True)) == ["b", "c", "d"]
+    assert sorted(grid[j] for j in grid.neighbors(grid.index(1, 1))) == ["b", "c"]
+
+
+def test_views_share_the_buffer():
+    grid = Grid(MAZE)
+    assert bytes(grid.row(1)) == b"#S..#...#"
+    assert grid.column(1).tobytes() == b"#S..#"
+    grid.column(1)[2] = ord("o")
+    assert grid[2, 1] == "o"
+    assert grid.count("#") == MAZE.count("#")
+    assert grid.count(".E") == MAZE.count(".")  # one "." is now "o"
+    assert [grid.coords(i) for i in grid.find("SE")] == [(1, 1), (3, 7)]
+    mask = grid.mask("E")
+    assert sum(mask) == 1 and mask[grid.index(3, 7)] == 1
+
+
+def test_array_view():
+    pytest.importorskip("numpy")
+    grid = Grid(MAZE)
+    arr = grid.array
+    assert arr.shape == (5, 9)
+    assert (arr == ord("#")).sum() == grid.count("#")
+    arr[1, 2] = ord("x")
+    assert grid[1, 2] == "x"
+
+
+def test_searches():
+    grid = Grid(MAZE)
+    start, end = grid.find("S")[0], grid.find("E")[0]
+    dist = grid.bfs(start)
+    assert dist[end] == 12
+    assert dist[grid.index(0, 0)] == -1
+    assert grid.distance(start, end) == 12
+    assert grid.distance(start, (0, 0)) == -1
+    assert grid.distance(start, start) == 0
+    assert len(grid.flood_fill(start, walls="#")) == MAZE.count(".") + 2
+    assert grid.flood_fill(start) == [start]  # only "S" cells
+
+
+@pytest.mark.parametrize("diagonal", [False, True])
+def test_search_matches_dict_bfs(diagonal):
+    rng = random.Random(7)
+    text = "\n".join("".join("#" if rng.random() < 0.3 else "." for _ in range(40)) for _ in range(30))
+    grid = Grid(text)
+    start = grid.index(15, 20)
+    grid[start] = "."
+    expected = _dict_distances(str(grid), (15, 20), diagonal)
+
+    dist = grid.bfs(start, diagonal=diagonal)
+    assert {grid.coords(i): d for i, d in enumerate(dist) if d >= 0} == expected
+    assert sorted(grid.coords(i) for i in grid.flood_fill(start, walls="#", diagonal=diagonal)) == sorted(expected)
+    far = max(expected, key=expected.get)
+    assert grid.distance(start, far, diagonal=diagonal) == expected[far]
+
+
+def test_wrap():
+    grid = Grid("S.#.\n####\n", wrap=True)
+    start = grid.index(0, 0)
+    assert grid.distance(start, (0, 3)) == 1
+    assert grid.flood_fill((0, 1)) == [grid.index(0, 1)]
+    assert sorted(grid.coords(i) for i in grid.flood_fill((0, 3), walls="#")) == [(0, 0), (0, 1), (0, 3)]
+    assert grid.bfs(start)[grid.index(0, 1)] == 1
+    assert len(grid.neighbors(start, diagonal=True)) == 8
+
+
+def test_not_rectangular():
+    with pytest.raises(ValueError):
+        Grid("#.#\n.#\n")
@@ -0,0 +1,151 @@
+import os
+from array import array
+from unittest.mock import Mock
+
+import pytest
+
+from aoc import cache, memoize
+from aoc.memoize import memo
+from aoc.puzzle_input import PuzzleInput
+
+CALLS = []
+
+
+@memo
+def parse(data, scale=1):
+    CALLS.append(data)
+    return {"rows": data.split(), "scale": scale, "table": bytearray(b"xyz") * scale}
+
+
+@pytest.fixture(autouse=True)
+def reset():
+    CALLS.clear()
+
+
+def test_hit_after_miss(cache_dir):
+    first = parse("a b c")
+    assert parse("a b c") == first
+    assert len(CALLS) == 1
+    parse("a b c", scale=2)
+    parse("a b")
+    assert len(CALLS) == 3
+    assert len(list((cache_dir / "memo" / parse.memo_name).glob("*.pkl"))) == 3
+
+
+def test_puzzle_input_keys_by_text():
+    text = PuzzleInput("1 2\n3 4\n")
+    parse(text)
+    text.lines  # cached views are not part of the key
+    parse(text)
+    parse(str(text))
+    assert len(CALLS) == 1
+
+
+def test_run_input_is_part_of_the_key():
+    with memoize.using_input("input one"):
+        parse("x")
+        parse("x")
+    with memoize.using_input("input two"):
+        parse("x")
+    assert len(CALLS) == 2
+
+
+def test_year_day_fetch_input(monkeypatch):
+    monkeypatch.delenv("AOC_COOKIE", raising=False)  # a stored input needs no cookie
+    memoize._fetched.clear()
+    cache.write(2023, 5, "input", b"seeds: 1 2")
+
+    @memo(year=2023, day=5)
+    def table():
+        CALLS.append(1)
+        return array("q", range(10))
+
+    assert table() == table() == array("q", range(10))
+    assert len(CALLS) == 1
+    cache.write(2023, 5, "input", b"seeds: 3 4")
+    memoize._fetched.clear()
+    table()
+    assert len(CALLS) == 2
+
+
+def test_unreadable_input_is_not_memoized(monkeypatch):
+    monkeypatch.setenv("AOC_COOKIE", "x")
+    memoize._fetched.clear()
+    fetch = Mock(side_effect=[OSError("offline"), "seeds: 5 6"])
+    monkeypatch.setattr("aoc.api.fetch_input", fetch)
+
+    @memo(year=2023, day=6)
+    def table():
+        CALLS.append(1)
+        return [1, 2]
+
+    table()  # the input cannot be read: computed, not stored
+    table()  # the failure was not kept: fetched again and stored
+    table()
+    assert len(CALLS) == 2 and fetch.call_count == 2
+
+
+def test_out_of_band_buffers_are_mapped():
+    np = pytest.importorskip("numpy")
+
+    @memo
+    def arrays(n):
+        return {"a": np.arange(n), "b": np.ones((n, n))}
+
+    @memo
+    def plain(n):
+        return np.arange(n, dtype=np.int32)
+
+    fresh = arrays(100)
+    loaded = arrays(100)
+    assert (loaded["a"] == fresh["a"]).all() and loaded["b"].shape == (100, 100)
+    assert not loaded["a"].flags.writeable  # a view of the mapped file, not a copy
+    assert loaded["b"].ctypes.data % memoize.ALIGN == 0
+    plain(5)
+    again = plain(5)
+    assert isinstance(again, np.memmap) and list(again) == [0, 1, 2, 3, 4]
+
+
+def test_unpicklable_is_not_memoized():
+    @memo
+    def make(n):
+        CALLS.append(n)
+        return lambda: n
+
+    assert make(1)() == 1 and make(1)() == 1
+    assert len(CALLS) == 2
+
+
+def test_corrupt_entry_is_recomputed(cache_dir):
+    parse("q")
+    (path,) = (cache_dir / "memo" / parse.memo_name).glob("*.pkl")
+    path.write_bytes(b"garbage")
+    assert parse("q")["rows"] == ["q"]
+    assert len(CALLS) == 2
+
+
+def test_eviction_drops_least_recently_used(cache_dir, monkeypatch):
+    for text in ("a", "b", "c"):
+        parse(text)
+    paths = sorted((cache_dir / "memo" / parse.memo_name).glob("*.pkl"), key=os.path.getmtime)
+    for age, path in enumerate(paths):
+        os.utime(path, (1000 + age, 1000 + age))
+    parse("a")  # a hit: now the most recently used
+    size = paths[0].stat().st_size
+    assert memoize.evict(2 * size) == 1
+    assert len(list(paths[0].parent.glob("*.pkl"))) == 2
+    parse("a")
+    assert len(CALLS) == 3
+
+    monkeypatch.setenv("AOC_MEMO_MAX_MB", "0")  # disabled
+    parse("a")
+    assert len(CALLS) == 4
+
+
+def test_clear(cache_dir):
+    parse("a")
+    memoize.clear(parse)
+    parse("a")
+    assert len(CALLS) == 2
+    memoize.clear()
+    assert not (cache_dir / "memo").exists()
@@ -0,0 +1,82 @@
+import sys
+
+import pytest
+
+from aoc import parallel, runner
+from aoc.grid import Grid
+from aoc.parallel import pmap
+
+
+def square(n):
+    return n * n
+
+
+def count_at(offset, data):
+    return bytes(data[offset:offset + 3]).count(b"#")
+
+
+def walls_near(index, grid):
+    return sum(grid[j] == "#" for j in grid.neighbors(index))
+
+
+def row_sum(row, array):
+    return int(array[row].sum())
+
+
+def fail(n):
+    if n == 7:
+        raise ValueError("seven")
+    return n
+
+
+@pytest.mark.parametrize("jobs", [1, 3])
+def test_ordered(jobs):
+    assert list(pmap(square, range(200), jobs=jobs)) == [n * n for n in range(200)]
+    assert list(pmap(square, iter(range(50)), jobs=jobs)) == [n * n for n in range(50)]  # no len()
+
+
+def test_unordered():
+    assert sorted(pmap(square, range(300), jobs=3, ordered=False)) == [n * n for n in range(300)]
+
+
+def test_shared_bytes_and_str():
+    text = "#.#..##.#" * 50
+    expected = [text[i:i + 3].count("#") for i in range(len(text))]
+    assert list(pmap(count_at, range(len(text)), shared=text, jobs=2)) == expected
+    assert list(pmap(count_at, range(len(text)), shared=text.encode(), jobs=1)) == expected
+
+
+def test_shared_grid():
+    grid = Grid("#.#\n...\n#.#\n")
+    cells = list(grid)
+    expected = [sum(grid[j] == "#" for j in grid.neighbors(i)) for i in cells]
+    assert list(pmap(walls_near, cells, shared=grid, jobs=2)) == expected
+
+
+def test_shared_array():
+    np = pytest.importorskip("numpy")
+    array = np.arange(40, dtype=np.int64).reshape(10, 4)
+    assert list(pmap(row_sum, range(10), shared=array, jobs=2)) == [int(r.sum()) for r in array]
+    with pytest.raises(TypeError):
+        list(pmap(row_sum, range(10), shared={"not": "shareable"}, jobs=2))
+
+
+def test_errors_propagate():
+    with pytest.raises(ValueError, match="seven"):
+        list(pmap(fail, range(20), jobs=2))
+
+
+def test_chunk_size():
+    assert parallel._chunk_size(None, 1000, 4, 0.05) == 1
+    assert parallel._chunk_size(0.001, 10_000, 4, 0.05) == 50
+    assert parallel._chunk_size(0.001, 80, 4, 0.05) == 10  # leaves work for every core
+    assert parallel._chunk_size(1.0, None, 4, 0.05) == 1
+
+
+@pytest.mark.parametrize("context", ["spawn", "forkserver"])
+def test_solver_function_in_fresh_workers(tmp_path, monkeypatch, context):
+    path = tmp_path / "day06.py"
+    path.write_text("def hits(n, data):\n    return n * bytes(data).count(b'#')\n")
+    monkeypatch.setitem(sys.modules, "_aoc_solver_day06", None)  # removed again afterwards
+    solver = runner.load_solver(path, "_aoc_solver_day06")
+    assert list(pmap(solver.hits, range(10), shared=b"#.##", jobs=2, context=context)) == [3 * n for n in range(10)]
@@ -1,5 +1,7 @@
 import pytest
-from aoc.parser import extract_level, parse_submission_response, extract_code, extract_example
+from aoc.parser import (extract_answers, extract_level, extract_stars, parse_submission_response, extract_code,
+                        extract_example, extract_examples, extract_expected, extract_title, extract_blocks,
+                        parse_index, select_indices)
 
 def test_extract_level_found():
     html = '<form><input type="hidden" name="level" value="2" /></form>'
@@ -43,3 +45,70 @@ def test_extract_example_no_match():
     html = '<p>Nothing here</p><pre><code>ABC</code></pre>'
     result = extract_example(html)
     assert result == ""
+
+def test_extract_stars():
+    html = (
+        '<pre class="calendar">'
+        '<a aria-label="Day 1, two stars" href="/2023/day/1" class="calendar-day1 calendar-verycomplete">1</a>'
+        '<a aria-label="Day 2, one star" href="/2023/day/2" class="calendar-day2 calendar-complete">2</a>'
+        '<a aria-label="Day 3" href="/2023/day/3" class="calendar-day3">3</a>'
+        '<span class="calendar-day4">4</span>'
+        '</pre>'
+    )
+    stars = extract_stars(html)
+    assert len(stars) == 25
+    assert stars[:4] == [2, 1, 0, 0]
+
+def test_extract_answers():
+    html = ('<article><p>Part one</p></article><p>Your puzzle answer was <code>55123</code>.</p>'
+            '<article><p>Part two</p></article><p>Your puzzle answer was <code>55260</code>.</p>')
+    assert extract_answers(html) == ["55123", "55260"]
+    assert extract_answers("<p>No answers yet</p>") == []
+
+def test_extract_expected_and_title():
+    html = (
+        '<article class="day-desc"><h2>--- Day 1: Trebuchet?! ---</h2>'
+        '<p>For example:</p><pre><code>1abc2</code></pre>'
+        '<p>Here, <code><em>12</em></code> and <em>not</em> <code>3</code>; in total <code><em>142</em></code>.</p>'
+        '</article>'
+        '<article class="day-desc"><p>Now <em><code>281</code></em>.</p></article>'
+        '<article class="day-desc"><p>Nothing here.</p></article>'
+    )
+    assert extract_expected(html) == ["142", "281", None]
+    assert extract_title(html) == "Trebuchet?!"
+    assert extract_title("<p>no title</p>") is None
+    assert extract_examples(html) == ["1abc2"]
+
+
+BLOCKS_HTML = """
+<article class="day-desc"><p>Intro</p><pre><code>intro</code></pre>
+<p>For example:</p><pre><code>ex1
+ex1</code></pre></article>
+<article class="day-desc"><p>For example:</p><pre><code>ex2</code></pre><p>More</p><pre><code>tail</code></pre></article>
+"""
+
+
+def test_parse_index():
+    assert parse_index("0,2:4,-1") == [0, slice(2, 4), -1]
+    assert parse_index("1:") == [slice(1, None)]
+    with pytest.raises(ValueError):
+        parse_index("0,x")
+    assert select_indices(5, [0, slice(2, 4), -1]) == [0, 2, 3, 4]
+    assert select_indices(5, slice(None, None, 2)) == [0, 2, 4]
+    with pytest.raises(IndexError, match="No block at idx=5"):
+        select_indices(5, [5])
+
+
+def test_extract_multiple_indices():
+    assert extract_code(BLOCKS_HTML, idx=[0, slice(2, 4)]) == ["intro", "ex2", "tail"]
+    assert extract_example(BLOCKS_HTML, idx=[-1, 0]) == ["ex2", "ex1\nex1"]
+    assert extract_code(BLOCKS_HTML, idx=3) == "tail"
+    with pytest.raises(IndexError, match="No example block at idx=2"):
+        extract_example(BLOCKS_HTML, idx=[2])
+
+
+def test_extract_blocks():
+    blocks = extract_blocks(BLOCKS_HTML, examples=True)
+    assert [(b["index"], b["block"], b["part"], b["lines"]) for b in blocks] == [(0, 1, 1, 2), (1, 2, 2, 1)]
+    assert all(b["example"] for b in blocks)
+    assert [b["text"] for b in extract_blocks(BLOCKS_HTML, idx=[3, 0])] == ["tail", "intro"]
@@ -0,0 +1,48 @@
+from array import array
+from unittest.mock import patch
+
+import pytest
+
+from aoc.api import fetch_input
+from aoc.puzzle_input import PuzzleInput
+
+TEXT = "Button A: X+94, Y-34\nButton B: X+22, Y+67\n\nPrize: X=8400, Y=5400\n"
+
+
+def test_views():
+    data = PuzzleInput(TEXT)
+    assert data == TEXT
+    assert data.lines == ("Button A: X+94, Y-34", "Button B: X+22, Y+67", "", "Prize: X=8400, Y=5400")
+    assert data.paragraphs == (("Button A: X+94, Y-34", "Button B: X+22, Y+67"), ("Prize: X=8400, Y=5400",))
+    assert data.tokens[0] == ("Button", "A:", "X+94,", "Y-34")
+    assert data.ints() == array("q", [94, -34, 22, 67, 8400, 5400])
+
+
+def test_views_cached():
+    data = PuzzleInput(TEXT)
+    assert data.lines is data.lines
+    assert data.ints() is data.ints()
+
+
+def test_ints_overflow_falls_back_to_tuple():
+    assert PuzzleInput("1 99999999999999999999").ints() == (1, 99999999999999999999)
+
+
+def test_ints_numpy():
+    np = pytest.importorskip("numpy")
+    data = PuzzleInput("x=-12, y=3-4\n007 a5 123456789012345678")
+    assert np.array_equal(data.ints(numpy=True), np.array(list(data.ints())))
+
+
+def test_grid():
+    assert PuzzleInput("#.#\n.#.\n\n").grid == ("#.#", ".#.")
+    with pytest.raises(ValueError):
+        PuzzleInput("#.#\n.#\n").grid
+
+
+@patch("aoc.client.fetch_input", return_value="1\n2\n")
+def test_fetch_input_typed_shared(mock_fetch):
+    first = fetch_input(2023, 1, typed=True)
+    assert isinstance(first, PuzzleInput)
+    assert fetch_input(2023, 1, typed=True) is first
+    assert mock_fetch.call_count == 1
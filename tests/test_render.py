@@ -0,0 +1,50 @@
+import click
+
+from aoc.render import render_description
+
+PAGE = (
+    '<main>'
+    '<article class="day-desc"><h2>--- Day 1: Trebuchet?! ---</h2>'
+    '<p>The Elves have given you a <a href="/2023/map">map</a> with <em>fifty</em> stars.</p>'
+    '<pre><code>1abc2\npqr3stu8vwx\n</code></pre>'
+    '<ul><li>Adding these together produces <code><em>142</em></code>.</li></ul>'
+    '</article>'
+    '<p>Your puzzle answer was <code>55123</code>.</p>'
+    '<article class="day-desc"><h2 id="part2">--- Part Two ---</h2><p>Some digits are spelled out.</p></article>'
+    '</main>'
+)
+
+
+def test_render_all_parts():
+    text = click.unstyle(render_description(PAGE))
+    assert text.startswith("--- Day 1: Trebuchet?! ---\n\n")
+    assert "map <https://adventofcode.com/2023/map> with fifty stars." in text
+    assert "    1abc2\n    pqr3stu8vwx\n" in text
+    assert "  - Adding these together produces 142." in text
+    assert "--- Part Two ---" in text
+    assert "Your puzzle answer" not in text
+
+
+def test_render_part_and_styles():
+    text = render_description(PAGE, part=2)
+    assert "Trebuchet" not in text
+    assert "\x1b[" in text
+    assert click.unstyle(text) == "--- Part Two ---\n\nSome digits are spelled out.\n"
+
+
+def test_render_width():
+    text = click.unstyle(render_description(PAGE, part=1, width=30))
+    # Only a single word longer than the width may overflow
+    assert all(len(line) <= 30 or " " not in line for line in text.splitlines())
+    assert "The Elves have given you a map\n" in text
+    assert "  - Adding these together\n    produces 142." in text
+
+
+def test_render_missing_part():
+    page = '<article class="day-desc"><p>One</p></article>'
+    try:
+        render_description(page, part=2)
+    except IndexError:
+        pass
+    else:
+        raise AssertionError("expected IndexError")
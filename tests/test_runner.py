@@ -0,0 +1,276 @@
+import json
+from unittest.mock import patch
+
+import pytest
+
+from aoc import runner
+
+SOLVERS = {
+    "day01.py": "def part1(data):\n    return sum(data.ints())\n\ndef part2(data):\n    return len(data.lines)\n",
+    "day_2.py": "from helper import answer\n\ndef part1(data):\n    return answer()\n",
+    "03.py": "def part1(data):\n    while True:\n        pass\n",
+    "day04.py": "def part1(data):\n    raise ValueError('bad input')\n",
+    "helper.py": "def answer():\n    return 42\n",
+    "notes.py": "",
+}
+
+
+@pytest.fixture
+def solver_dir(tmp_path):
+    root = tmp_path / "solutions" / "2023"
+    root.mkdir(parents=True)
+    for name, source in SOLVERS.items():
+        (root / name).write_text(source)
+    return tmp_path / "solutions"
+
+
+def test_discover(solver_dir):
+    found = runner.discover(solver_dir, 2023)
+    assert {day: path.name for day, path in found.items()} == {1: "day01.py", 2: "day_2.py", 3: "03.py", 4: "day04.py"}
+    assert runner.discover(solver_dir, 2022) == {}
+
+
+@patch("aoc.api.fetch_answers", return_value=["6", "3"])
+@patch("aoc.api.fetch_stars", return_value=[2] * 25)
+@patch("aoc.api.fetch_input", return_value="1 2\n3\n")
+def test_run_year(mock_input, mock_stars, mock_answers, solver_dir):
+    results = runner.run_year(2023, solver_dir, days=[1, 2, 3, 4], jobs=2, timeout=0.5)
+    by_day = {r.day: r for r in results}
+
+    assert [p.status for p in by_day[1].parts] == ["ok", "wrong"]
+    assert by_day[1].parts[1].answer == "2"
+    assert by_day[2].parts[0].status == "wrong"  # 42 != 6
+    assert by_day[2].parts[1].status == "missing"
+    assert by_day[3].parts[0].status == "timeout"
+    assert by_day[4].parts[0].error == "ValueError: bad input"
+    assert not any(r.ok for r in results)
+
+    table = runner.format_table(results)
+    assert "2 != 3" in table
+    assert "part 1: timeout" in table
+    assert json.loads(json.dumps(runner.to_json(results)))[0]["day"] == 1
+
+
+def test_run_year_offline_without_cookie(solver_dir, monkeypatch):
+    from aoc import cache
+
+    monkeypatch.delenv("AOC_COOKIE", raising=False)
+    cache.write(2023, 1, "input", b"1 2\n3\n")
+    [result] = runner.run_year(2023, solver_dir, days=[1])
+    assert result.error is None
+    assert [p.answer for p in result.parts] == ["6", "2"]
+
+
+@patch("aoc.api.fetch_answers")
+@patch("aoc.api.fetch_stars", return_value=[0] * 25)
+@patch("aoc.api.fetch_input", return_value="1 2\n3\n")
+def test_run_year_unsolved_is_unchecked(mock_input, mock_stars, mock_answers, solver_dir):
+    [result] = runner.run_year(2023, solver_dir, days=[1])
+    assert [p.status for p in result.parts] == ["unchecked", "unchecked"]
+    assert result.ok
+    mock_answers.assert_not_called()
+
+
+MEMORY_SOLVER = """from aoc.profile import checkpoint
+
+def part1(data):
+    big = [bytes(1000) for _ in range(2000)]
+    checkpoint("allocated")
+    return len(big)
+
+def part2(data):
+    return 0
+"""
+
+
+@patch("aoc.api.fetch_answers", return_value=[])
+@patch("aoc.api.fetch_stars", return_value=[0] * 25)
+@patch("aoc.api.fetch_input", return_value="1\n")
+def test_run_year_memory(mock_input, mock_stars, mock_answers, tmp_path):
+    (tmp_path / "day05.py").write_text(MEMORY_SOLVER)
+    [result] = runner.run_year(2023, tmp_path, days=[5], jobs=1, memory=True)
+
+    part1, part2 = result.parts
+    assert part1.answer == "2000"
+    assert part1.peak_memory > 2_000_000 > part2.peak_memory
+    [cp] = result.memory["checkpoints"]
+    assert cp["name"] == "allocated" and cp["part"] == 1
+    assert cp["current"] > 2_000_000
+    assert result.memory["top"][0]["file"].endswith("day05.py")
+
+    assert "Peak" in runner.format_table([result])
+    assert "checkpoint allocated (part 1)" in runner.format_memory([result])
+    assert runner.from_json(json.loads(json.dumps(runner.to_json([result])))) == [result]
+
+
+def test_checkpoint_without_profile_is_noop():
+    from aoc import profile
+
+    assert not profile.enabled()
+    profile.checkpoint("ignored")
+
+
+TIMED_SOLVER = """from aoc import timer
+
+@timer
+def parse(data):
+    return data.ints()
+
+def fib(n):
+    return n if n < 2 else fib(n - 1) + fib(n - 2)
+
+def part1(data):
+    with timer("search"):
+        for n in parse(data):
+            fib(n)
+    return sum(parse(data))
+"""
+
+
+@patch("aoc.api.fetch_answers", return_value=[])
+@patch("aoc.api.fetch_stars", return_value=[0] * 25)
+@patch("aoc.api.fetch_input", return_value="15 16\n")
+def test_run_year_sections_and_cprofile(mock_input, mock_stars, mock_answers, tmp_path):
+    (tmp_path / "day06.py").write_text(TIMED_SOLVER)
+    [result] = runner.run_year(2023, tmp_path, days=[6], jobs=1, cprofile_dir=tmp_path / "profiles")
+
+    sections = {s["name"]: s for s in result.parts[0].sections}
+    assert sections["parse"]["calls"] == 2
+    assert sections["search"]["calls"] == 1
+    assert sections["search"]["seconds"] > 0
+    assert "search" in runner.format_sections([result])
+
+    prefix = tmp_path / "profiles" / "2023-day06"
+    assert result.cprofile["prof"] == f"{prefix}.prof"
+    assert prefix.with_suffix(".prof").exists() and prefix.with_suffix(".txt").exists()
+    stacks = prefix.with_suffix(".collapsed").read_text().splitlines()
+    assert any(";fib (day06.py:" in line for line in stacks)
+    for line in stacks:
+        stack, samples = line.rsplit(" ", 1)
+        assert stack and int(samples) > 0
+    assert result.cprofile["hotspots"][0]["function"].startswith("fib ")
+    assert "fib (day06.py:" in runner.format_hotspots([result])
+
+
+def test_collapsed_stacks_shared_helpers_stay_bounded():
+    from types import SimpleNamespace
+
+    from aoc import profile
+
+    # 30 layers of 8 functions, each calling all of the next layer: 8**30 paths
+    layers = [[("solver.py", 10 * depth + i, f"f{depth}_{i}") for i in range(8)] for depth in range(30)]
+    root = ("solver.py", 0, "part1")
+    stats = {root: (1, 1, 0.0, 1.0, {})}
+    for depth, layer in enumerate(layers):
+        callers = [root] if depth == 0 else layers[depth - 1]
+        width = len(callers) * len(layer)
+        for func in layer:
+            edges = {caller: (1, 1, 0.0, 1.0 / width) for caller in callers}
+            own = 1.0 / len(layer) if depth == len(layers) - 1 else 0.0
+            stats[func] = (1, 1, own, 1.0 / len(layer), edges)
+
+    lines = profile.collapsed_stacks(SimpleNamespace(stats=stats))
+    assert 0 < len(lines) <= profile.MAX_FRAMES
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in lines) == pytest.approx(1e6, rel=0.05)  # each line is rounded to a microsecond
+
+
+def test_timer_without_collect_records_nothing():
+    from aoc import timer, timing
+
+    @timer
+    def double(x):
+        return 2 * x
+
+    assert double(2) == 4
+    with timer("outside"):
+        pass
+    with timing.collect() as report:
+        double(1)
+        with timer("inside"):
+            double(2)
+    assert [(s["name"], s["calls"]) for s in report] == [
+        ("test_timer_without_collect_records_nothing.<locals>.double", 2), ("inside", 1)]
+
+
+@patch("aoc.api.fetch_answers", return_value=[])
+@patch("aoc.api.fetch_stars", return_value=[0] * 25)
+@patch("aoc.api.fetch_input", return_value="1 2\n3\n")
+def test_run_year_memo_persists_across_runs(mock_input, mock_stars, mock_answers, tmp_path):
+    root = tmp_path / "2023"
+    root.mkdir()
+    log = tmp_path / "parsed.log"
+    (root / "day05.py").write_text(
+        "from aoc import memo\n\n"
+        "@memo\n"
+        "def parse(data):\n"
+        f"    with open({str(log)!r}, 'a') as f:\n"
+        "        f.write('x')\n"
+        "    return sorted(data.ints())\n\n"
+        "def part1(data):\n    return sum(parse(data))\n\n"
+        "def part2(data):\n    return max(parse(data))\n"
+    )
+    for _ in range(2):
+        [result] = runner.run_year(2023, tmp_path, days=[5], jobs=1)
+        assert [p.answer for p in result.parts] == ["6", "3"]
+    assert log.read_text() == "x"
+
+
+@patch("aoc.api.fetch_answers", return_value=[])
+@patch("aoc.api.fetch_stars", return_value=[0] * 25)
+@patch("aoc.api.fetch_input", return_value="1 2\n3\n")
+def test_run_year_solver_uses_pmap(mock_input, mock_stars, mock_answers, tmp_path):
+    root = tmp_path / "2023"
+    root.mkdir()
+    (root / "day06.py").write_text(
+        "from aoc.parallel import pmap\n\n"
+        "def digits(i, data):\n    return bytes(data).count(b'%d' % i)\n\n"
+        "def part1(data):\n    return sum(pmap(digits, range(10), shared=data, jobs=2))\n"
+    )
+    [result] = runner.run_year(2023, tmp_path, days=[6], jobs=1)
+    assert result.parts[0].answer == "3"
+
+
+def test_local_imports(tmp_path):
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "__init__.py").write_text("")
+    (tmp_path / "pkg" / "util.py").write_text("from . import consts\n")
+    (tmp_path / "pkg" / "consts.py").write_text("N = 3\n")
+    (tmp_path / "helper.py").write_text("import os\nfrom pkg import util\n")
+    (tmp_path / "unused.py").write_text("")
+    (tmp_path / "day01.py").write_text("import collections\n\ndef part1(data):\n    import helper\n")
+    names = [p.relative_to(tmp_path).as_posix() for p in runner.local_imports(tmp_path / "day01.py")]
+    assert names == ["helper.py", "pkg/__init__.py", "pkg/consts.py", "pkg/util.py"]
+
+    before = runner.fingerprint(tmp_path / "day01.py", "abc")
+    assert runner.fingerprint(tmp_path / "day01.py", "abd") != before
+    (tmp_path / "unused.py").write_text("X = 1\n")
+    assert runner.fingerprint(tmp_path / "day01.py", "abc") == before
+    (tmp_path / "pkg" / "consts.py").write_text("N = 4\n")
+    assert runner.fingerprint(tmp_path / "day01.py", "abc") != before
+
+
+@patch("aoc.api.fetch_answers", return_value=["6", "3"])
+@patch("aoc.api.fetch_stars", return_value=[2] * 25)
+@patch("aoc.api.fetch_input", return_value="1 2\n3\n")
+def test_run_year_incremental(mock_input, mock_stars, mock_answers, solver_dir):
+    def run():
+        return {r.day: r for r in runner.run_year(2023, solver_dir, days=[1, 2, 4], jobs=1, incremental=True)}
+
+    first = run()
+    assert not any(r.cached for r in first.values())
+    second = run()
+    assert second[1].cached and second[2].cached
+    assert not second[4].cached  # errors are never reused
+    assert [p.answer for p in second[1].parts] == ["6", "2"]
+    assert [p.status for p in second[1].parts] == ["ok", "wrong"]
+    assert second[1].parts[0].seconds == first[1].parts[0].seconds
+    assert "Skipped 2 unchanged days: 1, 2" == runner.format_cached(list(second.values()))
+    assert "part 2: wrong (cached)" in runner.format_table(list(second.values()))
+
+    (solver_dir / "2023" / "helper.py").write_text("def answer():\n    return 6\n")
+    third = run()
+    assert third[1].cached and not third[2].cached  # only day 2 imports the helper
+    assert third[2].parts[0].status == "ok"
+
+    forced = runner.run_year(2023, solver_dir, days=[1], jobs=1)
+    assert not forced[0].cached
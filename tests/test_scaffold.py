@@ -0,0 +1,54 @@
+import json
+from unittest.mock import patch
+
+from aoc import cache, scaffold
+
+PAGE = (
+    '<article class="day-desc"><h2>--- Day 1: Trebuchet?! ---</h2>'
+    '<p>For example:</p><pre><code>1abc2\npqr3stu8vwx\n</code></pre>'
+    '<p>Adding these together produces <code><em>142</em></code>.</p></article>'
+    '<p>Your puzzle answer was <code>54331</code>.</p>'
+)
+
+
+@patch("aoc.api.fetch_stars", return_value=[1] + [0] * 24)
+@patch("aoc.client.fetch_page", return_value=PAGE)
+@patch("aoc.client.fetch_input_bytes", return_value=b"1\n2\n")
+def test_new(mock_input, mock_page, mock_stars, tmp_path):
+    puzzle = scaffold.new(2023, 1, path=tmp_path, cookie="cookie")
+
+    assert puzzle.created
+    assert puzzle.solver == tmp_path / "2023" / "day01.py"
+    assert '"""Advent of Code 2023, day 1: Trebuchet?!"""' in puzzle.solver.read_text()
+    assert puzzle.input_bytes == 4
+    assert json.loads(puzzle.sidecar.read_text()) == {
+        "year": 2023,
+        "day": 1,
+        "title": "Trebuchet?!",
+        "examples": ["1abc2\npqr3stu8vwx\n"],
+        "expected": ["142"],
+        "answers": ["54331"],
+    }
+    assert cache.read_meta(2023, 1)["answers"] == ["54331"]
+    mock_page.assert_called_once_with(2023, 1, "cookie")
+    mock_stars.assert_called_once()
+
+    # An existing solver is kept
+    puzzle.solver.write_text("mine")
+    again = scaffold.new(2023, 1, path=tmp_path, cookie="cookie")
+    assert not again.created
+    assert again.solver.read_text() == "mine"
+
+
+@patch("aoc.api.fetch_stars")
+@patch("aoc.client.fetch_page", return_value=PAGE)
+@patch("aoc.client.fetch_input_bytes", return_value=b"1\n")
+def test_new_custom_template(mock_input, mock_page, mock_stars, tmp_path, monkeypatch):
+    cache.save_stars(2023, [0] * 25)
+    template = tmp_path / "template.py"
+    template.write_text("# $year/$day $unknown\n")
+    monkeypatch.setenv("AOC_TEMPLATE", str(template))
+
+    puzzle = scaffold.new(2023, 2, path=tmp_path / "solutions", cookie="cookie")
+    assert puzzle.solver.read_text() == "# 2023/2 $unknown\n"
+    mock_stars.assert_not_called()
@@ -0,0 +1,104 @@
+import random
+
+import pytest
+
+from aoc import search
+from aoc.grid import Grid
+
+# 0 -1- 1 -2- 3
+#  \         /
+#   4 - 2 - 1        costs on the edges
+EDGES = {0: [(1, 1), (2, 4)], 1: [(3, 2)], 2: [(3, 1)], 3: []}
+
+
+def weighted(s):
+    return EDGES[s]
+
+
+def test_dijkstra_bounded_and_unbounded():
+    for size in (4, None):
+        result = search.dijkstra(0, weighted, goal=3, size=size, paths=True)
+        assert result.goal == 3 and result.cost == 3
+        assert result.path() == [0, 1, 3]
+        full = search.dijkstra(0, weighted, size=size)
+        assert [full.distance(s) for s in range(4)] == [0, 1, 4, 3]
+    assert search.dijkstra(0, weighted, goal=99).cost == -1
+
+
+def test_path_requires_tracking():
+    with pytest.raises(ValueError):
+        search.dijkstra(0, weighted, goal=3).path()
+
+
+def test_multiple_starts_and_goal_predicate():
+    result = search.dijkstra([1, 2], weighted, goal=lambda s: s == 3)
+    assert result.cost == 1
+    assert result.distance(0) == -1
+
+
+def test_bfs01():
+    # Teleports (cost 0) from 0 to 5, then a cost-1 step to 6
+    graph = {0: [(1, 1), (5, 0)], 1: [(6, 1)], 5: [(6, 1)], 6: []}
+    result = search.bfs01(0, graph.__getitem__, goal=6, size=7, paths=True)
+    assert result.cost == 1
+    assert result.path() == [0, 5, 6]
+
+
+def test_bfs_batch_and_paths():
+    def step(s):
+        return [s + 1, s * 2] if s < 100 else []
+
+    plain = search.bfs(1, step, goal=100, paths=True)
+    assert plain.cost == 8  # 1 2 3 6 12 24 25 50 100
+    assert plain.path()[0] == 1 and plain.path()[-1] == 100
+    batched = search.bfs(1, lambda frontier: [t for s in frontier for t in step(s)], goal=100, size=201,
+                         batch=True)
+    assert batched.cost == 8
+    with pytest.raises(ValueError):
+        search.bfs(1, step, batch=True, paths=True)
+
+
+def test_bidirectional_bfs_directed():
+    graph = {0: [1], 1: [2], 2: [3], 3: [], 4: [0]}
+    reverse = {s: [p for p, succ in graph.items() if s in succ] for s in graph}
+    assert search.bidirectional_bfs(0, 3, graph.__getitem__, reverse.__getitem__) == 3
+    assert search.bidirectional_bfs(3, 0, graph.__getitem__, reverse.__getitem__, size=5) == -1
+    assert search.bidirectional_bfs(2, 2, graph.__getitem__) == 0
+
+
+@pytest.mark.parametrize("diagonal", [False, True])
+def test_grid_graph_agrees_with_grid(diagonal):
+    rng = random.Random(3)
+    text = "\n".join("".join(rng.choice("#123456789") for _ in range(30)) for _ in range(20))
+    grid = Grid(text)
+    start, goal = grid.index(10, 15), grid.index(19, 29)
+    grid[start], grid[goal] = "1", "1"
+    size = len(grid.cells)
+
+    steps = search.grid_graph(grid, diagonal=diagonal)
+    expected = grid.bfs(start, diagonal=diagonal)
+    result = search.bfs(start, steps, size=size)
+    assert list(result.dist) == list(expected)
+    assert search.bidirectional_bfs(start, goal, steps, size=size) == expected[goal]
+
+    costs = grid.cells.translate(search.DIGITS)
+    graph = search.grid_graph(grid, diagonal=diagonal, weights=costs)
+    best = search.dijkstra(start, graph, goal, size=size, paths=True)
+    if best.goal is not None:
+        path = best.path()
+        assert sum(costs[i] for i in path[1:]) == best.cost
+
+    stride, (gr, gc) = grid.stride, grid.coords(goal)
+
+    def chebyshev(i):
+        r, c = i // stride - 1, i % stride
+        return max(abs(r - gr), abs(c - gc)) if diagonal else abs(r - gr) + abs(c - gc)
+
+    assert search.astar(start, graph, goal, chebyshev, size=size).cost == best.cost
+    assert search.dijkstra(start, graph, goal).cost == best.cost
+
+
+def test_grid_graph_wrap():
+    grid = Grid("..#.\n####\n", wrap=True)
+    steps = search.grid_graph(grid)
+    assert search.bfs(grid.index(0, 0), steps, goal=grid.index(0, 3)).cost == 1
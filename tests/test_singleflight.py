@@ -0,0 +1,98 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from aoc import client
+from aoc.singleflight import Group
+
+
+def _wait_for(condition):
+    for _ in range(500):
+        if condition():
+            return
+        threading.Event().wait(0.01)
+    raise AssertionError("condition not reached")
+
+
+def _blocking(calls, release):
+    def fn(key):
+        calls.append(key)
+        release.wait(5)
+        return f"result {key}"
+    return fn
+
+
+def test_concurrent_calls_coalesce():
+    group, calls, release = Group(), [], threading.Event()
+    fn = _blocking(calls, release)
+
+    with ThreadPoolExecutor(4) as pool:
+        futures = [pool.submit(group.do, "k", fn, "k") for _ in range(4)]
+        _wait_for(lambda: group.followers("k") == 3)
+        release.set()
+        results = [f.result() for f in futures]
+
+    assert results == ["result k"] * 4
+    assert calls == ["k"]
+
+
+def test_sequential_calls_run_again():
+    group, calls, release = Group(), [], threading.Event()
+    release.set()
+    fn = _blocking(calls, release)
+    group.do("k", fn, "k")
+    group.do("k", fn, "k")
+    assert calls == ["k", "k"]
+
+
+def test_exception_shared_and_forgotten():
+    group = Group()
+
+    def boom():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        group.do("k", boom)
+    assert group.do("k", lambda: 1) == 1
+
+
+def test_do_async_coalesces():
+    group, calls = Group(), []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "page"
+
+    async def main():
+        return await asyncio.gather(*(group.do_async("k", fetch) for _ in range(3)))
+
+    assert asyncio.run(main()) == ["page"] * 3
+    assert calls == [1]
+
+
+def test_client_fetch_page_coalesced():
+    calls, release = [], threading.Event()
+
+    def slow_request(method, url, **kwargs):
+        calls.append(url)
+        release.wait(5)
+
+        class Resp:
+            text = "<html></html>"
+            content = b"<html></html>"
+        return Resp()
+
+    with patch("aoc.client._request", side_effect=slow_request), ThreadPoolExecutor(3) as pool:
+        # Defaults and keywords normalise to one key
+        futures = [pool.submit(client.fetch_page, 2023, 1), pool.submit(client.fetch_page, 2023, 1, None),
+                   pool.submit(client.fetch_page, year=2023, day=1)]
+        key = ("fetch_page", (("year", 2023), ("day", 1), ("cookie", None), ("refresh", False)))
+        _wait_for(lambda: client._flights.followers(key) == 2)
+        release.set()
+        assert [f.result() for f in futures] == ["<html></html>"] * 3
+
+    assert len(calls) == 1
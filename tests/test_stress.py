@@ -0,0 +1,88 @@
+from unittest.mock import patch
+
+import pytest
+
+from aoc import stress
+
+GRID = "#.S.\n....\n.#E#\n"
+GAMES = "Game 1: 3 blue, 4 red\nGame 2: 1 red, 2 green\nGame 3: 8 green\n"
+ALMANAC = "seeds: 79 14 55 13\n\nseed-to-soil map:\n50 98 2\n52 50 48\n\nsoil-to-fertilizer map:\n0 15 37\n37 52 2\n"
+
+
+def test_scale_grid_tiles_and_keeps_markers_once():
+    scaled = stress.scale(GRID, 10).splitlines()
+    assert len(scaled) == 9 and {len(row) for row in scaled} == {12}  # 3x3 tiles
+    text = "".join(scaled)
+    assert text.count("S") == 1 and text.count("E") == 1
+    assert scaled[0].startswith("#.S.")
+    assert stress.describe(GRID) == "3x4 grid"
+
+
+def test_scale_lines_keeps_formats_and_ranges():
+    scaled = stress.scale(GAMES, 10, seed=3).splitlines()
+    assert len(scaled) == 30 and scaled[:3] == GAMES.splitlines()
+    formats = stress._formats(GAMES.splitlines())
+    for line, values in stress._formats(scaled).items():
+        assert line in formats
+        assert all(lo >= a and hi <= b for (lo, hi), (a, b) in zip(values, formats[line]))
+    assert stress.scale(GAMES, 10, seed=3) == stress.scale(GAMES, 10, seed=3)
+    assert stress.describe(GAMES) == "3 lines, 3 formats, ints 1..8"
+
+
+def test_scale_one_line_and_sections():
+    assert len(stress.scale("3,4,3,1,2\n", 2).strip().split(",")) == 10
+    digits = stress.scale("2333133121414131402\n", 2).strip()
+    assert len(digits) == 38 and digits.isdigit()
+
+    sections = stress.scale(ALMANAC, 2).split("\n\n")
+    assert sections[0] == "seeds: 79 14 55 13"  # the header line is kept
+    assert [len(s.splitlines()) for s in sections[1:]] == [5, 5]  # headers are not repeated
+    assert sections[1].count("map:") == 1
+
+    records = "A: 1\nB: 2\n\nA: 3\nB: 4\n\nA: 5\nB: 6\n"
+    assert stress.scale(records, 2).count("A:") == 6
+
+
+def test_fit():
+    sizes = [100, 200, 1000, 10_000]
+    quadratic = stress.fit(sizes, [1e-6 * n * n for n in sizes])
+    assert quadratic.model == "O(n^2)" and quadratic.exponent == pytest.approx(2)
+    linear = stress.fit(sizes, [1e-5 * n * (1.05 if i % 2 else 0.95) for i, n in enumerate(sizes)])
+    assert linear.model == "O(n)" and 0.9 < linear.exponent < 1.1
+    assert stress.fit([100], [1.0]) is None
+
+
+SOLVER = """\
+def part1(data):
+    return sum(data.ints())
+
+def part2(data):
+    nums = data.ints()
+    return sum(1 for a in nums for b in nums if a < b)
+"""
+
+
+@patch("aoc.api.fetch_blocks", return_value=[{"text": "1\n2\n3\n", "lines": 3}])
+@patch("aoc.api.fetch_input", return_value="".join(f"{i % 97}\n" for i in range(300)))
+def test_stress(mock_input, mock_blocks, tmp_path):
+    (tmp_path / "day09.py").write_text(SOLVER)
+    seen = []
+    result = stress.stress(2023, 9, tmp_path, factors=(2, 4), progress=seen.append)
+    assert [p.label for p in result.points] == ["example", "1x", "2x", "4x"]
+    assert [p.label for p in seen] == ["example", "1x", "2x", "4x"]
+    assert result.source == "input" and result.structure.startswith("300 lines")
+    assert result.points[2].size > result.points[1].size
+    assert result.fits[2] is not None and result.fits[2].exponent > result.fits[1].exponent
+    report = stress.format_report(result)
+    assert "Part 2: time ~ n^" in report and "4x" in report
+
+
+@patch("aoc.api.fetch_blocks", return_value=[{"text": "1\n2\n", "lines": 2}])
+@patch("aoc.api.fetch_input", side_effect=OSError("offline"))
+def test_stress_falls_back_to_example(mock_input, mock_blocks, tmp_path):
+    (tmp_path / "day09.py").write_text(SOLVER)
+    result = stress.stress(2023, 9, tmp_path, factors=(3,))
+    assert result.source == "example"
+    assert [p.label for p in result.points] == ["1x", "3x"]
+    with pytest.raises(FileNotFoundError):
+        stress.stress(2023, 10, tmp_path)
@@ -0,0 +1,67 @@
+from unittest.mock import patch
+
+from aoc import throttle
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def _bucket(tmp_path, clock, rate=2.0, burst=3):
+    return throttle.TokenBucket(tmp_path / "throttle.json", rate, burst, clock=clock, sleep=clock.sleep)
+
+
+def test_burst_then_throttle(tmp_path):
+    clock = FakeClock()
+    b = _bucket(tmp_path, clock)
+    assert [b.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert b.acquire() == 0.5
+    assert clock.slept == [0.5]
+
+
+def test_reservations_queue_up(tmp_path):
+    clock = FakeClock()
+    b = _bucket(tmp_path, clock, rate=1.0, burst=1)
+    assert b.reserve() == 0.0
+    # Two callers arriving at once get consecutive slots
+    assert b.reserve() == 1.0
+    assert b.reserve() == 2.0
+
+
+def test_state_shared_between_buckets(tmp_path):
+    clock = FakeClock()
+    _bucket(tmp_path, clock, burst=1).reserve()
+    # A second bucket (another process) sees the drained state
+    assert _bucket(tmp_path, clock, burst=1).reserve() == 0.5
+
+
+def test_refill_capped_at_burst(tmp_path):
+    clock = FakeClock()
+    b = _bucket(tmp_path, clock, rate=1.0, burst=2)
+    b.reserve()
+    clock.now += 100
+    assert [b.reserve() for _ in range(3)] == [0.0, 0.0, 1.0]
+
+
+def test_acquire_disabled(monkeypatch):
+    monkeypatch.setenv("AOC_RATE", "0")
+    with patch.object(throttle.TokenBucket, "reserve") as mock_reserve:
+        assert throttle.acquire() == 0.0
+    mock_reserve.assert_not_called()
+
+
+def test_bucket_settings(monkeypatch, cache_dir):
+    monkeypatch.setenv("AOC_RATE", "0.25")
+    monkeypatch.setenv("AOC_BURST", "10")
+    b = throttle.bucket()
+    assert (b.rate, b.burst) == (0.25, 10)
+    assert b.path.parent == cache_dir
@@ -0,0 +1,53 @@
+import json
+from unittest.mock import patch
+
+from aoc import trace
+from aoc.api import fetch_code
+
+
+def test_span_disabled_without_hooks():
+    with trace.span("noop", a=1) as attrs:
+        attrs["b"] = 2
+    assert not trace.enabled()
+
+
+def test_hook_receives_spans():
+    seen = []
+    trace.add_hook(seen.append)
+    try:
+        with trace.span("outer", kind="test") as attrs:
+            attrs["status"] = 200
+    finally:
+        trace.remove_hook(seen.append)
+
+    assert [s.name for s in seen] == ["outer"]
+    assert seen[0].attrs == {"kind": "test", "status": 200}
+    assert seen[0].duration >= 0
+
+
+@patch("aoc.client.fetch_page", return_value="<pre><code>AAA</code></pre>")
+def test_recorder_spans_fallback_and_parser(mock_page, tmp_path, monkeypatch):
+    monkeypatch.setenv("AOC_YEAR", "2023")
+    rec = trace.Recorder().start()
+    try:
+        fetch_code(day=1, idx=0)
+    finally:
+        rec.stop()
+
+    names = [s.name for s in rec.spans]
+    assert "fallback" in names
+    assert "parser.extract_code" in names
+    fallback = next(s for s in rec.spans if s.name == "fallback")
+    assert fallback.attrs == {"param": "year", "source": "env_int"}
+
+    path = tmp_path / "trace.json"
+    rec.dump(str(path))
+    events = json.loads(path.read_text())["traceEvents"]
+    assert {"fallback", "parser.extract_code", "counters"} <= {e["name"] for e in events}
+
+
+def test_recorder_counters():
+    rec = trace.Recorder()
+    trace.count("requests")
+    trace.count("bytes_received", 10)
+    assert rec.counters() == {"bytes_received": 10, "requests": 1}
@@ -0,0 +1,139 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from aoc import transport
+from aoc.errors import NetworkError
+
+BODY = b"0123456789" * 10_000
+CONNECTIONS = []
+DROPPED = []
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        CONNECTIONS.append(self.client_address)
+
+    def do_GET(self):
+        if self.path == "/missing":
+            self._send(404, b"not found")
+        else:
+            self._send(200, BODY)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        if self.path == "/drop":
+            DROPPED.append(body)  # processed, but the connection closes before the response
+            self.close_connection = True
+            return
+        self._send(200, self.headers["Cookie"].encode() + b"|" + body)
+
+    def _send(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-Agent", self.headers["User-Agent"])
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture(params=["requests", "urllib3", "http.client", "httpx"])
+def backend(request):
+    if request.param == "httpx":
+        pytest.importorskip("httpx")
+    t = transport.create(request.param, timeout=5)
+    yield t
+    t.close()
+
+
+def test_get(backend, server):
+    for _ in range(3):  # reuses the pooled connection
+        resp = backend.request("GET", f"{server}/2023/day/1/input")
+        assert resp.ok and resp.status == 200
+        assert resp.content == BODY
+        assert resp.elapsed >= 0
+        assert {k.lower(): v for k, v in resp.headers.items()}["x-agent"] == transport.USER_AGENT
+
+
+def test_stream(backend, server):
+    with backend.request("GET", f"{server}/big", stream=True) as resp:
+        chunks = list(resp.iter_content(4096))
+    assert b"".join(chunks) == BODY
+    assert max(len(c) for c in chunks) <= 4096
+
+    # An abandoned stream does not break later requests
+    resp = backend.request("GET", f"{server}/big", stream=True)
+    next(resp.iter_content(10))
+    resp.close()
+    assert backend.request("GET", f"{server}/again").content == BODY
+
+
+def test_post_and_status(backend, server):
+    resp = backend.request("POST", f"{server}/answer", headers={"Cookie": "session=abc"}, body=b"level=1")
+    assert resp.text == "session=abc|level=1"
+    assert backend.request("GET", f"{server}/missing").status == 404
+
+
+def test_warm(backend, server):
+    if backend.name == "httpx":
+        pytest.skip("httpx connects on the first request")
+    before = len(CONNECTIONS)
+    backend.warm(f"{server}/")
+    for _ in range(10):  # the server thread records the accept asynchronously
+        if len(CONNECTIONS) > before:
+            break
+        threading.Event().wait(0.05)
+    assert len(CONNECTIONS) == before + 1
+    assert backend.request("GET", f"{server}/after-warm").content == BODY
+    assert len(CONNECTIONS) == before + 1  # the request used the warmed connection
+    backend.warm("http://127.0.0.1:1/")  # best effort: no error
+
+
+def test_post_on_dropped_connection_is_not_resent(server):
+    t = transport.create("http.client", timeout=5)
+    try:
+        assert t.request("GET", f"{server}/keep-alive").ok  # the POST reuses this connection
+        DROPPED.clear()
+        with pytest.raises(NetworkError):
+            t.request("POST", f"{server}/drop", body=b"answer=1")
+        assert DROPPED == [b"answer=1"]
+    finally:
+        t.close()
+
+
+def test_network_error(backend):
+    with pytest.raises(NetworkError):
+        backend.request("GET", "http://127.0.0.1:1/")
+
+
+def test_create_from_setting(monkeypatch):
+    monkeypatch.setenv("AOC_TRANSPORT", "http.client")
+    assert isinstance(transport.create(), transport.HTTPClientTransport)
+    monkeypatch.setenv("AOC_TRANSPORT", "carrier-pigeon")
+    with pytest.raises(ValueError):
+        transport.create()
+
+
+def test_backend_must_implement_request():
+    class Incomplete(transport.Transport):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()